@@ -0,0 +1,112 @@
+"""
+Analysis Cache - LRU cache terbatas untuk halaman analisis per session.
+
+Halaman riwayat yang sudah dimuat ("Muat Lebih Banyak") disimpan di sini, bukan
+di st.session_state, supaya memori server tetap terprediksi: setiap session punya
+budget baris sendiri dan ada batas global untuk seluruh session. Entri yang paling
+lama tidak dipakai dibuang lebih dulu.
+"""
+
+import threading
+from collections import OrderedDict
+
+# Budgets are counted in analysis rows (one row ~ one history entry)
+MAX_ROWS_PER_SESSION = 2000
+MAX_ROWS_TOTAL = 50000
+
+
+class AnalysisCache:
+    def __init__(self, max_rows_per_session=MAX_ROWS_PER_SESSION, max_rows_total=MAX_ROWS_TOTAL):
+        self.max_rows_per_session = max_rows_per_session
+        self.max_rows_total = max_rows_total
+        self._lock = threading.Lock()
+        # (session_id, key) -> (value, size), least recently used first
+        self._entries = OrderedDict()
+        # session_id -> OrderedDict of its keys in LRU order, and its total size
+        self._session_keys = {}
+        self._session_sizes = {}
+        self._total_size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, session_id, key, default=None):
+        with self._lock:
+            entry = self._entries.get((session_id, key))
+            if entry is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._entries.move_to_end((session_id, key))
+            self._session_keys[session_id].move_to_end(key)
+            return entry[0]
+
+    def put(self, session_id, key, value, size=1):
+        """Store a value of the given size (rows); a value over the session budget is not
+        stored and leaves any existing entry for the key in place"""
+        with self._lock:
+            if size > self.max_rows_per_session or size > self.max_rows_total:
+                return False
+            self._remove(session_id, key)
+
+            self._entries[(session_id, key)] = (value, size)
+            self._session_keys.setdefault(session_id, OrderedDict())[key] = None
+            self._session_sizes[session_id] = self._session_sizes.get(session_id, 0) + size
+            self._total_size += size
+
+            # Session budget first (oldest of this session), then the global cap (oldest overall)
+            session_keys = self._session_keys[session_id]
+            while self._session_sizes[session_id] > self.max_rows_per_session:
+                self._evict(session_id, next(iter(session_keys)))
+            while self._total_size > self.max_rows_total:
+                self._evict(*next(iter(self._entries)))
+            return True
+
+    def drop_session(self, session_id):
+        """Forget every entry of a session (e.g. after switching market)"""
+        with self._lock:
+            for key in list(self._session_keys.get(session_id, ())):
+                self._remove(session_id, key)
+
+    def _evict(self, session_id, key):
+        self._remove(session_id, key)
+        self.evictions += 1
+
+    def _remove(self, session_id, key):
+        entry = self._entries.pop((session_id, key), None)
+        if entry is None:
+            return
+        size = entry[1]
+        del self._session_keys[session_id][key]
+        self._session_sizes[session_id] -= size
+        self._total_size -= size
+        if not self._session_keys[session_id]:
+            del self._session_keys[session_id]
+            del self._session_sizes[session_id]
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'sessions': len(self._session_keys),
+                'rows': self._total_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': (self.hits / lookups * 100) if lookups else 0
+            }
+
+
+# Process-wide cache instance
+_analysis_cache = None
+_analysis_cache_lock = threading.Lock()
+
+def get_analysis_cache():
+    """Get the process-wide analysis cache"""
+    global _analysis_cache
+    if _analysis_cache is None:
+        with _analysis_cache_lock:
+            if _analysis_cache is None:
+                _analysis_cache = AnalysisCache()
+    return _analysis_cache
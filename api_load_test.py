@@ -0,0 +1,96 @@
+"""
+Load test untuk api_server.py - mengirim request paralel dan melaporkan requests/second.
+
+Contoh:
+    python api_load_test.py --url http://127.0.0.1:8502 --requests 2000 --concurrency 16
+"""
+
+import argparse
+import json
+import threading
+import time
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+# Mix of endpoints hit in round-robin order
+DEFAULT_PATHS = [
+    '/predict?market={market}',
+    '/predict?market={market}&input=1234&day=senin&pattern=V1',
+    '/patterns?market={market}',
+    '/streak?market={market}&pattern=V1',
+    '/analysis?market={market}&pattern=V1&days=30',
+    '/analysis?market={market}&pattern=V3&days=all&offset=50'
+]
+
+
+def run_load_test(base_url, total_requests=1000, concurrency=8, market='SDY', paths=None):
+    paths = [p.format(market=market) for p in (paths or DEFAULT_PATHS)]
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    counter = iter(range(total_requests))
+
+    def worker():
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                return
+            started = time.perf_counter()
+            try:
+                with urlopen(base_url + paths[i % len(paths)], timeout=30) as response:
+                    response.read()
+                ok = True
+            except HTTPError as e:
+                ok = False
+                error = f"HTTP {e.code}"
+            except Exception as e:
+                ok = False
+                error = str(e)
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed)
+                if not ok:
+                    errors.append(error)
+
+    # Warm the engine and the response cache before timing
+    for path in paths:
+        with urlopen(base_url + path, timeout=300) as response:
+            json.loads(response.read())
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    duration = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'duration_s': duration,
+        'requests_per_second': len(latencies) / duration if duration > 0 else 0,
+        'p50_ms': latencies[len(latencies) // 2] * 1000 if latencies else 0,
+        'p95_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000 if latencies else 0
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test for the BBFS JSON API")
+    parser.add_argument('--url', default='http://127.0.0.1:8502')
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--market', default='SDY')
+    args = parser.parse_args()
+
+    report = run_load_test(args.url.rstrip('/'), args.requests, args.concurrency, args.market)
+    print(f"Requests    : {report['requests']:,} ({report['errors']} errors)")
+    print(f"Duration    : {report['duration_s']:.2f} s")
+    print(f"Throughput  : {report['requests_per_second']:.1f} req/s")
+    print(f"Latency     : p50 {report['p50_ms']:.1f} ms | p95 {report['p95_ms']:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
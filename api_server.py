@@ -0,0 +1,325 @@
+"""
+API Server - layanan HTTP/JSON tanpa UI untuk engine BBFS 4D.
+
+Memakai snapshot bersama dari MarketRegistry (sama dengan yang dipakai Streamlit
+bila dijalankan di proses yang sama) dan ThreadingHTTPServer dari stdlib, satu
+thread per request. Respons di-cache per (pasaran, data_version, endpoint,
+parameter), jadi request berulang tidak menyentuh engine sampai data berubah.
+
+Endpoint (GET, semua menerima ?market=HK|SGP|SDY):
+    /health                                     status dan data_version per pasaran
+    /predict?input=1234&day=senin&pattern=auto  BBFS 6 digit (default: draw terakhir)
+    /patterns                                   ringkasan performa semua pola
+    /streak?pattern=V1&limit=10                 loss streak aktif
+    /analysis?pattern=V1&days=7&offset=0&limit=50   riwayat win/loss per periode
+
+Endpoint POST (body JSON):
+    /predict/bulk   {"market": "SDY", "items": ["1234", ["5678", "senin", "V3"],
+                     {"input": "0912", "day": "kamis", "pattern": "V1"}]}
+
+Jalankan: python api_server.py --port 8502
+"""
+
+import argparse
+import json
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from market_registry import DEFAULT_MARKET, get_market_registry
+
+# Cached JSON responses kept across all endpoints and markets
+RESPONSE_CACHE_SIZE = 1024
+
+# Largest accepted /predict/bulk request
+MAX_BULK_ITEMS = 100000
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class ResponseCache:
+    """LRU of encoded responses keyed by (market, data_version, endpoint, params)"""
+
+    def __init__(self, max_entries=RESPONSE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            body = self._entries.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return body
+
+    def put(self, key, body):
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, set):
+        return sorted(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _param(params, name, default=None):
+    values = params.get(name)
+    return values[0] if values else default
+
+
+def _int_param(params, name, default):
+    value = _param(params, name)
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ApiError(400, f"Parameter '{name}' harus angka")
+
+
+def _days_param(params):
+    days = _param(params, 'days', '7')
+    if days == 'all':
+        return days
+    try:
+        return int(days)
+    except ValueError:
+        raise ApiError(400, "Parameter 'days' harus angka atau 'all'")
+
+
+def _check_pattern(system, pattern):
+    if not isinstance(pattern, str):
+        raise ApiError(400, "Field 'pattern' harus berupa string")
+    if pattern != 'auto' and pattern not in system.pattern_versions:
+        raise ApiError(400, f"Pola tidak dikenal: {pattern}")
+    return pattern
+
+
+def _pattern_param(system, params, default):
+    return _check_pattern(system, _param(params, 'pattern', default))
+
+
+def _check_day(system, day):
+    if not isinstance(day, str):
+        raise ApiError(400, "Field 'day' harus berupa nama hari (string)")
+    return system.standardize_day(day)
+
+
+def handle_predict(system, params):
+    pattern = _pattern_param(system, params, 'auto')
+    input_4d = _param(params, 'input')
+    day = _param(params, 'day')
+    if input_4d is None:
+        if not system.data:
+            raise ApiError(503, "Data belum tersedia")
+        latest = system.data[-1]
+        input_4d, day = latest['result'], day or latest['day']
+    if not (input_4d.isdigit() and len(input_4d) == 4):
+        raise ApiError(400, "Parameter 'input' harus 4 digit")
+    day = _check_day(system, day or 'senin')
+    return {
+        'input_4d': input_4d,
+        'day': day,
+        'pattern': pattern,
+        'bbfs': system.generate_prediction(input_4d, day, pattern)
+    }
+
+
+def handle_patterns(system, params):
+    best_pattern, _ = system.get_best_pattern()
+    return {'best_pattern': best_pattern, 'patterns': system.get_pattern_summary()}
+
+
+def handle_streak(system, params):
+    pattern = _pattern_param(system, params, 'V1')
+    limit = max(1, min(_int_param(params, 'limit', 10), 500))
+    return system.get_current_loss_streak_analysis(limit, pattern)
+
+
+def handle_analysis(system, params):
+    pattern = _pattern_param(system, params, 'V1')
+    limit = max(1, min(_int_param(params, 'limit', 50), 500))
+    return system.get_analysis_page(_days_param(params), pattern,
+                                    offset=_int_param(params, 'offset', 0), limit=limit)
+
+
+def _bulk_item(system, item, default_day):
+    if isinstance(item, dict):
+        input_4d, day, pattern = item.get('input'), item.get('day'), item.get('pattern', 'auto')
+    elif isinstance(item, (list, tuple)):
+        input_4d, day, pattern = (list(item) + [None, None, None])[:3]
+    else:
+        input_4d, day, pattern = item, None, None
+    input_4d = str(input_4d)
+    if not (input_4d.isdigit() and len(input_4d) == 4):
+        raise ApiError(400, f"Input harus 4 digit: {input_4d}")
+    pattern = _check_pattern(system, pattern or 'auto')
+    return input_4d, _check_day(system, day or default_day), pattern
+
+
+def handle_predict_bulk(system, payload):
+    items = payload.get('items')
+    if not isinstance(items, list):
+        raise ApiError(400, "Field 'items' harus berupa list")
+    if len(items) > MAX_BULK_ITEMS:
+        raise ApiError(413, f"Maksimal {MAX_BULK_ITEMS} item per request")
+    if not system.data:
+        raise ApiError(503, "Data belum tersedia")
+    default_day = payload.get('day') or system.data[-1]['day']
+    if not isinstance(default_day, str):
+        raise ApiError(400, "Field 'day' harus berupa nama hari (string)")
+    items = [_bulk_item(system, item, default_day) for item in items]
+    predictions = system.generate_predictions_bulk(items)
+    return {'predictions': [{'input_4d': input_4d, 'day': day, 'pattern': pattern, 'bbfs': bbfs}
+                            for (input_4d, day, pattern), bbfs in zip(items, predictions)]}
+
+
+ROUTES = {
+    '/predict': handle_predict,
+    '/patterns': handle_patterns,
+    '/streak': handle_streak,
+    '/analysis': handle_analysis
+}
+
+
+def _warm_system(registry, market):
+    """Published snapshot with its backtests done; handlers never run them on a shared snapshot"""
+    system = registry.ensure_warm(market)
+    if not system.is_warm:
+        raise ApiError(503, f"Data pasaran {market} belum tersedia, coba lagi nanti")
+    return system
+
+
+class BBFSApiHandler(BaseHTTPRequestHandler):
+    server_version = "BBFSApi/1.0"
+    response_cache = ResponseCache()
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+        try:
+            if url.path == '/health':
+                self._send(200, self._encode(self._health()))
+                return
+            handler = ROUTES.get(url.path)
+            if handler is None:
+                raise ApiError(404, f"Endpoint tidak dikenal: {url.path}")
+
+            registry = get_market_registry()
+            market = _param(params, 'market', DEFAULT_MARKET).upper()
+            if market not in registry.market_urls:
+                raise ApiError(400, f"Pasaran tidak dikenal: {market}")
+
+            # One snapshot per request; its data_version keys the cached response
+            system = _warm_system(registry, market)
+            cache_key = (market, system.data_version, url.path,
+                         tuple(sorted((k, tuple(v)) for k, v in params.items())))
+            body = self.response_cache.get(cache_key)
+            if body is None:
+                result = handler(system, params)
+                body = self._encode({'market': market, 'data_version': system.data_version, 'result': result})
+                self.response_cache.put(cache_key, body)
+            self._send(200, body)
+        except ApiError as e:
+            self._send(e.status, self._encode({'error': str(e)}))
+        except Exception as e:
+            print(f"API: Error handling {self.path}: {e}")
+            self._send(500, self._encode({'error': str(e)}))
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        try:
+            if url.path != '/predict/bulk':
+                raise ApiError(404, f"Endpoint tidak dikenal: {url.path}")
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+                payload = json.loads(self.rfile.read(length) or b'{}')
+            except ValueError:
+                raise ApiError(400, "Body harus JSON")
+            if not isinstance(payload, dict):
+                raise ApiError(400, "Body harus objek JSON")
+
+            registry = get_market_registry()
+            market = str(payload.get('market', DEFAULT_MARKET)).upper()
+            if market not in registry.market_urls:
+                raise ApiError(400, f"Pasaran tidak dikenal: {market}")
+            system = _warm_system(registry, market)
+            result = handle_predict_bulk(system, payload)
+            self._send(200, self._encode({'market': market, 'data_version': system.data_version, 'result': result}))
+        except ApiError as e:
+            self._send(e.status, self._encode({'error': str(e)}))
+        except Exception as e:
+            print(f"API: Error handling {self.path}: {e}")
+            self._send(500, self._encode({'error': str(e)}))
+
+    def _health(self):
+        registry = get_market_registry()
+        markets = {}
+        for market in registry.loaded_markets():
+            system = registry.get_snapshot(market)
+            markets[market] = {'load_state': system.load_state, 'data_version': system.data_version,
+                               'records': len(system.data)}
+        return {'status': 'ok', 'markets': markets, 'cache': self.response_cache.stats()}
+
+    def _encode(self, payload):
+        return json.dumps(payload, default=_json_default).encode('utf-8')
+
+    def _send(self, status, body):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Per-request logging would dominate under load
+        pass
+
+
+def create_server(host='127.0.0.1', port=8502):
+    server = ThreadingHTTPServer((host, port), BBFSApiHandler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BBFS 4D JSON API server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8502)
+    args = parser.parse_args()
+
+    # Warm every market in the background and keep them refreshed
+    get_market_registry().start_refresher()
+    server = create_server(args.host, args.port)
+    print(f"API: Serving on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
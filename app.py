@@ -3,67 +3,81 @@ from datetime import datetime, timedelta
 import time
 import uuid
 import hashlib
-from bbfs_4d_6digit_system import get_4d_system
-from streamlit_branding_remover import apply_complete_branding_removal
+from bbfs_4d_6digit_system import BBFS4D6DigitSystem
+from analysis_cache import get_analysis_cache
+from draw_calendar import DAY_NAMES
+from market_registry import MARKET_URLS, get_market_registry
+from ui_assets import inject_page_assets
 
-# Per-session caching to prevent cross-client interference
-def load_system_per_session(session_id, market='SDY'):
-    """Load system with per-session caching to isolate client states"""
-    cache_key = f"system_{session_id}_{market}"
-    
-    if cache_key not in st.session_state:
-        try:
-            # Predefined URLs for different markets
-            market_urls = {
-                'HK': 'https://resulthktercepat.org/',
-                'SGP': 'http://188.166.247.189/',
-                'SDY': 'http://128.199.123.196/'
-            }
-            data_url = market_urls.get(market, market_urls['SDY'])
-            system = get_4d_system(data_url)
-            st.session_state[cache_key] = system
-            print(f"Session {session_id}: Created new system for market {market}")
-        except Exception as e:
-            st.error(f"Error loading system: {str(e)}")
-            return None
-    
-    return st.session_state[cache_key]
+# Shared per-market systems - one scrape and one backtest per market per process
+def load_market_system(market='SDY'):
+    """Get the current shared snapshot for a market (treated as read-only by sessions)"""
+    try:
+        return get_market_registry().get_snapshot(market)
+    except Exception as e:
+        st.error(f"Error loading system: {str(e)}")
+        return None
 
-def get_filtered_analysis_per_session(session_id, _system, pattern, days_filter):
-    """Get filtered analysis with per-session caching"""
-    cache_key = f"analysis_{session_id}_{pattern}_{days_filter}_{_system.url}"
-    
-    if cache_key not in st.session_state:
+# Number of history rows fetched per page in the analysis list
+ANALYSIS_PAGE_SIZE = BBFS4D6DigitSystem.VIEW_PAGE_SIZE
+
+# Periode analisis -> days filter
+TIME_FILTERS = {
+    "7 Hari Terakhir": 7,
+    "30 Hari Terakhir": 30,
+    "6 Bulan Terakhir": 180,
+    "1 Tahun Terakhir": 365,
+    "Seluruh Data": "all"
+}
+
+def get_analysis_page_per_session(session_id, _system, view, load_more=False):
+    """Get the paged analysis list for a view model.
+    
+    The first page is part of the shared view model; only pages loaded with
+    load_more are kept per session (in the bounded analysis cache) and
+    appended to the rows.
+    """
+    pattern, days_filter = view['pattern'], view['days_filter']
+    analysis_cache = get_analysis_cache()
+    cache_key = (pattern, days_filter, _system.url, _system.data_version)
+    cached = analysis_cache.get(session_id, cache_key, view['analysis_page'])
+    
+    # Loaded rows are capped at the session budget of the cache
+    limit = min(ANALYSIS_PAGE_SIZE, analysis_cache.max_rows_per_session - len(cached['rows']))
+    if load_more and cached['next_offset'] is not None and limit > 0:
         try:
-            if hasattr(_system, 'get_filtered_analysis_by_days'):
-                result = _system.get_filtered_analysis_by_days(days_filter, pattern)
-            else:
-                if days_filter == "all":
-                    result = _system.get_real_time_analysis(limit=len(_system.data), pattern_version=pattern)
-                else:
-                    result = _system.get_real_time_analysis(limit=days_filter, pattern_version=pattern)
-            st.session_state[cache_key] = result
-            print(f"Session {session_id}: Cached analysis for pattern {pattern}, days {days_filter}")
+            page = _system.get_analysis_page(days_filter, pattern, offset=cached['next_offset'], limit=limit)
+            page['rows'] = cached['rows'] + page['rows']
+            page['offset'] = 0
+            if len(page['rows']) >= analysis_cache.max_rows_per_session:
+                # Budget reached: no more "Muat Lebih Banyak" for this view
+                page['next_offset'] = None
+            analysis_cache.put(session_id, cache_key, page, size=len(page['rows']))
+            print(f"Session {session_id}: Cached {len(page['rows'])}/{page['total']} analysis rows for pattern {pattern}, days {days_filter} - {analysis_cache.stats()}")
+            return page
         except Exception as e:
             print(f"Session {session_id}: Error in analysis: {str(e)}")
-            return []
     
-    return st.session_state[cache_key]
+    return cached
 
-def get_pattern_performance_per_session(session_id, _system):
-    """Get pattern performance with per-session caching"""
-    cache_key = f"performance_{session_id}_{_system.url}"
-    
-    if cache_key not in st.session_state:
-        try:
-            result = _system.get_pattern_summary()
-            st.session_state[cache_key] = result
-            print(f"Session {session_id}: Cached pattern performance")
-        except Exception as e:
-            print(f"Session {session_id}: Error getting performance: {str(e)}")
-            return {}
-    
-    return st.session_state[cache_key]
+# Seconds between refresh status checks while a requested refresh is running
+REFRESH_POLL_SECONDS = 2
+
+def refresh_finished(registry, pending_refresh):
+    """(finished, status) of the background refresh a session requested"""
+    refresh_status = registry.refresh_status(pending_refresh['market'])
+    finished_at = refresh_status['finished_at']
+    finished = not refresh_status['refreshing'] and finished_at and finished_at >= pending_refresh['requested_at']
+    return bool(finished), refresh_status
+
+@st.fragment(run_every=REFRESH_POLL_SECONDS)
+def refresh_wait_status(registry, pending_refresh):
+    """Status line polled while the refresh runs - only this fragment reruns, the
+    page stays rendered from the last snapshot until one full rerun picks up the new one"""
+    finished, _ = refresh_finished(registry, pending_refresh)
+    if finished:
+        st.rerun()
+    st.info("⏳ Memperbarui data di latar belakang... Menampilkan data terakhir.")
 
 def get_session_id():
     """Generate unique session ID per client without displaying in UI"""
@@ -92,598 +106,17 @@ def main():
         initial_sidebar_state="collapsed"
     )
     
-    # Apply complete Streamlit branding removal
-    apply_complete_branding_removal()
-    
-    # Optimized Mobile App Theme - Performance Focused
-    st.markdown("""
-    <style>
-    
-    /* Remove Streamlit elements */
-    header[data-testid="stHeader"] {
-        height: 0rem !important;
-        display: none !important;
-    }
-    
-    .stApp > header {
-        height: 0rem !important;
-        display: none !important;
-    }
-    
-    #MainMenu {
-        visibility: hidden !important;
-    }
-    
-    footer {
-        visibility: hidden !important;
-    }
-    
-    /* Hide "Hosted with Streamlit" button and all branding */
-    .viewerBadge_container__1QSob {
-        display: none !important;
-    }
-    
-    .viewerBadge_link__1S137 {
-        display: none !important;
-    }
-    
-    .viewerBadge_text__1JaDK {
-        display: none !important;
-    }
-    
-    [data-testid="stToolbar"] {
-        display: none !important;
-    }
-    
-    [data-testid="stDecoration"] {
-        display: none !important;
-    }
-    
-    [data-testid="stStatusWidget"] {
-        display: none !important;
-    }
-    
-    .streamlit-container {
-        display: none !important;
-    }
-    
-    /* Hide any remaining Streamlit branding */
-    div[data-testid="stToolbar"] {
-        visibility: hidden !important;
-        height: 0% !important;
-        position: fixed !important;
-        z-index: -1 !important;
-    }
-    
-    .st-emotion-cache-18ni7ap {
-        display: none !important;
-    }
-    
-    .st-emotion-cache-13ln4jf {
-        display: none !important;
-    }
-    
-    /* Hide deploy button and menu */
-    .st-emotion-cache-1rs6os {
-        display: none !important;
-    }
-    
-    /* Optimized Mobile Container */
-    .main .block-container {
-        padding: 70px 0 0 0 !important;
-        max-width: 375px !important;
-        margin: 0 auto !important;
-        background: #2B2B2B;
-        min-height: 100vh;
-    }
-    
-    .stApp {
-        background: linear-gradient(180deg, #2B2B2B 0%, #404040 100%);
-        min-height: 100vh;
-        position: relative;
-        overflow-x: hidden;
-    }
-    
-    .main {
-        background: transparent;
-        font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif;
-        color: #ffffff;
-        padding: 0;
-        margin: 0;
-        position: relative;
-        z-index: 2;
-    }
-    
-    /* Optimized Mobile Header */
-    .mobile-header {
-        background: rgba(43, 43, 43, 0.95);
-        backdrop-filter: blur(20px);
-        -webkit-backdrop-filter: blur(20px);
-        border-bottom: 1px solid rgba(255, 255, 255, 0.1);
-        padding: 16px 20px 12px 20px;
-        margin: 0;
-        position: fixed;
-        top: 0;
-        left: 0;
-        right: 0;
-        z-index: 1000;
-        box-shadow: 0 2px 20px rgba(43, 43, 43, 0.3);
-    }
-    
-    .app-title {
-        font-family: 'Inter', sans-serif;
-        font-size: 22px;
-        font-weight: 600;
-        color: #ffffff;
-        text-align: center;
-        margin: 0;
-        letter-spacing: -0.5px;
-    }
-    
-    .app-subtitle {
-        font-size: 11px;
-        font-weight: 400;
-        color: rgba(255, 255, 255, 0.7);
-        text-align: center;
-        margin: 2px 0 0 0;
-        letter-spacing: 0.5px;
-        text-transform: uppercase;
-    }
-    
-    /* Premium Status Bar */
-    .status-bar {
-        background: linear-gradient(135deg, rgba(255, 255, 255, 0.08) 0%, rgba(255, 255, 255, 0.04) 100%);
-        backdrop-filter: blur(20px);
-        -webkit-backdrop-filter: blur(20px);
-        border: 1px solid rgba(255, 255, 255, 0.1);
-        border-radius: 20px;
-        padding: 16px 24px;
-        margin: 16px 12px;
-        text-align: center;
-        box-shadow: 
-            0 8px 32px rgba(0, 0, 0, 0.3),
-            inset 0 1px 0 rgba(255, 255, 255, 0.1),
-            0 0 0 1px rgba(255, 255, 255, 0.05);
-        position: relative;
-        overflow: hidden;
-    }
-    
-
-    
-    .status-text {
-        font-size: 13px;
-        font-weight: 500;
-        color: rgba(255, 255, 255, 0.9);
-        margin: 0;
-        position: relative;
-        z-index: 1;
-        letter-spacing: 0.2px;
-    }
-    
-    /* Optimized Card Components - Lightweight */
-    .mobile-card {
-        background: rgba(255, 255, 255, 0.08);
-        border: 1px solid rgba(255, 255, 255, 0.12);
-        border-radius: 20px;
-        margin: 12px;
-        padding: 18px;
-        box-shadow: 0 4px 12px rgba(0, 0, 0, 0.2);
-    }
-    
-    .prediction-card {
-        background: rgba(64, 64, 64, 0.9);
-        border: 1px solid rgba(233, 69, 96, 0.2);
-        border-radius: 20px;
-        margin: 16px 12px;
-        padding: 24px;
-        text-align: center;
-        box-shadow: 0 6px 16px rgba(233, 69, 96, 0.2);
-    }
-    
-
-    
-    .analytics-card {
-        background: rgba(255, 255, 255, 0.08);
-        border-radius: 16px;
-        padding: 1.5rem;
-        margin: 1rem 0;
-        border: 1px solid rgba(255, 255, 255, 0.15);
-    }
-    
-    /* Optimized BBFS Display */
-    .bbfs-display {
-        background: linear-gradient(135deg, #1a1a2e 0%, #16213e 50%, #e94560 100%);
-        color: #ffffff;
-        font-family: 'JetBrains Mono', monospace;
-        font-size: 30px;
-        font-weight: 700;
-        text-align: center;
-        padding: 20px;
-        border-radius: 16px;
-        margin: 0;
-        letter-spacing: 4px;
-        box-shadow: 0 8px 24px rgba(233, 69, 96, 0.3);
-        border: 1px solid rgba(233, 69, 96, 0.4);
-        position: relative;
-        z-index: 1;
-    }
-    
-    /* Premium Section Headers */
-    .section-header {
-        font-family: 'Inter', sans-serif;
-        font-size: 18px;
-        font-weight: 600;
-        color: rgba(255, 255, 255, 0.95);
-        margin: 32px 16px 16px 16px;
-        letter-spacing: -0.4px;
-        position: relative;
-        padding-left: 12px;
-    }
-    
-    .section-header::before {
-        content: '';
-        position: absolute;
-        left: 0;
-        top: 50%;
-        transform: translateY(-50%);
-        width: 4px;
-        height: 20px;
-        background: linear-gradient(135deg, #e94560, #0f3460);
-        border-radius: 2px;
-    }
-    
-    /* Optimized Metrics Grid */
-    .metrics-grid {
-        display: grid;
-        grid-template-columns: 1fr 1fr;
-        gap: 10px;
-        margin: 16px 12px;
-    }
-    
-    .metric-item {
-        background: rgba(255, 255, 255, 0.06);
-        border: 1px solid rgba(255, 255, 255, 0.1);
-        border-radius: 16px;
-        padding: 16px 12px;
-        text-align: center;
-        box-shadow: 0 2px 8px rgba(0, 0, 0, 0.2);
-    }
-    
-    .metric-value {
-        font-family: 'Inter', sans-serif;
-        font-size: 22px;
-        font-weight: 700;
-        color: #e94560;
-        margin: 0 0 4px 0;
-        text-shadow: 0 0 20px rgba(233, 69, 96, 0.3);
-    }
-    
-    .metric-label {
-        font-size: 11px;
-        font-weight: 500;
-        color: rgba(255, 255, 255, 0.7);
-        margin: 0;
-        letter-spacing: 0.5px;
-        text-transform: uppercase;
-    }
-    
-    /* Current Streak */
-    .current-streak {
-        background: linear-gradient(135deg, #FF3B30 0%, #FF6B35 100%);
-        border-radius: 20px;
-        padding: 20px;
-        margin: 16px;
-        text-align: center;
-        box-shadow: 0 8px 32px rgba(255, 59, 48, 0.3);
-        border: 1px solid rgba(255, 255, 255, 0.2);
-    }
-    
-    .current-streak.success {
-        background: linear-gradient(135deg, #30D158 0%, #00D4AA 100%);
-        box-shadow: 0 8px 32px rgba(48, 209, 88, 0.3);
-    }
-    
-    .streak-number {
-        font-family: 'SF Pro Display', sans-serif;
-        font-size: 40px;
-        font-weight: 900;
-        color: #ffffff;
-        margin: 0;
-    }
-    
-    .streak-label {
-        font-size: 16px;
-        font-weight: 600;
-        color: rgba(255, 255, 255, 0.9);
-        margin: 4px 0 0 0;
-    }
-    
-    /* Optimized Results List */
-    .results-list {
-        background: rgba(255, 255, 255, 0.05);
-        backdrop-filter: blur(15px);
-        -webkit-backdrop-filter: blur(15px);
-        border-radius: 20px;
-        margin: 16px 12px;
-        overflow: hidden;
-        border: 1px solid rgba(255, 255, 255, 0.08);
-        box-shadow: 0 8px 24px rgba(0, 0, 0, 0.3);
-    }
-    
-    .result-item {
-        padding: 18px 20px;
-        border-bottom: 1px solid rgba(255, 255, 255, 0.05);
-        display: flex;
-        justify-content: space-between;
-        align-items: center;
-        transition: all 0.3s cubic-bezier(0.25, 0.46, 0.45, 0.94);
-        position: relative;
-        overflow: hidden;
-    }
-    
-
-    
-    .result-item:last-child {
-        border-bottom: none;
-    }
-    
-    .result-item:active {
-        background: rgba(255, 255, 255, 0.08);
-        transform: scale(0.99);
-    }
-    
-    .result-left {
-        flex: 1;
-        padding-left: 8px;
-    }
-    
-    .result-date {
-        font-size: 12px;
-        font-weight: 500;
-        color: rgba(255, 255, 255, 0.6);
-        margin: 0 0 4px 0;
-        text-transform: uppercase;
-        letter-spacing: 0.5px;
-    }
-    
-    .result-numbers {
-        font-size: 15px;
-        font-weight: 600;
-        color: #ffffff;
-        margin: 0;
-        font-family: 'JetBrains Mono', monospace;
-        letter-spacing: 1px;
-    }
-    
-    .result-status {
-        font-size: 12px;
-        font-weight: 700;
-        padding: 8px 16px;
-        border-radius: 16px;
-        text-transform: uppercase;
-        letter-spacing: 1px;
-        backdrop-filter: blur(10px);
-        -webkit-backdrop-filter: blur(10px);
-        box-shadow: 0 4px 16px rgba(0, 0, 0, 0.2);
-    }
-    
-    .win {
-        background: rgba(48, 209, 88, 0.2);
-        color: #30D158;
-    }
-    
-    .loss {
-        background: rgba(255, 59, 48, 0.2);
-        color: #FF3B30;
-    }
-    
-    /* Optimized Buttons */
-    .stButton > button {
-        background: linear-gradient(135deg, #e94560 0%, #0f3460 100%);
-        color: #ffffff;
-        border: 1px solid rgba(255, 255, 255, 0.2);
-        border-radius: 14px;
-        padding: 14px 20px;
-        font-family: 'Inter', sans-serif;
-        font-size: 14px;
-        font-weight: 600;
-        width: calc(100% - 24px);
-        margin: 8px 12px;
-        transition: all 0.2s ease;
-        box-shadow: 0 4px 16px rgba(233, 69, 96, 0.3);
-        text-transform: uppercase;
-        letter-spacing: 0.5px;
-    }
-    
-    .stButton > button:hover {
-        background: linear-gradient(135deg, #ff5577 0%, #1e5aa0 100%);
-        transform: translateY(-1px);
-        box-shadow: 0 6px 20px rgba(233, 69, 96, 0.4);
-    }
-    
-    .stButton > button:active {
-        transform: translateY(0);
-        box-shadow: 0 2px 8px rgba(233, 69, 96, 0.3);
-    }
-    
-    /* Input Fields */
-    .stTextInput > div > div > input {
-        background: rgba(255, 255, 255, 0.08);
-        border: 1px solid rgba(255, 255, 255, 0.2);
-        border-radius: 12px;
-        color: #ffffff;
-        font-size: 16px;
-        padding: 12px 16px;
-    }
-    
-    .stTextInput > div > div > input:focus {
-        border-color: #007AFF;
-        box-shadow: 0 0 0 3px rgba(0, 122, 255, 0.2);
-    }
-    
-    /* Spinner disabled */
-    .stSpinner {
-        display: none !important;
-    }
-    
-    /* Bottom Safe Area */
-    .bottom-safe-area {
-        height: 34px;
-        background: transparent;
-    }
-    
-    /* Input Fields Premium Styling */
-    .stTextInput > div > div > input {
-        background: linear-gradient(145deg, rgba(255, 255, 255, 0.08) 0%, rgba(255, 255, 255, 0.02) 100%);
-        backdrop-filter: blur(20px);
-        -webkit-backdrop-filter: blur(20px);
-        border: 1px solid rgba(255, 255, 255, 0.15);
-        border-radius: 16px;
-        color: #ffffff;
-        font-size: 15px;
-        font-family: 'Inter', sans-serif;
-        padding: 16px 20px;
-        transition: all 0.3s cubic-bezier(0.25, 0.46, 0.45, 0.94);
-        box-shadow: 
-            0 8px 32px rgba(0, 0, 0, 0.2),
-            inset 0 1px 0 rgba(255, 255, 255, 0.1);
-    }
-    
-    .stTextInput > div > div > input:focus {
-        border-color: rgba(233, 69, 96, 0.5);
-        box-shadow: 
-            0 0 0 3px rgba(233, 69, 96, 0.2),
-            0 12px 40px rgba(0, 0, 0, 0.3),
-            inset 0 1px 0 rgba(255, 255, 255, 0.15);
-        background: linear-gradient(145deg, rgba(255, 255, 255, 0.12) 0%, rgba(255, 255, 255, 0.06) 100%);
-    }
-    
-    /* Spinner completely hidden */
-    .stSpinner,
-    .stSpinner > div {
-        display: none !important;
-        visibility: hidden !important;
-    }
-    
-    /* Sidebar Premium Styling */
-    .css-1d391kg {
-        background: linear-gradient(145deg, rgba(43, 43, 43, 0.8) 0%, rgba(64, 64, 64, 0.9) 100%);
-        backdrop-filter: blur(40px);
-        -webkit-backdrop-filter: blur(40px);
-        border-right: 1px solid rgba(255, 255, 255, 0.1);
-    }
-    
-    /* Ultra-Responsive Design */
-    @media (max-width: 380px) {
-        .main .block-container {
-            max-width: 100% !important;
-            padding: 0 8px !important;
-        }
-        
-        .bbfs-display {
-            font-size: 26px;
-            letter-spacing: 4px;
-            padding: 20px 16px;
-        }
-        
-        .app-title {
-            font-size: 20px;
-        }
-        
-        .mobile-card {
-            margin: 8px 4px;
-            padding: 16px;
-            border-radius: 20px;
-        }
-        
-        .prediction-card {
-            margin: 12px 4px;
-            padding: 24px 16px;
-        }
-        
-        .metrics-grid {
-            gap: 8px;
-            margin: 12px 4px;
-        }
-        
-        .metric-item {
-            padding: 16px 12px;
-        }
-        
-        .section-header {
-            margin: 24px 8px 12px 8px;
-            font-size: 16px;
-        }
-        
-        .results-list {
-            margin: 12px 4px;
-        }
-        
-        .status-bar {
-            margin: 12px 4px;
-            padding: 14px 20px;
-        }
-    }
-    
-    @media (max-width: 320px) {
-        .bbfs-display {
-            font-size: 22px;
-            letter-spacing: 3px;
-        }
-        
-        .app-title {
-            font-size: 18px;
-        }
-        
-        .metric-value {
-            font-size: 18px;
-        }
-        
-        .metric-label {
-            font-size: 10px;
-        }
-    }
-    
-    /* Premium Touch Interactions */
-    .mobile-card:active,
-    .metric-item:active,
-    .result-item:active {
-        transform: scale(0.98);
-    }
-    
-    /* Bottom Safe Area */
-    .bottom-safe-area {
-        height: 40px;
-        background: transparent;
-        margin-top: 20px;
-    }
-    
-    /* Premium Scrollbar */
-    ::-webkit-scrollbar {
-        width: 6px;
-    }
-    
-    ::-webkit-scrollbar-track {
-        background: rgba(255, 255, 255, 0.1);
-        border-radius: 3px;
-    }
-    
-    ::-webkit-scrollbar-thumb {
-        background: linear-gradient(135deg, #e94560, #0f3460);
-        border-radius: 3px;
-    }
-    
-    ::-webkit-scrollbar-thumb:hover {
-        background: linear-gradient(135deg, #ff5577, #1e5aa0);
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    # Branding removal + mobile theme, minified once at import and sent as one block
+    inject_page_assets()
     
     # Load system with per-session isolation
     if 'current_market' not in st.session_state:
         st.session_state.current_market = 'SDY'
     
-    system = load_system_per_session(session_id, st.session_state.current_market)
+    # Grab the snapshot once per rerun so a concurrent refresh can't change it mid-render.
+    # All markets are kept warm by the refresher, so a market switch is just this lookup.
+    system = load_market_system(st.session_state.current_market)
+    get_market_registry().start_refresher()
     
     if system is None:
         st.error("Gagal memuat sistem. Silakan refresh halaman.")
@@ -705,8 +138,10 @@ def main():
     if not st.session_state[data_loaded_key]:
         try:
             print(f"Session {session_id}: Loading data for market {st.session_state.current_market}...")
-            if system.fetch_complete_data():
-                system.run_all_pattern_tests()
+            if not system.is_warm:
+                # The shared snapshot is not warm yet (failed scrape) - one more attempt for this session
+                system = get_market_registry().ensure_warm(st.session_state.current_market)
+            if system.data:
                 st.session_state[data_loaded_key] = True
                 print(f"Session {session_id}: Data loaded successfully")
             else:
@@ -718,9 +153,21 @@ def main():
             st.session_state[data_loaded_key] = True
             print(f"Session {session_id}: Error loading data: {str(e)}")
     
+    # The snapshot precomputes one view model per (pattern, days filter) and data
+    # version; the rest of the page only formats it
+    selected_pattern_key = f'selected_pattern_{session_id}'
+    selected_pattern = st.session_state.get(selected_pattern_key, 'V1')
+    days_filter = TIME_FILTERS[st.session_state.get("time_filter", "7 Hari Terakhir")]
+    view = system.get_view_model(selected_pattern, days_filter, ANALYSIS_PAGE_SIZE)
+    
+    switch_key = f"switch_started_{session_id}"
+    if switch_key in st.session_state:
+        get_market_registry().record_switch(st.session_state.current_market,
+                                            time.perf_counter() - st.session_state.pop(switch_key))
+    
     # Status - selalu tampilkan sesuatu
     if system.data and len(system.data) > 0:
-        best_pattern, best_performance = system.get_best_pattern()
+        best_pattern, best_performance = view['best_pattern'], view['best_performance']
         if best_performance:
             status_color = "#00d2d3" if best_performance['max_consecutive_loss'] <= 5 else "#ff6b6b"
             status_icon = "●" if best_performance['max_consecutive_loss'] <= 5 else "●"
@@ -737,34 +184,38 @@ def main():
     else:
         st.markdown('<div class="status-bar"><div class="status-text">MEMUAT SISTEM...</div></div>', unsafe_allow_html=True)
     
-    # Auto Refresh Button - Optimized dengan info data terbaru
+    # Auto Refresh Button - only wakes the background refresher; the page keeps
+    # rendering from the last published snapshot until the new one is ready
+    registry = get_market_registry()
+    refresh_key = f"refresh_pending_{session_id}"
     if st.button("🔄 Refresh Data Terbaru", type="primary", use_container_width=True):
-        try:
-            print(f"Session {session_id}: User requested data refresh")
-            # Clear caches efficiently
-            old_latest = None
-            if system.data:
-                old_latest = system.data[-1]['date'].strftime('%Y-%m-%d')
-            
-            system.data = []
-            system.performance_cache = {}
-            system.loss_analysis = {}
-            system.optimization_cache = {}
-            system.last_updated = None
-            
-            # Clear per-session caches
-            for key in list(st.session_state.keys()):
-                if key.startswith(f"analysis_{session_id}") or key.startswith(f"performance_{session_id}"):
-                    del st.session_state[key]
-            
-            # Force reload data without blocking UI
-            if system.fetch_complete_data():
-                system.run_all_pattern_tests()
-                
+        print(f"Session {session_id}: User requested data refresh")
+        old_latest = None
+        if system.data:
+            old_latest = system.data[-1]['date'].strftime('%Y-%m-%d')
+        registry.request_refresh(st.session_state.current_market)
+        st.session_state[refresh_key] = {
+            'market': st.session_state.current_market,
+            'latest': old_latest,
+            'requested_at': time.time()
+        }
+    
+    pending_refresh = st.session_state.get(refresh_key)
+    if pending_refresh and pending_refresh['market'] == st.session_state.current_market:
+        finished, refresh_status = refresh_finished(registry, pending_refresh)
+        if not finished:
+            refresh_wait_status(registry, pending_refresh)
+        else:
+            del st.session_state[refresh_key]
+            if refresh_status['ok'] and refresh_status.get('outcome') == 'unchanged':
+                latest = pending_refresh['latest'] or '-'
+                st.success(f"✓ Belum ada data baru. Terakhir: {latest}")
+                print(f"Session {session_id}: Refresh found no new draws - {latest}")
+            elif refresh_status['ok']:
                 # Cek apakah ada data baru
                 if system.data:
                     new_latest = system.data[-1]['date'].strftime('%Y-%m-%d')
-                    if old_latest and new_latest != old_latest:
+                    if pending_refresh['latest'] and new_latest != pending_refresh['latest']:
                         st.success(f"✓ Data baru ditemukan! Terbaru: {new_latest}")
                         print(f"Session {session_id}: New data found - {new_latest}")
                     else:
@@ -773,16 +224,12 @@ def main():
                 else:
                     st.success("Data berhasil diperbarui!")
                     print(f"Session {session_id}: Data refreshed successfully")
-                
-                data_loaded_key = f"data_loaded_{session_id}_{st.session_state.current_market}"
-                st.session_state[data_loaded_key] = True
-                st.rerun()
+            elif refresh_status['error']:
+                st.error(f"Error saat refresh: {refresh_status['error']}")
+                print(f"Session {session_id}: Error during refresh: {refresh_status['error']}")
             else:
                 st.error("Gagal mengambil data dari server")
                 print(f"Session {session_id}: Failed to refresh data")
-        except Exception as e:
-            st.error(f"Error saat refresh: {str(e)}")
-            print(f"Session {session_id}: Error during refresh: {str(e)}")
 
     # Market Selection Section
     with st.expander("🌏 Pilih Pasaran Togel", expanded=False):
@@ -790,17 +237,17 @@ def main():
         markets_info = {
             'HK': {
                 'name': 'Hongkong',
-                'url': 'https://resulthktercepat.org/',
+                'url': MARKET_URLS['HK'],
                 'description': 'Pasaran Hongkong - Data terlengkap'
             },
             'SGP': {
                 'name': 'Singapore',
-                'url': 'http://188.166.247.189/',
+                'url': MARKET_URLS['SGP'],
                 'description': 'Pasaran Singapore - Akurasi tinggi'
             },
             'SDY': {
                 'name': 'Sydney',
-                'url': 'http://128.199.123.196/',
+                'url': MARKET_URLS['SDY'],
                 'description': 'Pasaran Sydney - Default sistem'
             }
         }
@@ -817,11 +264,13 @@ def main():
                     try:
                         print(f"Session {session_id}: Switching to HK market")
                         # Clear current session caches
+                        get_analysis_cache().drop_session(session_id)
                         for key in list(st.session_state.keys()):
-                            if key.startswith(f"system_{session_id}") or key.startswith(f"analysis_{session_id}") or key.startswith(f"performance_{session_id}") or key.startswith(f"data_loaded_{session_id}"):
+                            if key.startswith(f"data_loaded_{session_id}"):
                                 del st.session_state[key]
                         
                         st.session_state.current_market = 'HK'
+                        st.session_state[f"switch_started_{session_id}"] = time.perf_counter()
                         st.success(f"Beralih ke pasaran Hongkong!")
                         print(f"Session {session_id}: Successfully switched to HK market")
                         st.rerun()
@@ -835,11 +284,13 @@ def main():
                     try:
                         print(f"Session {session_id}: Switching to SGP market")
                         # Clear current session caches
+                        get_analysis_cache().drop_session(session_id)
                         for key in list(st.session_state.keys()):
-                            if key.startswith(f"system_{session_id}") or key.startswith(f"analysis_{session_id}") or key.startswith(f"performance_{session_id}") or key.startswith(f"data_loaded_{session_id}"):
+                            if key.startswith(f"data_loaded_{session_id}"):
                                 del st.session_state[key]
                         
                         st.session_state.current_market = 'SGP'
+                        st.session_state[f"switch_started_{session_id}"] = time.perf_counter()
                         st.success(f"Beralih ke pasaran Singapore!")
                         print(f"Session {session_id}: Successfully switched to SGP market")
                         st.rerun()
@@ -853,11 +304,13 @@ def main():
                     try:
                         print(f"Session {session_id}: Switching to SDY market")
                         # Clear current session caches
+                        get_analysis_cache().drop_session(session_id)
                         for key in list(st.session_state.keys()):
-                            if key.startswith(f"system_{session_id}") or key.startswith(f"analysis_{session_id}") or key.startswith(f"performance_{session_id}") or key.startswith(f"data_loaded_{session_id}"):
+                            if key.startswith(f"data_loaded_{session_id}"):
                                 del st.session_state[key]
                         
                         st.session_state.current_market = 'SDY'
+                        st.session_state[f"switch_started_{session_id}"] = time.perf_counter()
                         st.success(f"Beralih ke pasaran Sydney!")
                         print(f"Session {session_id}: Successfully switched to SDY market")
                         st.rerun()
@@ -869,14 +322,14 @@ def main():
     
     # Sidebar - Data info
     with st.sidebar:
-        data_info = system.get_data_info()
+        data_info = view['data_info']
         if data_info:
             st.markdown("### Dataset")
             st.metric("Records", f"{data_info['total_records']:,}")
             st.text(data_info['date_range'])
             
             # Performance metrics
-            best_pattern, best_performance = system.get_best_pattern()
+            best_pattern, best_performance = view['best_pattern'], view['best_performance']
             if best_performance:
                 st.markdown("### Performance")
                 st.metric("Best Pattern", best_pattern)
@@ -884,17 +337,24 @@ def main():
                 st.metric("Win Rate", f"{best_performance['win_rate']:.1f}%")
                 target_status = "Tercapai" if best_performance['max_consecutive_loss'] <= 5 else "Belum Tercapai"
                 st.metric("Target ≤5 Loss", target_status)
+            
+            next_draw = system.next_draw()
+            st.caption(f"Draw berikutnya: {DAY_NAMES[next_draw.weekday()].capitalize()} "
+                       f"{next_draw.strftime('%d/%m %H:%M')} {next_draw.tzname()}")
+            
+            switch_stats = get_market_registry().switch_stats()
+            if switch_stats['count']:
+                st.caption(f"Pindah pasaran: rata-rata {switch_stats['avg_ms']:.0f} ms | p95 {switch_stats['p95_ms']:.0f} ms")
     
     # Pattern Versions Table with Selection
 
     
     if system.data and len(system.data) > 0:
-        pattern_summary = get_pattern_performance_per_session(session_id, system)
+        pattern_summary = view['pattern_summary']
         if pattern_summary:
             # Initialize selected pattern in session state
             if 'selected_pattern' not in st.session_state:
-                best_pattern, _ = system.get_best_pattern()
-                st.session_state.selected_pattern = best_pattern or 'V1'
+                st.session_state.selected_pattern = view['best_pattern'] or 'V1'
             
             st.markdown("""
             <div class="mobile-card">
@@ -956,15 +416,13 @@ def main():
             st.markdown("</div>", unsafe_allow_html=True)
             
             # Display detailed validation for selected pattern
-            selected_pattern_key = f'selected_pattern_{session_id}'
-            selected_pattern = st.session_state.get(selected_pattern_key, 'V1')
-            if selected_pattern in system.performance_cache:
-                selected_performance = system.performance_cache[selected_pattern]
+            if view['performance']:
+                selected_performance = view['performance']
                 
                 st.markdown(f"""
                 <div class="mobile-card">
                     <div style="font-size: 16px; font-weight: 600; margin-bottom: 12px; color: #e94560;">
-                        Validasi Detail: {selected_pattern} - {system.pattern_versions[selected_pattern]}
+                        Validasi Detail: {selected_pattern} - {view['pattern_name']}
                     </div>
                     <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 12px; margin-bottom: 16px;">
                         <div style="text-align: center; padding: 12px; background: rgba(255,255,255,0.05); border-radius: 8px;">
@@ -989,27 +447,16 @@ def main():
     
     # Selalu tampilkan konten dasar
     if system.data and len(system.data) >= 2:
-        latest_results = system.get_latest_results(1)
-        if latest_results and len(latest_results) > 0:
-            latest = latest_results[0]
-            
+        latest = view['latest']
+        if latest:
             # Use actual data date for accurate display
-            try:
-                if hasattr(latest['date'], 'strftime'):
-                    current_date_display = latest['date'].strftime('%d/%m/%Y')
-                else:
-                    current_date_display = str(latest['date'])[:10]
-                current_day_indo = latest['day']
-            except:
-                current_date_display = "N/A"
-                current_day_indo = "N/A"
+            current_date_display = latest['date_display']
+            current_day_indo = latest['day']
             
             try:
-                # Generate BBFS untuk latest result using selected pattern
+                # BBFS untuk latest result using selected pattern (precomputed)
                 input_4d = latest['result']  # Use full 4D result
-                selected_pattern_key = f'selected_pattern_{session_id}'
-                selected_pattern = st.session_state.get(selected_pattern_key, 'V1')
-                bbfs_6digit = system.generate_prediction(input_4d, current_day_indo, selected_pattern)
+                bbfs_6digit = view['prediction']
                 
                 # Get country flag for current market
                 market_flags = {
@@ -1045,9 +492,7 @@ def main():
                 """, unsafe_allow_html=True)
                 
                 # Quick metrics dengan validasi data for selected pattern
-                selected_pattern_key = f'selected_pattern_{session_id}'
-                selected_pattern = st.session_state.get(selected_pattern_key, 'V1')
-                selected_performance = system.performance_cache.get(selected_pattern, {})
+                selected_performance = view['performance']
                 if selected_performance and selected_performance.get('total_tests', 0) > 0:
                     # Validasi ulang perhitungan untuk memastikan akurasi
                     total_tests = selected_performance.get('total_tests', 0)
@@ -1107,10 +552,8 @@ def main():
     current_flag = market_flags.get(st.session_state.current_market, '🇦🇺')
     st.markdown(f'<div class="section-title">{current_flag} Loss Streak Aktif {st.session_state.current_market}</div>', unsafe_allow_html=True)
     
-    # Calculate current loss streak for selected pattern
-    selected_pattern_key = f'selected_pattern_{session_id}'
-    selected_pattern = st.session_state.get(selected_pattern_key, 'V1')
-    streak_analysis = system.get_current_loss_streak_analysis(10, selected_pattern)
+    # Current loss streak for selected pattern
+    streak_analysis = view['streak']
     current_loss_streak = streak_analysis.get('current_streak', 0)
     streak_details = streak_analysis.get('streak_details', [])
     
@@ -1198,12 +641,10 @@ def main():
     
     # Loss Streak Statistics for selected pattern with Data Validation
     st.markdown(f'<div class="section-title">{current_flag} Statistik Loss Streak {st.session_state.current_market}</div>', unsafe_allow_html=True)
-    selected_pattern_key = f'selected_pattern_{session_id}'
-    selected_pattern = st.session_state.get(selected_pattern_key, 'V1')
-    loss_stats = system.get_consecutive_loss_breakdown(selected_pattern)
+    loss_stats = view['loss_breakdown']
     
     # Add data validation info
-    data_info = system.get_data_info()
+    data_info = view['data_info']
     if data_info:
         st.markdown(f"""
         <div style="background: rgba(0,210,211,0.1); border-left: 4px solid #00d2d3; padding: 12px; margin: 8px 0; border-radius: 8px;">
@@ -1292,30 +733,18 @@ def main():
         key="time_filter"
     )
     
-    # Convert time filter to days
-    filter_mapping = {
-        "7 Hari Terakhir": 7,
-        "30 Hari Terakhir": 30,
-        "6 Bulan Terakhir": 180,
-        "1 Tahun Terakhir": 365,
-        "Seluruh Data": "all"
-    }
-    
-    days_filter = filter_mapping[time_filter]
-    selected_pattern_key = f'selected_pattern_{session_id}'
-    selected_pattern = st.session_state.get(selected_pattern_key, 'V1')
-    
-    # Get filtered analysis data with per-session cache
+    # Get the first page(s) of filtered analysis data (days_filter was read from this selectbox's state)
     try:
-        realtime_analysis = get_filtered_analysis_per_session(session_id, system, selected_pattern, days_filter)
+        analysis_page = get_analysis_page_per_session(session_id, system, view)
     except Exception as e:
         st.error(f"Error mengambil analisis: {str(e)}")
-        realtime_analysis = None
+        analysis_page = None
+    realtime_analysis = analysis_page['rows'] if analysis_page else []
     if realtime_analysis:
-        # Get the actual latest data from system.data directly to ensure accuracy
-        if system.data:
-            actual_latest = system.data[-1]  # Get the very last entry from raw data
-            actual_date_display = actual_latest['date'].strftime('%d/%m/%Y')
+        # Latest draw from the view model (the very last entry of the raw data)
+        if view['latest']:
+            actual_latest = view['latest']
+            actual_date_display = actual_latest['date_display']
             actual_day = actual_latest['day']
             actual_result = actual_latest['result']
             
@@ -1347,25 +776,18 @@ def main():
         st.markdown(f"""
         <div class="mobile-card" style="text-align: center; margin-bottom: 16px;">
             <div style="font-size: 14px; font-weight: 600; color: #e94560;">{current_flag} Filter Aktif: {time_filter}</div>
-            <div style="font-size: 12px; color: rgba(255,255,255,0.7);">Pasaran: {st.session_state.current_market} | Pattern: {selected_pattern} | Total Data: {len(realtime_analysis) if realtime_analysis else 0}</div>
+            <div style="font-size: 12px; color: rgba(255,255,255,0.7);">Pasaran: {st.session_state.current_market} | Pattern: {selected_pattern} | Total Data: {analysis_page['total']}</div>
         </div>
         """, unsafe_allow_html=True)
         
         # Mobile Results List dengan optimasi
         st.markdown('<div class="results-list">', unsafe_allow_html=True)
         
-        wins_count = 0
-        loss_count = 0
+        # Window totals come from the engine; only the fetched pages are rendered
+        wins_count = analysis_page['wins']
+        loss_count = analysis_page['losses']
         
-        # Remove artificial limit - show all filtered data
-        max_display = len(realtime_analysis)  # Show all data without arbitrary limits
-        
-        for i, analysis in enumerate(realtime_analysis[:max_display]):
-            if analysis['is_win']:
-                wins_count += 1
-            else:
-                loss_count += 1
-            
+        for i, analysis in enumerate(realtime_analysis):
             # Mobile optimized date formatting - show DD/MM only for space efficiency
             try:
                 if hasattr(analysis['date'], 'strftime'):
@@ -1416,14 +838,20 @@ def main():
         # Show data summary information
         st.markdown(f"""
         <div style="text-align: center; padding: 10px; color: rgba(255,255,255,0.6); font-size: 12px;">
-            Menampilkan semua {len(realtime_analysis)} data untuk periode {time_filter}
+            Menampilkan {len(realtime_analysis)} dari {analysis_page['total']} data untuk periode {time_filter}
         </div>
         """, unsafe_allow_html=True)
         
         st.markdown('</div>', unsafe_allow_html=True)
         
+        # Fetch the next page on demand
+        if analysis_page['next_offset'] is not None:
+            if st.button("⬇️ Muat Lebih Banyak", key=f"load_more_{session_id}", use_container_width=True):
+                get_analysis_page_per_session(session_id, system, view, load_more=True)
+                st.rerun()
+        
         # Enhanced summary dengan metrics
-        total_analyzed = len(realtime_analysis)
+        total_analyzed = analysis_page['total']
         recent_win_rate = (wins_count / total_analyzed * 100) if total_analyzed > 0 else 0
         
         # Metrics grid untuk statistik
@@ -1,20 +1,69 @@
-import requests
-import re
-from datetime import datetime, timedelta
 from collections import Counter, defaultdict
 import random
-import time
 import math
+import copy
+from bisect import bisect_left
 from typing import Union
 
-class BBFS4D6DigitSystem:
-    def __init__(self, data_url=None):
-        self.url = data_url if data_url else "http://128.199.123.196/"
-        self.data = []
-        self.performance_cache = {}
-        self.loss_analysis = {}
-        self.optimization_cache = {}
-        self.last_updated = None
+import numpy as np
+
+from bbfs_engine_core import BBFSEngineCore, StreakCounter
+from single_flight import SingleFlight
+
+# V1/V3 rank candidates in the iteration order of this set (ties keep that order);
+# built the same way here so the bulk path breaks ties identically
+_CANDIDATE_ORDER = [int(digit) for digit in set(str(i) for i in range(10))]
+
+# Per-digit weights of the V1/V3 scoring rules, indexed by digit
+_V1_CRITICAL_BONUS = np.array([45000, 40000, 40000, 0, 0, 45000, 40000, 40000, 45000, 45000], dtype=np.int64)
+_V1_COVERAGE_BONUS = np.array([20000, 15000, 8000, 8000, 8000, 20000, 15000, 15000, 20000, 20000], dtype=np.int64)
+_V3_CRITICAL_BONUS = np.array([55000, 50000, 50000, 0, 0, 55000, 50000, 50000, 55000, 55000], dtype=np.int64)
+_V3_COVERAGE_BONUS = np.array([25000, 20000, 10000, 10000, 10000, 25000, 20000, 20000, 25000, 25000], dtype=np.int64)
+
+
+def _transform_weights(transforms):
+    """(10, 10) matrix: row d holds the score each digit gets from an input digit d"""
+    weights = np.zeros((10, 10), dtype=np.int64)
+    for d in range(10):
+        for transform, weight in transforms(d):
+            weights[d, transform % 10] += weight
+    return weights
+
+
+def _distance_weights(max_diff, weight):
+    """(10, 10) matrix: weight where 2 <= |input digit - digit| <= max_diff"""
+    diff = np.abs(np.arange(10)[:, None] - np.arange(10)[None, :])
+    return np.where((diff >= 2) & (diff <= max_diff), weight, 0).astype(np.int64)
+
+
+_V1_TRANSFORMS = _transform_weights(lambda d: [(d + 1, 18000), (d - 1, 18000), (d + 2, 12000),
+                                               (d - 2, 12000), (9 - d, 15000)])
+_V3_TRANSFORMS = _transform_weights(lambda d: [(d + 1, 22000), (d - 1, 22000), (d + 2, 16000),
+                                               (d - 2, 16000), (9 - d, 19000), (d + 3, 12000),
+                                               (d - 3, 12000)])
+_V1_DISTANCE = _distance_weights(4, 5000)
+_V3_DISTANCE = _distance_weights(5, 6000)
+
+class BBFS4D6DigitSystem(BBFSEngineCore):
+    DIGIT_WIDTH = 4
+    BBFS_SIZE = 6
+    
+    # Max losses allowed per pattern version for meets_criteria
+    PATTERN_MAX_LOSSES = {'V1': 20, 'V2': 5, 'V3': 19}
+    
+    # Backtests are always rerun over the whole history: a prediction for an old draw
+    # changes when draws are added (V1/V3 score against the whole data set, V2 reads
+    # the day patterns and shuffles), so earlier results cannot be extended.
+    
+    # Day filters offered by the UI and rows in the first page of a view model
+    VIEW_DAYS_FILTERS = (7, 30, 180, 365, 'all')
+    VIEW_PAGE_SIZE = 50
+    
+    def __init__(self, data_url=None, draw_schedule=None):
+        super().__init__(data_url, draw_schedule)
+        
+        # Lifecycle: 'new' -> load() -> 'loaded' -> warm() -> 'warm' ('failed' if nothing could be loaded)
+        self.load_state = 'new'
         
         # Pattern versions
         self.pattern_versions = {
@@ -23,214 +72,99 @@ class BBFS4D6DigitSystem:
             'V3': 'Complete Historical Analysis - Max 19 Loss Beruntun'
         }
         
-    def fetch_complete_data(self):
-        """Fetch complete data from 2020-2025"""
-        try:
-            print("Mengambil data lengkap dari 2020-2025...")
-            max_retries = 3
-            content = ""
-            for attempt in range(max_retries):
-                try:
-                    response = requests.get(
-                        self.url, 
-                        timeout=30,
-                        headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-                    )
-                    response.raise_for_status()
-                    content = response.text
-                    break
-                except requests.RequestException as e:
-                    if attempt == max_retries - 1:
-                        raise e
-                    print(f"Attempt {attempt + 1} failed, retrying...")
-                    time.sleep(2)
-            
-            # Enhanced patterns untuk HK market - parsing lebih komprehensif
-            patterns = [
-                # Pattern untuk resulthktercepat.org - format baru dengan tabel sederhana
-                r'<td class="text-center">([^<]+)</td>\s*<td class="text-center">(\d{2}-\d{2}-\d{4})</td>\s*<td class="text-center">(\d{4})</td>',
-                # Pattern standar HK: title="Friday=2025-06-20=1234"
-                r'<td title="([^"]*=\d{4}-\d{2}-\d{2}=[^"]*)">(\d{4})</td>',
-                # Pattern alternatif untuk format berbeda
-                r'<td title="([^"]*=\d{4}-\d{2}-\d{2})=[^"]*">(\d{4})</td>',
-                # Pattern untuk data yang mungkin tidak memiliki kode di akhir
-                r'<td title="([^"]*\d{4}-\d{2}-\d{2}[^"]*)">(\d{4})</td>',
-                # Pattern umum untuk fallback
-                r'<td title="([^"]+)">(\d{4})</td>',
-                # Pattern untuk menangkap data dengan format HTML berbeda
-                r'<td[^>]*title="([^"]*\d{4}-\d{2}-\d{2}[^"]*)">.*?(\d{4}).*?</td>',
-                # Pattern khusus untuk menangkap data yang mungkin terlewat
-                r'title="([^"]*(?:Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday)[^"]*\d{4}-\d{2}-\d{2}[^"]*)"[^>]*>(\d{4})',
-                # Pattern untuk data dengan struktur berbeda
-                r'(\w+=[0-9]{4}-[0-9]{2}-[0-9]{2}(?:=[0-9]+)?)[^>]*>(\d{4})</td>'
-            ]
-            
-            data = []
-            for pattern in patterns:
-                matches = re.findall(pattern, content)
-                
-                for match in matches:
-                    # Handle new format vs old format
-                    if len(match) == 3:  # New format: day, date, result
-                        day_name = match[0]
-                        date_str = match[1]
-                        result = match[2]
-                        
-                        try:
-                            # Convert DD-MM-YYYY to YYYY-MM-DD
-                            date_parts = date_str.split('-')
-                            if len(date_parts) == 3:
-                                formatted_date = f"{date_parts[2]}-{date_parts[1]}-{date_parts[0]}"
-                                # Fix malformed dates before parsing
-                                corrected_date = self.fix_malformed_date(formatted_date)
-                                date_obj = datetime.strptime(corrected_date, '%Y-%m-%d')
-                                if 2020 <= date_obj.year <= 2025:
-                                    data.append({
-                                        'date': date_obj,
-                                        'day': self.standardize_day(day_name),
-                                        'result': result,
-                                        'last_4d': result,  # Full 4D result
-                                        'all_digits': list(result)
-                                    })
-                        except ValueError:
-                            continue
-                    else:  # Old format with title info
-                        title_info = match[0]
-                        result = match[1]
-                        
-                        if '=' in title_info:
-                            parts = title_info.split('=')
-                            if len(parts) >= 3:
-                                day_name = parts[0]
-                                date_str = parts[1]
-                            elif len(parts) >= 2:
-                                day_name = parts[0]
-                                date_str = parts[1]
-                            else:
-                                continue
-                                
-                            try:
-                                # Fix malformed dates before parsing
-                                corrected_date_str = self.fix_malformed_date(date_str)
-                                date_obj = datetime.strptime(corrected_date_str, '%Y-%m-%d')
-                                if 2020 <= date_obj.year <= 2025:
-                                    data.append({
-                                        'date': date_obj,
-                                        'day': self.standardize_day(day_name),
-                                        'result': result,
-                                        'last_4d': result,  # Full 4D result
-                                        'all_digits': list(result)
-                                    })
-                            except ValueError:
-                                continue
-                
-                if data:
-                    break
-            
-            if not data:
-                print("Error: Tidak ada data ditemukan")
-                return False
-            
-            # Remove duplicates based on date and result
-            seen = set()
-            unique_data = []
-            for item in data:
-                key = (item['date'], item['result'])
-                if key not in seen:
-                    seen.add(key)
-                    unique_data.append(item)
-            
-            unique_data.sort(key=lambda x: x['date'])
-            self.data = unique_data
-            self.last_updated = datetime.now()
-            
-            duplicates_removed = len(data) - len(unique_data)
-            if duplicates_removed > 0:
-                print(f"✓ Removed {duplicates_removed} duplicate entries")
-            
-            # Tampilkan info data terbaru yang ditemukan
-            if unique_data:
-                latest_data = unique_data[-1]
-                print(f"✓ Data berhasil dimuat: {len(self.data)} records dari {unique_data[0]['date'].year}-{unique_data[-1]['date'].year}")
-                print(f"✓ Data terbaru: {latest_data['date'].strftime('%Y-%m-%d')} ({latest_data['day']}) -> {latest_data['result']}")
-            
-            return len(self.data) >= 100
-            
-        except Exception as e:
-            print(f"Error loading data: {e}")
-            return False
+    def _on_data_loaded(self):
+        self.load_state = 'loaded'  # Backtests must be (re)run for the new data
     
-    def fix_malformed_date(self, date_str):
-        """Fix common date formatting issues in data source - Enhanced adaptive correction"""
-        try:
-            parts = date_str.split('-')
-            if len(parts) != 3:
-                return date_str
-                
-            year, month, day = parts
-            year_int = int(year)
-            month_int = int(month)
-            day_int = int(day)
-            
-            # Case 1: Month > 12 and Day <= 12 (month/day swapped)
-            if month_int > 12 and day_int <= 12:
-                return f"{year}-{day.zfill(2)}-{month.zfill(2)}"
-            
-            # Case 2: Month > 12 and Day > 12 (both invalid - likely date error like 2025-28-14)
-            elif month_int > 12 and day_int > 12:
-                # Check if it's a common pattern like 28-14 which should be 6-28
-                if month_int >= 20:  # Likely a day value in month position
-                    # Extract the actual day from the "month" field
-                    actual_day = str(month_int)[-2:]  # Last 2 digits
-                    # Use current month as a reasonable default
-                    current_month = datetime.now().month
-                    return f"{year}-{str(current_month).zfill(2)}-{actual_day}"
-                else:
-                    # Other cases - swap positions
-                    return f"{year}-{day.zfill(2)}-{month.zfill(2)}"
-            
-            # Case 3: Day > 31 (invalid day)
-            elif day_int > 31:
-                # Likely day/month swapped
-                if month_int <= 12:
-                    return f"{year}-{month.zfill(2)}-{str(day_int)[-2:].zfill(2)}"
-                
-            # Case 4: Month = 0 (invalid month)
-            elif month_int == 0:
-                return f"{year}-01-{day.zfill(2)}"
-                
-            # Case 5: Normal validation - check if date is actually valid
-            else:
-                try:
-                    datetime.strptime(date_str, '%Y-%m-%d')
-                    return date_str  # Date is valid
-                except ValueError:
-                    # Date is invalid despite looking correct - use current month
-                    current_month = datetime.now().month
-                    return f"{year}-{str(current_month).zfill(2)}-{day.zfill(2)}"
-                
-        except (ValueError, IndexError):
-            # If all else fails, use current date components
-            current_date = datetime.now()
-            return f"{current_date.year}-{str(current_date.month).zfill(2)}-{str(current_date.day).zfill(2)}"
+    def copy(self):
+        """Copy-on-write snapshot: a new system sharing the current rows and results.
 
-    def standardize_day(self, day_name):
-        """Standardize day names"""
-        day_mapping = {
-            'senin': 'senin', 'selasa': 'selasa', 'rabu': 'rabu',
-            'kamis': 'kamis', 'jumat': 'jumat', 'sabtu': 'sabtu', 'minggu': 'minggu',
-            'monday': 'senin', 'tuesday': 'selasa', 'wednesday': 'rabu',
-            'thursday': 'kamis', 'friday': 'jumat', 'saturday': 'sabtu', 'sunday': 'minggu'
-        }
-        return day_mapping.get(day_name.lower(), 'senin')
+        The containers are new, so reloading or re-testing the copy never changes
+        what readers of this instance see. Stored entries are treated as read-only.
+        """
+        snapshot = copy.copy(self)
+        snapshot.data = list(self.data)
+        snapshot.performance_cache = dict(self.performance_cache)
+        snapshot.loss_analysis = dict(self.loss_analysis)
+        snapshot.optimization_cache = dict(self.optimization_cache)
+        snapshot._memo = {}
+        snapshot._flight = SingleFlight()
+        return snapshot
+
+    def clear_caches(self):
+        """Drop loaded data and all derived results (used before a full reload)"""
+        self.data = []
+        self.performance_cache = {}
+        self.loss_analysis = {}
+        self.optimization_cache = {}
+        self.last_updated = None
+        self.load_state = 'new'
+        self._bump_data_version()
+    
+    @property
+    def is_loaded(self):
+        return self.load_state in ('loaded', 'warm')
+    
+    @property
+    def is_warm(self):
+        return self.load_state == 'warm'
+    
+    def _on_load_failed(self):
+        """A failed fetch only matters when there is no previously loaded data"""
+        if not self.data:
+            self.load_state = 'failed'
+    
+    def load(self, force=False):
+        """Fetch the history once; later calls are no-ops unless force=True"""
+        if self.is_loaded and not force:
+            return True
+        return self._flight.do(('load', self.data_version, force), lambda: self._load(force))
+    
+    def _load(self, force):
+        if self.is_loaded and not force:
+            return True
+        self.fetch_complete_data()
+        return self.is_loaded
+    
+    def warm(self):
+        """Load (if needed) and run the backtests once; later calls are no-ops"""
+        if self.is_warm:
+            return True
+        return self._flight.do(('warm', self.data_version), self._warm)
+    
+    def _warm(self):
+        if self.is_warm:
+            return True
+        if not self.load():
+            return False
+        self.build_optimization_patterns()
+        self.run_all_pattern_tests()
+        return self.is_warm
+    
+    def refresh(self):
+        """Re-fetch and rerun the backtests when draws were added.
+        
+        Returns True when the fetch succeeded; if it brought no new draw the current
+        backtests are kept. On a failed fetch the current data and results are kept.
+        """
+        return self._flight.do(('refresh', self.data_version), self._refresh)
+    
+    def _refresh(self):
+        previous = self.draws_fingerprint() if self.is_warm else None
+        if not self.load(force=True) or self.load_state != 'loaded':
+            return False
+        if previous is not None and self.draws_fingerprint() == previous:
+            # No new draw: the backtests of the previous fetch still apply
+            self.load_state = 'warm'
+            return True
+        self.build_optimization_patterns()
+        self.run_all_pattern_tests()
+        return True
     
     def build_optimization_patterns(self):
         """Build patterns untuk optimasi BBFS 4D 6 digit"""
         print("Membangun pola optimasi BBFS 4D 6 digit...")
         
-        day_patterns = defaultdict(lambda: defaultdict(list))
-        input_patterns = defaultdict(list)
-        global_freq = Counter()
+        day_patterns, input_patterns, global_freq = self._build_transition_indexes()
         transition_matrix = defaultdict(lambda: defaultdict(int))
         
         # V3 REVOLUTIONARY LOSS-PREVENTION ANALYSIS
@@ -248,14 +182,6 @@ class BBFS4D6DigitSystem:
             input_4d = current['last_4d']
             next_4d = next_item['last_4d']
             
-            # Standard patterns (V1, V2)
-            day_patterns[day][input_4d].append(next_4d)
-            input_patterns[input_4d].append(next_4d)
-            
-            # Global frequency
-            for digit in next_4d:
-                global_freq[digit] += 1
-            
             # Transition matrix for each digit position
             for pos in range(4):
                 current_digit = input_4d[pos]
@@ -729,57 +655,38 @@ class BBFS4D6DigitSystem:
             self.build_optimization_patterns()
         
         results = []
-        consecutive_losses = 0
-        max_consecutive = 0
-        total_wins = 0
-        total_tests = 0
-        loss_streaks = []
-        
-        # CORRECTED: Ensure we test with complete data from 2020-2025
+        date_ordinals = []  # Aligned with results, ascending - used for day-window slicing
         valid_data_count = 0
-        for i in range(len(self.data) - 1):
-            current = self.data[i]
-            next_item = self.data[i + 1]
-            
-            # Skip invalid data entries
-            if not current.get('last_4d') or not next_item.get('last_4d'):
-                continue
-            if len(current['last_4d']) != 4 or len(next_item['last_4d']) != 4:
-                continue
-            
+        streaks = StreakCounter()
+        
+        # CORRECTED: Ensure we test with complete data from 2020-2025 (invalid entries skipped)
+        for i, current, next_item in self._draw_pairs():
             valid_data_count += 1
             bbfs_6digit = pattern_func(current['last_4d'], current['day'])
             
-            if len(bbfs_6digit) != 6:
+            if len(bbfs_6digit) != self.BBFS_SIZE:
                 continue
             
             # Check win condition with new 4D rules
             is_win = self.check_win_condition_4d(bbfs_6digit, next_item['last_4d'])
-            
-            total_tests += 1
-            
-            if is_win:
-                total_wins += 1
-                # CORRECTED: Only record loss streak when it ends (not during ongoing streak)
-                if consecutive_losses > 0:
-                    loss_streaks.append(consecutive_losses)
-                    consecutive_losses = 0
-            else:
-                consecutive_losses += 1
-                max_consecutive = max(max_consecutive, consecutive_losses)
+            streaks.add(is_win)
             
             results.append({
                 'date': current['date'],
+                'day': current['day'],
                 'input_4d': current['last_4d'],
                 'actual_4d': next_item['last_4d'],
                 'bbfs_6digit': ''.join(bbfs_6digit),
                 'is_win': is_win,
-                'consecutive_losses': consecutive_losses
+                'consecutive_losses': streaks.consecutive_losses
             })
+            date_ordinals.append(current['date'].toordinal())
         
         # CORRECTED: Final loss streak handling - only add if there's an active streak at end
-        if consecutive_losses > 0:
-            loss_streaks.append(consecutive_losses)
+        loss_streaks = streaks.all_loss_streaks()
+        total_wins = streaks.total_wins
+        total_tests = streaks.total_tests
+        max_consecutive = streaks.max_consecutive
         
         # CORRECTED: Calculate accurate win rate from complete data
         win_rate = (total_wins / total_tests * 100) if total_tests > 0 else 0
@@ -800,6 +707,7 @@ class BBFS4D6DigitSystem:
             'max_consecutive_loss': max_consecutive,
             'loss_streaks': loss_streaks,
             'results': results,  # Store ALL results from complete data
+            'date_ordinals': date_ordinals,
             'meets_criteria': max_consecutive <= max_allowed_losses,
             'data_completeness': {
                 'valid_entries': valid_data_count,
@@ -810,32 +718,37 @@ class BBFS4D6DigitSystem:
         
         return performance
     
-    def run_all_pattern_tests(self):
-        """Run tests for all pattern versions"""
-        print("Testing all pattern versions...")
-        
-        pattern_functions = {
+    def _pattern_functions(self):
+        """Map pattern version to its BBFS generator"""
+        return {
             'V1': self.generate_bbfs_v1_conservative,
             'V2': self.generate_bbfs_v2_balanced,
             'V3': self.generate_bbfs_v3_aggressive
         }
+    
+    def run_all_pattern_tests(self):
+        """Run tests for all pattern versions"""
+        print("Testing all pattern versions...")
         
         results = {}
-        for version, func in pattern_functions.items():
-            # Set max losses per version: V1=20, V2=5, V3=19
-            if version == 'V1':
-                max_losses = 20
-            elif version == 'V3':
-                max_losses = 19
-            else:
-                max_losses = 5
-            results[version] = self.test_pattern_performance(func, f"{version} - {self.pattern_versions[version]}", max_losses)
+        for version, func in self._pattern_functions().items():
+            results[version] = self.test_pattern_performance(
+                func,
+                f"{version} - {self.pattern_versions[version]}",
+                self.PATTERN_MAX_LOSSES[version]
+            )
         
         self.performance_cache = results
+        if self.data:
+            self.load_state = 'warm'
+        self._bump_data_version()
         return results
     
     def get_best_pattern(self):
-        """Get the best performing pattern"""
+        """Get the best performing pattern (memoized per data version)"""
+        return self._memoized(('best_pattern',), self._compute_best_pattern)
+    
+    def _compute_best_pattern(self):
         if not self.performance_cache:
             self.run_all_pattern_tests()
         
@@ -860,19 +773,167 @@ class BBFS4D6DigitSystem:
             best_pattern, _ = self.get_best_pattern()
             pattern_version = best_pattern if best_pattern else 'V1'
         
-        pattern_functions = {
-            'V1': self.generate_bbfs_v1_conservative,
-            'V2': self.generate_bbfs_v2_balanced,
-            'V3': self.generate_bbfs_v3_aggressive
-        }
+        pattern_functions = self._pattern_functions()
         
         if pattern_version in pattern_functions:
             return pattern_functions[pattern_version](input_4d, day)
         else:
             return self.generate_bbfs_v1_conservative(input_4d, day)
     
+    def generate_predictions_bulk(self, items):
+        """Generate predictions for many (input_4d, day, pattern_version) items at once.
+        
+        V1 and V3 are scored for all items in one numpy pass over precomputed
+        history tables and give the same digits as generate_prediction. Other
+        versions (V2 is randomised) and inputs that are not 4 digits fall back
+        to generate_prediction. An item may also be a bare input_4d or a shorter
+        tuple: a missing day is the day of the latest draw, a missing version is
+        'auto'. Returns the BBFS lists in input order.
+        """
+        default_day = self.data[-1]['day'] if self.data else None
+        items = [self._bulk_item(item, default_day) for item in items]
+        if not self.optimization_cache:
+            self.build_optimization_patterns()
+        
+        auto_pattern = None
+        if any(version == 'auto' for _, _, version in items):
+            best_pattern, _ = self.get_best_pattern()
+            auto_pattern = best_pattern if best_pattern else 'V1'
+        
+        predictions = [None] * len(items)
+        vectorized = {'V1': [], 'V3': []}
+        for i, (input_4d, day, version) in enumerate(items):
+            version = auto_pattern if version == 'auto' else version
+            input_4d = str(input_4d)
+            if version in vectorized and len(input_4d) == 4 and input_4d.isdigit():
+                vectorized[version].append(i)
+            else:
+                predictions[i] = self.generate_prediction(input_4d, day, version)
+        
+        for version, indices in vectorized.items():
+            if not indices:
+                continue
+            inputs = np.array([[int(digit) for digit in str(items[i][0])] for i in indices], dtype=np.int64)
+            for i, bbfs in zip(indices, self._score_bulk(inputs, version)):
+                predictions[i] = bbfs
+        return predictions
+    
+    def _bulk_item(self, item, default_day):
+        """(input_4d, day, pattern_version) of one bulk item; ValueError on a bad shape or version"""
+        if isinstance(item, (str, int)):
+            item = (item,)
+        elif not isinstance(item, (list, tuple)) or not 1 <= len(item) <= 3:
+            raise ValueError(f"Item bulk harus input_4d atau (input_4d, hari, pola): {item!r}")
+        input_4d, day, version = tuple(item) + (None,) * (3 - len(item))
+        version = version or 'auto'
+        if version != 'auto' and version not in self.pattern_versions:
+            raise ValueError(f"Pola tidak dikenal: {version}")
+        return input_4d, day or default_day, version
+    
+    def _prediction_tables(self):
+        """History tables used by the V1/V3 scoring, built once per data version"""
+        return self._memoized(('prediction_tables',), self._build_prediction_tables)
+    
+    def _build_prediction_tables(self):
+        # Digit counts of the draws that followed each 4D, split by win (4 distinct digits) / loss
+        win_counts = np.zeros((10000, 10), dtype=np.int64)
+        loss_counts = np.zeros((10000, 10), dtype=np.int64)
+        high_risk_v1 = np.zeros(10000, dtype=bool)
+        high_risk_v3 = np.zeros(10000, dtype=bool)
+        current_streak = 0
+        for i in range(len(self.data) - 1):
+            current = self.data[i]['last_4d']
+            next_item = self.data[i + 1]['last_4d']
+            is_win = len(set(next_item)) == 4
+            current_streak = current_streak + 1 if len(set(next_item)) < 4 else 0
+            if not (len(current) == 4 and current.isdigit()):
+                continue
+            index = int(current)
+            counts = win_counts if is_win else loss_counts
+            for digit in next_item:
+                if digit.isdigit():
+                    counts[index, int(digit)] += 1
+            if current_streak >= 10:
+                high_risk_v1[index] = True
+            if current_streak >= 8:
+                high_risk_v3[index] = True
+        
+        def recent_counts(window):
+            counts = np.zeros(10, dtype=np.int64)
+            recent_data = self.data[-window:] if len(self.data) >= window else self.data
+            for data in recent_data:
+                for digit in data['last_4d']:
+                    if digit.isdigit():
+                        counts[int(digit)] += 1
+            return counts
+        
+        # Most frequent next digit per (position, digit), -1 when unknown
+        position_top = np.full((4, 10), -1, dtype=np.int64)
+        transition_matrix = self.optimization_cache.get('transition_matrix', {})
+        for pos in range(4):
+            for digit in range(10):
+                key = f"pos_{pos}_{digit}"
+                if key in transition_matrix and transition_matrix[key]:
+                    most_common = sorted(transition_matrix[key].items(), key=lambda x: x[1], reverse=True)
+                    if most_common[0][0].isdigit():
+                        position_top[pos, digit] = int(most_common[0][0])
+        
+        return {
+            'win_counts': win_counts,
+            'loss_counts': loss_counts,
+            'high_risk': {'V1': high_risk_v1, 'V3': high_risk_v3},
+            'recent': {'V1': recent_counts(50), 'V3': recent_counts(30)},
+            'position_top': position_top
+        }
+    
+    def _score_bulk(self, inputs, version):
+        """Vectorized generate_bbfs_v1_conservative / generate_bbfs_v3_aggressive for (n, 4) digit rows.
+        
+        Every score term is a whole number, so int64 sums equal the float sums
+        of the scalar code and the ranking (including ties) is identical.
+        """
+        tables = self._prediction_tables()
+        rows = np.arange(len(inputs))
+        index = inputs @ np.array([1000, 100, 10, 1])
+        input_counts = np.zeros((len(inputs), 10), dtype=np.int64)
+        for pos in range(4):
+            np.add.at(input_counts, (rows, inputs[:, pos]), 1)
+        present = input_counts > 0
+        absent = ~present
+        
+        if version == 'V1':
+            base, win_weight, risk_weight, loss_weight = 90000, 40000, 48000, 4000
+            transforms, distance = _V1_TRANSFORMS, _V1_DISTANCE
+            critical, coverage, recent_weight = _V1_CRITICAL_BONUS, _V1_COVERAGE_BONUS, 1000
+        else:
+            base, win_weight, risk_weight, loss_weight = 95000, 50000, 63000, 1800
+            transforms, distance = _V3_TRANSFORMS, _V3_DISTANCE
+            critical, coverage, recent_weight = _V3_CRITICAL_BONUS, _V3_COVERAGE_BONUS, 1500
+        
+        win_factor = np.where(tables['high_risk'][version][index], risk_weight, win_weight)
+        scores = input_counts * base
+        scores += tables['win_counts'][index] * win_factor[:, None]
+        scores -= tables['loss_counts'][index] * loss_weight
+        scores += input_counts @ transforms
+        scores += absent * (critical + present.astype(np.int64) @ distance + coverage
+                            + tables['recent'][version] * recent_weight)
+        
+        if version == 'V3':
+            for pos in range(4):
+                top = tables['position_top'][pos, inputs[:, pos]]
+                known = top >= 0
+                np.add.at(scores, (rows[known], top[known]), 15000)
+        
+        # Stable descending sort over the candidate order, as in the scalar code
+        order = np.array(_CANDIDATE_ORDER)
+        ranked = np.argsort(-scores[:, order], axis=1, kind='stable')[:, :6]
+        return [[str(digit) for digit in row] for row in order[ranked]]
+    
     def get_pattern_summary(self):
-        """Get summary of all pattern performances"""
+        """Get summary of all pattern performances (memoized per data version)"""
+        return self._memoized(('pattern_summary',), self._compute_pattern_summary)
+    
+    def _compute_pattern_summary(self):
         if not self.performance_cache:
             self.run_all_pattern_tests()
         
@@ -895,6 +956,50 @@ class BBFS4D6DigitSystem:
         
         return self.data[-limit:][::-1]  # Reverse to show newest first
     
+    def _build_streak_detail(self, date, input_4d, actual_4d, bbfs_6digit, loss_number, entry_index):
+        """Build one loss streak detail row (date is the input draw date)"""
+        return {
+            'date': date,
+            'input_result': input_4d,
+            'actual_result': actual_4d,
+            'input_4d': input_4d,
+            'actual_4d': actual_4d,
+            'bbfs_used': ''.join(bbfs_6digit),
+            'loss_number': loss_number,
+            'display_format': f"{date.strftime('%d/%m')} | {input_4d}→{actual_4d}",
+            'entry_index': entry_index
+        }
+
+    def _scan_current_loss_streak(self, pattern_func):
+        """Regenerate predictions backwards from the newest draw until the first win"""
+        current_streak = 0
+        streak_details = []
+        entry_index = 0
+
+        for i in range(len(self.data) - 1, 0, -1):
+            current_day = self.data[i]
+            previous_day = self.data[i - 1]
+
+            # Skip invalid entries
+            if not self._is_valid_draw(current_day) or not self._is_valid_draw(previous_day):
+                continue
+
+            entry_index += 1
+            input_4d = previous_day['last_4d']
+            actual_4d = current_day['last_4d']
+            bbfs_6digit = pattern_func(input_4d, previous_day['day'])
+
+            if self.check_win_condition_4d(bbfs_6digit, actual_4d):
+                break
+
+            current_streak += 1
+            streak_details.append(self._build_streak_detail(
+                previous_day['date'], input_4d, actual_4d, bbfs_6digit, current_streak, entry_index
+            ))
+
+        valid_entries = sum(1 for _ in self._draw_pairs())
+        return current_streak, streak_details, valid_entries
+
     def get_current_loss_streak_analysis(self, limit=10, pattern_version=None):
         """Get current loss streak analysis for specific pattern - ACCURATE FROM COMPLETE DATA"""
         if not self.data or len(self.data) < 2:
@@ -905,67 +1010,37 @@ class BBFS4D6DigitSystem:
                 'total_losses': 0
             }
         
-        # Use specified pattern or best pattern for BBFS generation
-        if pattern_version and pattern_version in self.performance_cache:
+        # Use specified pattern, otherwise the same best pattern the cache reports
+        pattern_functions = self._pattern_functions()
+        if pattern_version in pattern_functions:
             pattern_name = pattern_version
+        elif self.performance_cache:
+            pattern_name, _ = self.get_best_pattern()
         else:
-            pattern_name = 'V2'  # Default to V2
-            
-        # Get pattern function
-        pattern_functions = {
-            'V1': self.generate_bbfs_v1_conservative,
-            'V2': self.generate_bbfs_v2_balanced, 
-            'V3': self.generate_bbfs_v3_aggressive
-        }
-        pattern_func = pattern_functions.get(pattern_name, self.generate_bbfs_v2_balanced)
-        
-        # CORRECTED: Build accurate current streak from complete data
-        current_streak = 0
-        streak_details = []
-        
-        # Start from the most recent data and go backwards
-        # VALIDATION: Ensure we use valid data entries only
-        valid_entries = []
-        for i in range(len(self.data) - 1, 0, -1):
-            current_day = self.data[i]
-            previous_day = self.data[i-1]
-            
-            # Skip invalid entries
-            if not current_day.get('last_4d') or not previous_day.get('last_4d'):
-                continue
-            if len(current_day['last_4d']) != 4 or len(previous_day['last_4d']) != 4:
-                continue
-                
-            valid_entries.append((i, current_day, previous_day))
-        
-        # Process valid entries for current streak
-        for entry_index, (i, current_day, previous_day) in enumerate(valid_entries):
-            # Generate BBFS using previous day's result
-            input_4d = previous_day['last_4d']
-            actual_4d = current_day['last_4d']
-            bbfs_6digit = pattern_func(input_4d, previous_day['day'])
-            
-            # Check if BBFS covers the actual result
-            is_win = self.check_win_condition_4d(bbfs_6digit, actual_4d)
-            
-            if not is_win:  # This is a loss
+            pattern_name = 'V1'  # Same fallback as generate_prediction
+
+        performance = self.performance_cache.get(pattern_name)
+        if performance and performance.get('results'):
+            # Answer from the stored backtest: walk back from the newest row until a win
+            current_streak = 0
+            streak_details = []
+            results = performance['results']
+            for entry_index in range(len(results)):
+                result = results[-1 - entry_index]
+                if result['is_win']:
+                    break
                 current_streak += 1
-                # Format display as: previous_date | input_result → actual_result
-                streak_details.append({
-                    'date': previous_day['date'],  # Use previous day date for reference
-                    'input_result': input_4d,
-                    'actual_result': actual_4d,
-                    'input_4d': input_4d,
-                    'actual_4d': actual_4d,
-                    'bbfs_used': ''.join(bbfs_6digit),
-                    'loss_number': current_streak,
-                    'display_format': f"{previous_day['date'].strftime('%d/%m')} | {input_4d}→{actual_4d}",
-                    'entry_index': entry_index + 1
-                })
-            else:
-                # Found a win, stop counting current streak
-                break
-        
+                streak_details.append(self._build_streak_detail(
+                    result['date'], result['input_4d'], result['actual_4d'],
+                    result['bbfs_6digit'], current_streak, entry_index + 1
+                ))
+            valid_entries_processed = performance.get('data_completeness', {}).get('valid_entries', len(results))
+        else:
+            # Fallback when no backtest exists for this pattern yet
+            current_streak, streak_details, valid_entries_processed = self._scan_current_loss_streak(
+                pattern_functions[pattern_name]
+            )
+
         # Reverse streak_details to show newest first in display
         streak_details.reverse()
         
@@ -999,13 +1074,20 @@ class BBFS4D6DigitSystem:
             'total_losses': total_losses,
             'data_validation': {
                 'total_data_entries': len(self.data),
-                'valid_entries_processed': len(valid_entries),
-                'data_quality_percentage': (len(valid_entries) / len(self.data) * 100) if len(self.data) > 0 else 0
+                'valid_entries_processed': valid_entries_processed,
+                'data_quality_percentage': (valid_entries_processed / len(self.data) * 100) if len(self.data) > 0 else 0
             }
         }
     
     def get_consecutive_loss_breakdown(self, pattern_version=None):
-        """Get breakdown of consecutive losses for specific pattern - ACCURATE HISTORICAL DISTRIBUTION"""
+        """Get breakdown of consecutive losses for specific pattern (memoized per data version)"""
+        return self._memoized(
+            ('loss_breakdown', pattern_version),
+            lambda: self._compute_consecutive_loss_breakdown(pattern_version)
+        )
+    
+    def _compute_consecutive_loss_breakdown(self, pattern_version=None):
+        """Breakdown of consecutive losses - ACCURATE HISTORICAL DISTRIBUTION"""
         if not self.performance_cache:
             return {}
         
@@ -1018,75 +1100,92 @@ class BBFS4D6DigitSystem:
         if not pattern_performance or not pattern_performance.get('loss_streaks'):
             return {}
         
-        loss_streaks = pattern_performance['loss_streaks']
-        if not loss_streaks:
+        breakdown = self._loss_streak_breakdown(pattern_performance['loss_streaks'])
+        if not breakdown:
             return {}
         
-        # CORRECTED: Count streak occurrences with validation
-        streak_counts = Counter(loss_streaks)
-        total_streaks = len(loss_streaks)
-        max_streak = max(loss_streaks)
-        avg_streak = sum(loss_streaks) / len(loss_streaks)
-        
-        # VALIDATION: Ensure we have complete historical data
-        total_tests = pattern_performance.get('total_tests', 0)
-        total_losses = pattern_performance.get('losses', 0)
-        
-        breakdown = {}
-        
-        # Sort streaks by length for consistent display
-        sorted_streaks = sorted(streak_counts.items())
-        
-        for streak_length, count in sorted_streaks:
-            percentage = (count / total_streaks) * 100
-            
-            # CORRECTED: More accurate status classification
-            if streak_length <= 2:
-                status = "Normal"
-            elif streak_length <= 5:
-                status = "Perhatian"
-            elif streak_length <= 10:
-                status = "Tinggi"
-            elif streak_length <= 15:
-                status = "Kritis"
-            else:
-                status = "Berbahaya"
-            
-            breakdown[f"{streak_length}x"] = {
-                'streak_length': streak_length,
-                'count': count,
-                'percentage': percentage,
-                'status': status
-            }
-        
         # ENHANCED: Add comprehensive summary with data validation
-        breakdown['_summary'] = {
-            'total_streaks': total_streaks,
-            'max_streak': max_streak,
-            'avg_streak': avg_streak,
-            'total_tests': total_tests,
-            'total_losses': total_losses,
+        breakdown['_summary'].update({
+            'total_tests': pattern_performance.get('total_tests', 0),
+            'total_losses': pattern_performance.get('losses', 0),
             'data_completeness': pattern_performance.get('data_completeness', {}),
             'pattern_name': pattern_performance.get('pattern_name', 'Unknown'),
             'win_rate': pattern_performance.get('win_rate', 0)
-        }
+        })
         
         return breakdown
     
-    def get_real_time_analysis(self, limit: Union[int, str] = 8, pattern_version=None):
-        """Get real-time analysis for latest results using specific pattern with optimized filtering"""
-        if not self.data or len(self.data) < 2:
-            return []
-        
+    def _resolve_pattern_performance(self, pattern_version=None):
+        """Performance entry for the specified pattern, or the best pattern"""
         if not self.performance_cache:
             self.run_all_pattern_tests()
         
-        # Use specified pattern or best pattern
         if pattern_version and pattern_version in self.performance_cache:
-            pattern_performance = self.performance_cache[pattern_version]
-        else:
-            best_pattern, pattern_performance = self.get_best_pattern()
+            return self.performance_cache[pattern_version]
+        best_pattern, pattern_performance = self.get_best_pattern()
+        return pattern_performance
+    
+    def _get_date_ordinals(self, performance):
+        """Date ordinals aligned with performance['results'] (built on demand for older caches)"""
+        date_ordinals = performance.get('date_ordinals')
+        if date_ordinals is None or len(date_ordinals) != len(performance['results']):
+            date_ordinals = [result['date'].toordinal() for result in performance['results']]
+            performance['date_ordinals'] = date_ordinals
+        return date_ordinals
+    
+    def _filtered_start_index(self, performance, days_filter):
+        """Index of the first result inside the day window - the window is results[start:]"""
+        total = len(performance['results'])
+        if days_filter == "all":
+            return 0
+        
+        # Calculate cutoff date based on calendar days, not data availability
+        # (self.data is kept sorted by date, so the latest draw is the last entry)
+        latest_ordinal = self.data[-1]['date'].toordinal()
+        cutoff_ordinal = latest_ordinal - (days_filter - 1)  # Include current day
+        start = bisect_left(self._get_date_ordinals(performance), cutoff_ordinal)
+        
+        # If we don't have enough entries due to missing dates, extend the range
+        # to the requested number of most recent entries
+        if total - start < min(days_filter, total):
+            start = max(0, total - days_filter)
+        return start
+    
+    def _analysis_row(self, result):
+        """Convert a stored backtest result into an analysis row for the views"""
+        if result.get('is_current_prediction'):
+            return {
+                'date': result['date'],
+                'input_result': result['input_4d'],
+                'actual_result': 'PREDIKSI',  # Mark as prediction
+                'input_4d': result['input_4d'],
+                'actual_4d': 'TBD',  # To be determined
+                'bbfs_6digit': result['bbfs_6digit'],
+                'bbfs_string': result['bbfs_6digit'],
+                'is_win': None,  # Unknown for prediction
+                'day': result.get('day', 'Unknown'),
+                'missing_digits': [],
+                'is_current_prediction': True
+            }
+        return {
+            'date': result['date'],
+            'input_result': result['input_4d'],
+            'actual_result': result['actual_4d'],
+            'input_4d': result['input_4d'],
+            'actual_4d': result['actual_4d'],
+            'bbfs_6digit': result['bbfs_6digit'],
+            'bbfs_string': result['bbfs_6digit'],
+            'is_win': result['is_win'],
+            'day': result.get('day', 'Unknown'),
+            'missing_digits': []  # For 4D system, this is not as relevant
+        }
+    
+    def get_real_time_analysis(self, limit: Union[int, str] = 8, pattern_version=None):
+        """Get real-time analysis for latest results using specific pattern with optimized filtering"""
+        if not self.data or len(self.data) < 2:
+            return []
         
+        pattern_performance = self._resolve_pattern_performance(pattern_version)
         if not pattern_performance or not pattern_performance.get('results'):
             return []
         
@@ -1100,27 +1199,8 @@ class BBFS4D6DigitSystem:
             # Default fallback
             results = pattern_performance['results'][-8:]
         
-        analysis = []
-        for result in results:
-            # Find corresponding data entry for day info (optimized lookup)
-            data_entry = None
-            for d in self.data:
-                if d['date'] == result['date'] and d['result'] == result['input_4d']:
-                    data_entry = d
-                    break
-            
-            analysis.append({
-                'date': result['date'],
-                'input_result': result['input_4d'],
-                'actual_result': result['actual_4d'],
-                'input_4d': result['input_4d'],
-                'actual_4d': result['actual_4d'],
-                'bbfs_6digit': result['bbfs_6digit'],
-                'bbfs_string': result['bbfs_6digit'],
-                'is_win': result['is_win'],
-                'day': data_entry['day'] if data_entry else 'Unknown',
-                'missing_digits': []  # For 4D system, this is not as relevant
-            })
+        # Day names are carried in the result rows, so this is linear in len(results)
+        analysis = [self._analysis_row(result) for result in results]
         
         return analysis[::-1]  # Reverse to show newest first
     
@@ -1129,110 +1209,117 @@ class BBFS4D6DigitSystem:
         if not self.data or len(self.data) < 2:
             return []
         
-        if not self.performance_cache:
-            self.run_all_pattern_tests()
-        
-        # Use specified pattern or best pattern
-        if pattern_version and pattern_version in self.performance_cache:
-            pattern_performance = self.performance_cache[pattern_version]
-        else:
-            best_pattern, pattern_performance = self.get_best_pattern()
-        
+        pattern_performance = self._resolve_pattern_performance(pattern_version)
         if not pattern_performance or not pattern_performance.get('results'):
             return []
         
         all_results = pattern_performance['results']
+        start = self._filtered_start_index(pattern_performance, days_filter)
         
-        if days_filter == "all":
-            # Return all available results
-            filtered_results = all_results
-        else:
-            # Calculate cutoff date based on calendar days, not data availability
-            latest_date = max(d['date'] for d in self.data)
-            cutoff_date = latest_date - timedelta(days=days_filter - 1)  # Include current day
-            
-            # Filter results by date range - include all dates >= cutoff_date
-            filtered_results = [r for r in all_results if r['date'] >= cutoff_date]
-            
-            # If we don't have enough entries due to missing dates, extend the range
-            if len(filtered_results) < min(days_filter, len(all_results)):
-                # Sort all results by date (newest first)
-                sorted_results = sorted(all_results, key=lambda x: x['date'], reverse=True)
-                # Take the requested number of most recent entries
-                filtered_results = sorted_results[:days_filter]
-        
-        # Sort filtered results by date (newest first) before converting
-        filtered_results.sort(key=lambda x: x['date'], reverse=True)
-        
-        # Convert to analysis format
-        analysis = []
-        for result in filtered_results:
-            # Find corresponding data entry for day info
-            data_entry = None
-            for d in self.data:
-                if d['date'] == result['date'] and d['result'] == result['input_4d']:
-                    data_entry = d
-                    break
-            
-            # Handle current prediction (latest entry)
-            if result.get('is_current_prediction'):
-                analysis.append({
-                    'date': result['date'],
-                    'input_result': result['input_4d'],
-                    'actual_result': 'PREDIKSI',  # Mark as prediction
-                    'input_4d': result['input_4d'],
-                    'actual_4d': 'TBD',  # To be determined
-                    'bbfs_6digit': result['bbfs_6digit'],
-                    'bbfs_string': result['bbfs_6digit'],
-                    'is_win': None,  # Unknown for prediction
-                    'day': data_entry['day'] if data_entry else 'Unknown',
-                    'missing_digits': [],
-                    'is_current_prediction': True
-                })
-            else:
-                analysis.append({
-                    'date': result['date'],
-                    'input_result': result['input_4d'],
-                    'actual_result': result['actual_4d'],
-                    'input_4d': result['input_4d'],
-                    'actual_4d': result['actual_4d'],
-                    'bbfs_6digit': result['bbfs_6digit'],
-                    'bbfs_string': result['bbfs_6digit'],
-                    'is_win': result['is_win'],
-                    'day': data_entry['day'] if data_entry else 'Unknown',
-                    'missing_digits': []
-                })
+        # Results are stored oldest first, so newest first is a reversed slice
+        analysis = [self._analysis_row(result) for result in reversed(all_results[start:])]
         
         return analysis  # Already sorted newest first
     
-    def get_data_info(self):
-        """Get comprehensive data information with validation"""
-        if not self.data:
-            return {}
+    def get_analysis_page(self, days_filter, pattern_version=None, offset=0, limit=50):
+        """Get one page of the day-filtered analysis (newest first).
+        
+        Only the rows of the requested page are materialised; the window totals
+        (total, wins, losses) are counted from the stored results directly.
+        Use next_offset to fetch the following page (None when exhausted).
+        A limit below 1 is treated as 1, so following next_offset always ends.
+        """
+        limit = max(1, limit)
+        empty_page = {'rows': [], 'total': 0, 'wins': 0, 'losses': 0,
+                      'offset': offset, 'limit': limit, 'next_offset': None}
+        if not self.data or len(self.data) < 2:
+            return empty_page
         
-        # Count valid vs invalid entries
-        valid_entries = 0
-        invalid_entries = 0
+        pattern_performance = self._resolve_pattern_performance(pattern_version)
+        if not pattern_performance or not pattern_performance.get('results'):
+            return empty_page
         
-        for entry in self.data:
-            if entry.get('last_4d') and len(entry['last_4d']) == 4:
-                valid_entries += 1
-            else:
-                invalid_entries += 1
+        all_results = pattern_performance['results']
+        start = self._filtered_start_index(pattern_performance, days_filter)
+        total = len(all_results) - start
+        wins = sum(1 for i in range(start, len(all_results)) if all_results[i]['is_win'])
         
-        data_quality = (valid_entries / len(self.data) * 100) if len(self.data) > 0 else 0
+        # Page offsets count from the newest result in the window
+        offset = max(0, offset)
+        stop = len(all_results) - offset
+        first = max(start, stop - limit)
+        rows = [self._analysis_row(all_results[i]) for i in range(stop - 1, first - 1, -1)]
+        next_offset = offset + len(rows)
         
         return {
-            'total_records': len(self.data),
-            'valid_entries': valid_entries,
-            'invalid_entries': invalid_entries,
-            'data_quality_percentage': data_quality,
-            'date_range': f"{self.data[0]['date'].strftime('%Y-%m-%d')} to {self.data[-1]['date'].strftime('%Y-%m-%d')}",
-            'first_date': self.data[0]['date'].strftime('%Y-%m-%d'),
-            'last_date': self.data[-1]['date'].strftime('%Y-%m-%d'),
-            'completeness_status': 'Excellent' if data_quality >= 95 else 'Good' if data_quality >= 85 else 'Fair' if data_quality >= 70 else 'Poor',
-            'last_updated': self.last_updated.strftime('%Y-%m-%d %H:%M:%S') if hasattr(self, 'last_updated') and self.last_updated else 'Never'
+            'rows': rows,
+            'total': total,
+            'wins': wins,
+            'losses': total - wins,
+            'offset': offset,
+            'limit': limit,
+            'next_offset': next_offset if rows and next_offset < total else None
+        }
+    
+    def get_data_info(self):
+        """Get comprehensive data information with validation (memoized per data version)"""
+        return self._memoized(('data_info',), self._compute_data_info)
+    
+    def get_view_model(self, pattern_version='V1', days_filter=7, page_size=VIEW_PAGE_SIZE):
+        """Everything the mobile UI renders for one (pattern, days filter), built once per data version.
+        
+        Holds the status bar numbers, latest draw and prediction, streak card,
+        loss breakdown and the first page of history rows, so a rerun only has
+        to format it.
+        """
+        return self._memoized(('view_model', pattern_version, days_filter, page_size),
+                              lambda: self._compute_view_model(pattern_version, days_filter, page_size))
+    
+    def _compute_view_model(self, pattern_version, days_filter, page_size):
+        view = {
+            'data_version': self.data_version,
+            'pattern': pattern_version,
+            'pattern_name': self.pattern_versions.get(pattern_version, ''),
+            'days_filter': days_filter,
+            'data_info': self.get_data_info(),
+            'best_pattern': None,
+            'best_performance': {},
+            'pattern_summary': {},
+            'performance': {},
+            'latest': None,
+            'prediction': None,
+            'streak': {'current_streak': 0, 'streak_details': []},
+            'loss_breakdown': {},
+            'analysis_page': self.get_analysis_page(days_filter, pattern_version, 0, page_size)
         }
+        if not self.data:
+            return view
+        
+        view['best_pattern'], view['best_performance'] = self.get_best_pattern()
+        view['pattern_summary'] = self.get_pattern_summary()
+        view['performance'] = self.performance_cache.get(pattern_version, {})
+        view['streak'] = self.get_current_loss_streak_analysis(10, pattern_version)
+        view['loss_breakdown'] = self.get_consecutive_loss_breakdown(pattern_version)
+        
+        if len(self.data) >= 2:
+            latest = self.data[-1]
+            view['latest'] = {
+                'result': latest['result'],
+                'day': latest['day'],
+                'date': latest['date'],
+                'date_display': latest['date'].strftime('%d/%m/%Y')
+            }
+            view['prediction'] = self.generate_prediction(latest['result'], latest['day'], pattern_version)
+        
+        return view
+    
+    def precompute_view_models(self, page_size=VIEW_PAGE_SIZE):
+        """Build the view model of every pattern and UI day filter for the current data version"""
+        for pattern_version in self.pattern_versions:
+            for days_filter in self.VIEW_DAYS_FILTERS:
+                self.get_view_model(pattern_version, days_filter, page_size)
+        # Next-draw lookups on the request path are then a table lookup
+        self.draw_calendar()
     
     def validate_historical_accuracy(self):
         """Validate historical accuracy and completeness of all calculations"""
@@ -1268,10 +1355,11 @@ class BBFS4D6DigitSystem:
         
         return validation_report
 
-def get_4d_system(data_url=None):
-    """Get system instance with configurable URL and auto-load data"""
+def get_4d_system(data_url=None, warm=False):
+    """Get system instance with configurable URL and loaded data (backtested too if warm=True)"""
     system = BBFS4D6DigitSystem(data_url)
-    # Auto-load data if not already loaded
-    if not system.data or len(system.data) == 0:
-        system.fetch_complete_data()
+    if warm:
+        system.warm()
+    else:
+        system.load()
     return system
\ No newline at end of file
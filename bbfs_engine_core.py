@@ -0,0 +1,423 @@
+"""
+BBFS Engine Core - bagian bersama sistem BBFS 2D dan 4D.
+
+Menyimpan data draw (fetch, perbaikan tanggal, standarisasi hari), index pola
+(hari, input) -> hasil berikutnya, penghitung loss streak untuk backtest berurutan
+dan breakdown streak. OptimizedBBFSSystem (2D, BBFS 5 digit) dan
+BBFS4D6DigitSystem (4D, BBFS 6 digit) hanya menambahkan strategi BBFS-nya sendiri
+di atas kelas ini, diparameterkan lewat DIGIT_WIDTH dan BBFS_SIZE.
+"""
+
+import requests
+import re
+import time
+from datetime import datetime, timedelta
+from collections import Counter, defaultdict
+
+from draw_calendar import DrawCalendar
+from single_flight import SingleFlight
+
+
+class StreakCounter:
+    """Running win/loss state of a sequential backtest"""
+
+    __slots__ = ('consecutive_losses', 'max_consecutive', 'total_wins', 'total_tests', 'loss_streaks')
+
+    def __init__(self):
+        self.consecutive_losses = 0
+        self.max_consecutive = 0
+        self.total_wins = 0
+        self.total_tests = 0
+        # Closed streaks only; the open one is consecutive_losses
+        self.loss_streaks = []
+
+    def add(self, is_win):
+        self.total_tests += 1
+        if is_win:
+            self.total_wins += 1
+            # Only record a loss streak when it ends
+            if self.consecutive_losses > 0:
+                self.loss_streaks.append(self.consecutive_losses)
+                self.consecutive_losses = 0
+        else:
+            self.consecutive_losses += 1
+            if self.consecutive_losses > self.max_consecutive:
+                self.max_consecutive = self.consecutive_losses
+
+    def all_loss_streaks(self):
+        """Closed streaks plus the open streak at the end of the data"""
+        if self.consecutive_losses > 0:
+            return self.loss_streaks + [self.consecutive_losses]
+        return list(self.loss_streaks)
+
+
+class BBFSEngineCore:
+    # Digits per draw used as input/target (2 for 2D, 4 for 4D) and digits per BBFS line
+    DIGIT_WIDTH = 4
+    BBFS_SIZE = 6
+
+    DEFAULT_URL = "http://128.199.123.196/"
+
+    # Result table patterns, tried in order; the first one that yields draws is used
+    RESULT_PATTERNS = [
+        # Pattern untuk resulthktercepat.org - format baru dengan tabel sederhana
+        r'<td class="text-center">([^<]+)</td>\s*<td class="text-center">(\d{2}-\d{2}-\d{4})</td>\s*<td class="text-center">(\d{4})</td>',
+        # Pattern standar HK: title="Friday=2025-06-20=1234"
+        r'<td title="([^"]*=\d{4}-\d{2}-\d{2}=[^"]*)">(\d{4})</td>',
+        # Pattern alternatif untuk format berbeda
+        r'<td title="([^"]*=\d{4}-\d{2}-\d{2})=[^"]*">(\d{4})</td>',
+        # Pattern untuk data yang mungkin tidak memiliki kode di akhir
+        r'<td title="([^"]*\d{4}-\d{2}-\d{2}[^"]*)">(\d{4})</td>',
+        # Pattern umum untuk fallback
+        r'<td title="([^"]+)">(\d{4})</td>',
+        # Pattern untuk menangkap data dengan format HTML berbeda
+        r'<td[^>]*title="([^"]*\d{4}-\d{2}-\d{2}[^"]*)">.*?(\d{4}).*?</td>',
+        # Pattern khusus untuk menangkap data yang mungkin terlewat
+        r'title="([^"]*(?:Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday)[^"]*\d{4}-\d{2}-\d{2}[^"]*)"[^>]*>(\d{4})',
+        # Pattern untuk data dengan struktur berbeda
+        r'(\w+=[0-9]{4}-[0-9]{2}-[0-9]{2}(?:=[0-9]+)?)[^>]*>(\d{4})</td>'
+    ]
+
+    # Drop draws with the same (date, result) after parsing
+    DEDUPLICATE_DRAWS = True
+
+    # Upper bound of each loss-streak status; longer streaks are "Berbahaya"
+    STREAK_STATUS_LIMITS = ((2, "Normal"), (5, "Perhatian"), (10, "Tinggi"), (15, "Kritis"))
+
+    def __init__(self, data_url=None, draw_schedule=None):
+        self.url = data_url if data_url else self.DEFAULT_URL
+        # DrawCalendar settings of the market: timezone, draw_time, draw_weekdays (learned when absent)
+        self.draw_schedule = dict(draw_schedule or {})
+        self.data = []
+        self.performance_cache = {}
+        self.loss_analysis = {}
+        self.optimization_cache = {}
+        self.last_updated = None
+
+        # Bumped whenever data or backtest results change; memoized views are keyed on it
+        self.data_version = 0
+        self._memo = {}
+        # Concurrent callers of the same (data version, computation) share one run
+        self._flight = SingleFlight()
+
+    @property
+    def draw_key(self):
+        """Entry field holding the input/target digits ('last_2d' or 'last_4d')"""
+        return f"last_{self.DIGIT_WIDTH}d"
+
+    def _bump_data_version(self):
+        """Mark data/backtest results as changed and drop memoized views"""
+        self.data_version += 1
+        self._memo = {}
+
+    def _memoized(self, key, compute):
+        """Return compute() cached against the current data version"""
+        cached = self._memo.get(key)
+        if cached is not None and cached[0] == self.data_version:
+            return cached[1]
+        return self._flight.do(('memo', self.data_version) + key, lambda: self._compute_memoized(key, compute))
+
+    def _compute_memoized(self, key, compute):
+        cached = self._memo.get(key)
+        if cached is not None and cached[0] == self.data_version:
+            return cached[1]
+        value = compute()
+        # compute() may itself bump the version (e.g. by running the backtests)
+        self._memo[key] = (self.data_version, value)
+        return value
+
+    def draw_calendar(self):
+        """Draw calendar of this market, learned from the history once per data version"""
+        return self._memoized(('draw_calendar',), lambda: DrawCalendar.from_history(self.data, **self.draw_schedule))
+
+    def next_draw(self, now=None):
+        """Aware datetime of the next expected result (see DrawCalendar.next_draw)"""
+        return self.draw_calendar().next_draw(now)
+
+    def get_current_working_date(self):
+        """(date, day) of the draw to predict: the next draw day once today is past the latest data"""
+        if not self.data:
+            return None, None
+
+        latest_entry = self.data[-1]
+        calendar = self.draw_calendar()
+        now = calendar.now().replace(tzinfo=None)
+        if now.date() > latest_entry['date'].date():
+            draw_date = calendar.next_draw_date(now.date())
+            return now + timedelta(days=(draw_date - now.date()).days), calendar.day_name(draw_date)
+        # Use latest available data
+        return latest_entry['date'], latest_entry['day']
+
+    def _make_entry(self, date_obj, day_name, result):
+        return {
+            'date': date_obj,
+            'day': self.standardize_day(day_name),
+            'result': result,
+            self.draw_key: result[-self.DIGIT_WIDTH:],
+            'all_digits': list(result)
+        }
+
+    def _parse_draws(self, content):
+        """Draws (2020-2025) found by the first result pattern that matches anything"""
+        data = []
+        for pattern in self.RESULT_PATTERNS:
+            for match in re.findall(pattern, content):
+                # Handle new format vs old format
+                if len(match) == 3:  # New format: day, date, result
+                    day_name, date_str, result = match
+                    # Convert DD-MM-YYYY to YYYY-MM-DD
+                    date_parts = date_str.split('-')
+                    if len(date_parts) != 3:
+                        continue
+                    date_str = f"{date_parts[2]}-{date_parts[1]}-{date_parts[0]}"
+                else:  # Old format with title info: Friday=2021-01-01[=2030]
+                    title_info, result = match
+                    if '=' not in title_info:
+                        continue
+                    parts = title_info.split('=')
+                    day_name, date_str = parts[0], parts[1]
+
+                try:
+                    # Fix malformed dates before parsing
+                    date_obj = datetime.strptime(self.fix_malformed_date(date_str), '%Y-%m-%d')
+                except ValueError:
+                    continue
+                if 2020 <= date_obj.year <= 2025:
+                    data.append(self._make_entry(date_obj, day_name, result))
+
+            # If we found data with this pattern, break
+            if data:
+                break
+        return data
+
+    def _fetch_content(self):
+        """Page HTML, with retries for production deployment"""
+        max_retries = 3
+        for attempt in range(max_retries):
+            try:
+                response = requests.get(
+                    self.url,
+                    timeout=30,
+                    headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+                )
+                response.raise_for_status()
+                return response.text
+            except requests.RequestException as e:
+                if attempt == max_retries - 1:
+                    raise e
+                print(f"Attempt {attempt + 1} failed, retrying...")
+                time.sleep(2)
+        return ""
+
+    def fetch_complete_data(self):
+        """Fetch complete data from 2020-2025"""
+        try:
+            print("Mengambil data lengkap dari 2020-2025...")
+            content = self._fetch_content()
+            data = self._parse_draws(content)
+
+            if not data:
+                self._report_no_data(content)
+                self._on_load_failed()
+                return False
+
+            unique_data = data
+            if self.DEDUPLICATE_DRAWS:
+                # Remove duplicates based on date and result
+                seen = set()
+                unique_data = []
+                for item in data:
+                    key = (item['date'], item['result'])
+                    if key not in seen:
+                        seen.add(key)
+                        unique_data.append(item)
+
+            unique_data.sort(key=lambda x: x['date'])
+            self.data = unique_data
+            self.last_updated = datetime.now()
+            self._on_data_loaded()
+            self._bump_data_version()
+
+            duplicates_removed = len(data) - len(unique_data)
+            if duplicates_removed > 0:
+                print(f"✓ Removed {duplicates_removed} duplicate entries")
+
+            # Tampilkan info data terbaru yang ditemukan
+            latest_data = unique_data[-1]
+            print(f"✓ Data berhasil dimuat: {len(self.data)} records dari {unique_data[0]['date'].year}-{unique_data[-1]['date'].year}")
+            print(f"✓ Data terbaru: {latest_data['date'].strftime('%Y-%m-%d')} ({latest_data['day']}) -> {latest_data['result']}")
+
+            # Accept data if we have reasonable amount (flexible threshold for different sources)
+            return len(self.data) >= 100
+
+        except Exception as e:
+            print(f"Error loading data: {e}")
+            self._on_load_failed()
+            return False
+
+    def _report_no_data(self, content):
+        print("Error: Tidak ada data ditemukan")
+
+    def _on_data_loaded(self):
+        """Hook: new data was stored"""
+
+    def _on_load_failed(self):
+        """Hook: fetch failed or found no draws"""
+
+    def fix_malformed_date(self, date_str):
+        """Fix common date formatting issues in data source - Enhanced adaptive correction"""
+        try:
+            parts = date_str.split('-')
+            if len(parts) != 3:
+                return date_str
+
+            year, month, day = parts
+            year_int = int(year)
+            month_int = int(month)
+            day_int = int(day)
+
+            # Case 1: Month > 12 and Day <= 12 (month/day swapped)
+            if month_int > 12 and day_int <= 12:
+                return f"{year}-{day.zfill(2)}-{month.zfill(2)}"
+
+            # Case 2: Month > 12 and Day > 12 (both invalid - likely date error like 2025-28-14)
+            elif month_int > 12 and day_int > 12:
+                # Check if it's a common pattern like 28-14 which should be 6-28
+                if month_int >= 20:  # Likely a day value in month position
+                    # Extract the actual day from the "month" field
+                    actual_day = str(month_int)[-2:]  # Last 2 digits
+                    # Use current month as a reasonable default
+                    current_month = datetime.now().month
+                    return f"{year}-{str(current_month).zfill(2)}-{actual_day}"
+                else:
+                    # Other cases - swap positions
+                    return f"{year}-{day.zfill(2)}-{month.zfill(2)}"
+
+            # Case 3: Day > 31 (invalid day)
+            elif day_int > 31:
+                # Likely day/month swapped
+                if month_int <= 12:
+                    return f"{year}-{month.zfill(2)}-{str(day_int)[-2:].zfill(2)}"
+
+            # Case 4: Month = 0 (invalid month)
+            elif month_int == 0:
+                return f"{year}-01-{day.zfill(2)}"
+
+            # Case 5: Normal validation - check if date is actually valid
+            else:
+                try:
+                    datetime.strptime(date_str, '%Y-%m-%d')
+                    return date_str  # Date is valid
+                except ValueError:
+                    # Date is invalid despite looking correct - use current month
+                    current_month = datetime.now().month
+                    return f"{year}-{str(current_month).zfill(2)}-{day.zfill(2)}"
+
+        except (ValueError, IndexError):
+            # If all else fails, use current date components
+            current_date = datetime.now()
+            return f"{current_date.year}-{str(current_date.month).zfill(2)}-{str(current_date.day).zfill(2)}"
+
+    def standardize_day(self, day_name):
+        """Standardize day names"""
+        day_mapping = {
+            'senin': 'senin', 'selasa': 'selasa', 'rabu': 'rabu',
+            'kamis': 'kamis', 'jumat': 'jumat', 'sabtu': 'sabtu', 'minggu': 'minggu',
+            'monday': 'senin', 'tuesday': 'selasa', 'wednesday': 'rabu',
+            'thursday': 'kamis', 'friday': 'jumat', 'saturday': 'sabtu', 'sunday': 'minggu'
+        }
+        return day_mapping.get(day_name.lower(), 'senin')
+
+    def _is_valid_draw(self, entry):
+        """A draw is usable when it carries a full DIGIT_WIDTH result"""
+        digits = entry.get(self.draw_key)
+        return bool(digits) and len(digits) == self.DIGIT_WIDTH
+
+    def _draw_pairs(self):
+        """(i, current, next_item) for consecutive valid draws"""
+        data = self.data
+        key = self.draw_key
+        width = self.DIGIT_WIDTH
+        valid = [bool(entry.get(key)) and len(entry[key]) == width for entry in data]
+        for i in range(len(data) - 1):
+            if valid[i] and valid[i + 1]:
+                yield i, data[i], data[i + 1]
+
+    def _build_transition_indexes(self):
+        """(day_patterns, input_patterns, global_freq) over every consecutive pair of draws.
+
+        day_patterns[day][input] and input_patterns[input] list the following draws'
+        digits in data order; global_freq counts every following digit.
+        """
+        key = self.draw_key
+        day_patterns = defaultdict(lambda: defaultdict(list))
+        input_patterns = defaultdict(list)
+        global_freq = Counter()
+        for i in range(len(self.data) - 1):
+            current = self.data[i]
+            input_digits = current[key]
+            next_digits = self.data[i + 1][key]
+            day_patterns[current['day']][input_digits].append(next_digits)
+            input_patterns[input_digits].append(next_digits)
+            for digit in next_digits:
+                global_freq[digit] += 1
+        return day_patterns, input_patterns, global_freq
+
+    def _streak_status(self, streak_length):
+        for limit, status in self.STREAK_STATUS_LIMITS:
+            if streak_length <= limit:
+                return status
+        return "Berbahaya"
+
+    def _loss_streak_breakdown(self, loss_streaks):
+        """Rows per streak length ('3x': count, percentage, status) plus a '_summary' entry"""
+        if not loss_streaks:
+            return {}
+
+        streak_counts = Counter(loss_streaks)
+        total_streaks = len(loss_streaks)
+
+        breakdown = {}
+        # Sort streaks by length for consistent display (1x, 2x, 3x, ... up to max)
+        for streak_length, count in sorted(streak_counts.items()):
+            breakdown[f"{streak_length}x"] = {
+                'streak_length': streak_length,
+                'count': count,
+                'percentage': (count / total_streaks) * 100,
+                'status': self._streak_status(streak_length)
+            }
+
+        breakdown['_summary'] = {
+            'total_streaks': total_streaks,
+            'max_streak': max(loss_streaks),
+            'avg_streak': sum(loss_streaks) / total_streaks
+        }
+        return breakdown
+
+    def draws_fingerprint(self):
+        """(records, last date, last result) - equal fingerprints mean no draw was added"""
+        if not self.data:
+            return None
+        return (len(self.data), self.data[-1]['date'], self.data[-1]['result'])
+
+    def _compute_data_info(self):
+        if not self.data:
+            return {}
+
+        # Count valid vs invalid entries
+        valid_entries = sum(1 for entry in self.data if self._is_valid_draw(entry))
+        invalid_entries = len(self.data) - valid_entries
+
+        data_quality = (valid_entries / len(self.data) * 100) if len(self.data) > 0 else 0
+
+        return {
+            'total_records': len(self.data),
+            'valid_entries': valid_entries,
+            'invalid_entries': invalid_entries,
+            'data_quality_percentage': data_quality,
+            'date_range': f"{self.data[0]['date'].strftime('%Y-%m-%d')} to {self.data[-1]['date'].strftime('%Y-%m-%d')}",
+            'first_date': self.data[0]['date'].strftime('%Y-%m-%d'),
+            'last_date': self.data[-1]['date'].strftime('%Y-%m-%d'),
+            'completeness_status': 'Excellent' if data_quality >= 95 else 'Good' if data_quality >= 85 else 'Fair' if data_quality >= 70 else 'Poor',
+            'last_updated': self.last_updated.strftime('%Y-%m-%d %H:%M:%S') if hasattr(self, 'last_updated') and self.last_updated else 'Never'
+        }
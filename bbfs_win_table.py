@@ -0,0 +1,117 @@
+"""
+BBFS Win Table - relasi menang/kalah semua BBFS 5 digit terhadap semua hasil 2D.
+
+Hanya ada C(10,5) = 252 set BBFS 5 digit dan 100 hasil 2D, jadi seluruh relasinya
+adalah tabel boolean 252x100 yang dihitung sekali saat modul di-import. Setiap set
+juga disimpan sebagai bitmask digit (bit d = digit d), sama seperti mask BBFS di
+history backtest OptimizedBBFSSystem.
+
+Dengan tabel ini backtest sebuah urutan set, what-if untuk satu set tetap, dan
+oracle (set tetap terbaik, set terbaik per hari) cukup berupa gather NumPy di atas
+seluruh history:
+
+    wins = WIN_TABLE[set_indices, results_2d]       # satu set per draw
+    fixed = WIN_TABLE[:, results_2d]                # 252 x draws, semua set tetap
+"""
+
+from itertools import combinations
+
+import numpy as np
+
+BBFS_DIGITS = 5
+
+# Every 5-digit BBFS, digits ascending, in combinations() order
+BBFS_SETS = tuple(''.join(digits) for digits in combinations('0123456789', BBFS_DIGITS))
+BBFS_MASKS = np.array([sum(1 << int(d) for d in bbfs) for bbfs in BBFS_SETS], dtype=np.int16)
+
+# Set index per digit mask (0-1023), -1 for masks that are not a 5-digit set
+SET_INDEX = np.full(1 << 10, -1, dtype=np.int16)
+SET_INDEX[BBFS_MASKS] = np.arange(len(BBFS_SETS), dtype=np.int16)
+
+# Digit mask per 2D result 0-99 ('07' needs digits 0 and 7)
+RESULT_MASKS = np.array([(1 << (r // 10)) | (1 << (r % 10)) for r in range(100)], dtype=np.int16)
+
+# WIN_TABLE[s, r]: BBFS set s contains both digits of 2D result r
+WIN_TABLE = (RESULT_MASKS[np.newaxis, :] & ~BBFS_MASKS[:, np.newaxis]) == 0
+WIN_TABLE.setflags(write=False)
+
+
+def set_index(bbfs):
+    """Index in BBFS_SETS of a BBFS given as digits (string or list)"""
+    index = int(SET_INDEX[sum(1 << int(d) for d in set(str(digit) for digit in bbfs))])
+    if index < 0:
+        raise ValueError(f"BBFS {bbfs!r} is not a set of {BBFS_DIGITS} distinct digits")
+    return index
+
+
+def mask_indices(masks):
+    """Set indices for an array of digit masks (all must be 5-digit sets)"""
+    indices = SET_INDEX[np.asarray(masks, dtype=np.int16)]
+    if len(indices) and indices.min() < 0:
+        raise ValueError(f"Masks without a {BBFS_DIGITS}-digit set: {np.unique(np.asarray(masks)[indices < 0])}")
+    return indices
+
+
+def loss_streaks(wins):
+    """Length of the loss run ending at each draw (0 on wins), along the last axis"""
+    wins = np.asarray(wins, dtype=bool)
+    positions = np.arange(wins.shape[-1])
+    last_win = np.maximum.accumulate(np.where(wins, positions, -1), axis=-1)
+    return positions - last_win
+
+
+def max_loss_streak(wins):
+    """Longest loss run along the last axis (one value per row for 2D input)"""
+    wins = np.asarray(wins, dtype=bool)
+    if wins.shape[-1] == 0:
+        return np.zeros(wins.shape[:-1], dtype=np.int64) if wins.ndim > 1 else 0
+    return loss_streaks(wins).max(axis=-1)
+
+
+def summarize_wins(wins):
+    """Totals in the format of get_history_summary"""
+    wins = np.asarray(wins, dtype=bool)
+    total = len(wins)
+    won = int(wins.sum())
+    return {
+        'total_tests': total,
+        'wins': won,
+        'losses': total - won,
+        'win_rate': round(won / total * 100, 1) if total else 0,
+        'max_consecutive_loss': int(max_loss_streak(wins))
+    }
+
+
+def fixed_set_table(results_2d):
+    """Wins and max loss streak of every fixed BBFS over a result sequence.
+
+    Returns (win_counts, max_streaks), both indexed like BBFS_SETS.
+    """
+    wins = WIN_TABLE[:, np.asarray(results_2d, dtype=np.intp)]
+    return wins.sum(axis=1), max_loss_streak(wins)
+
+
+def best_fixed_sets(results_2d, top=5, table=None):
+    """Fixed sets ranked by win count, then shorter max loss streak (table: fixed_set_table output)"""
+    win_counts, max_streaks = table if table is not None else fixed_set_table(results_2d)
+    total = len(results_2d)
+    order = np.lexsort((max_streaks, -win_counts))[:top]
+    return [{
+        'bbfs': BBFS_SETS[s],
+        'wins': int(win_counts[s]),
+        'win_rate': round(int(win_counts[s]) / total * 100, 1) if total else 0,
+        'max_consecutive_loss': int(max_streaks[s])
+    } for s in order]
+
+
+def best_set_per_group(group_codes, results_2d, groups=None):
+    """Set index with the most wins for each group (e.g. day code), in-sample.
+
+    Returns an array of set indices indexed by group code.
+    """
+    group_codes = np.asarray(group_codes, dtype=np.intp)
+    groups = groups if groups is not None else (int(group_codes.max()) + 1 if len(group_codes) else 0)
+    # counts[g, r] = draws of group g with 2D result r, then wins per (group, set) by matmul
+    counts = np.zeros((groups, 100), dtype=np.int64)
+    np.add.at(counts, (group_codes, np.asarray(results_2d, dtype=np.intp)), 1)
+    return (counts @ WIN_TABLE.T.astype(np.int64)).argmax(axis=1)
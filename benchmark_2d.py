@@ -0,0 +1,121 @@
+"""
+Benchmark 2D - mengukur test_comprehensive_performance OptimizedBBFSSystem.
+
+Baseline-nya adalah backtest lama: satu scan (_generate_optimized_bbfs_scan) per draw
+yang dites, tanpa cache apa pun. Speedup dilaporkan terpisah per optimasi:
+- loss bucket: scan per draw vs scan sekali per (hari, input_2d, loss bucket)
+- score table: scan per loss bucket vs score table per loss bucket
+Backtest dengan tabel dijalankan dingin (BBFS per loss bucket masih kosong) dan hangat,
+dan semua jalur harus memberi hasil yang identik.
+
+Contoh:
+    python benchmark_2d.py --market HK --repeat 3
+"""
+
+import argparse
+import sys
+import time
+
+from bbfs_engine_core import StreakCounter
+from market_registry import DEFAULT_MARKET, MARKET_URLS
+from optimized_bbfs_system import OptimizedBBFSSystem
+
+
+def _best_time(fn, repeat):
+    best, result = None, None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def _cold_backtest(system):
+    # Drop the per-(day, input_2d, loss bucket) BBFS so every bucket is recomputed
+    system.optimization_cache.pop('bucket_bbfs', None)
+    system.optimization_cache.pop('bucket_masks', None)
+    return system.test_comprehensive_performance()
+
+
+def _scan_per_draw_backtest(system):
+    """The backtest as it ran before the bucket cache: one scan per tested draw"""
+    streaks = StreakCounter()
+    for _, current, next_item in system._draw_pairs():
+        input_2d = current['last_2d']
+        next_2d = next_item['last_2d']
+        if not (input_2d.isdigit() and next_2d.isdigit()):
+            continue
+        bbfs = system._generate_optimized_bbfs_scan(input_2d, current['day'], streaks.consecutive_losses)
+        streaks.add(all(digit in bbfs for digit in next_2d))
+    return {
+        'total_tests': streaks.total_tests,
+        'total_wins': streaks.total_wins,
+        'max_consecutive_loss': streaks.max_consecutive,
+        'loss_streaks': streaks.all_loss_streaks()
+    }
+
+
+def _speedup(before, after):
+    return before / after if after > 0 else 0
+
+
+def run_benchmark(system, repeat=3):
+    """Time the backtest per draw, per loss bucket (scan) and per loss bucket (tables); returns a report dict"""
+    build_time, _ = _best_time(system.build_optimization_patterns, repeat)
+    baseline_time, baseline_result = _best_time(lambda: _scan_per_draw_backtest(system), repeat)
+    table_time, table_result = _best_time(lambda: _cold_backtest(system), repeat)
+    warm_time, warm_result = _best_time(system.test_comprehensive_performance, repeat)
+
+    # Same instance, prediction routed through the reference scan
+    system.generate_optimized_bbfs = system._generate_optimized_bbfs_scan
+    try:
+        scan_time, scan_result = _best_time(lambda: _cold_backtest(system), repeat)
+    finally:
+        del system.generate_optimized_bbfs
+        system.optimization_cache.pop('bucket_bbfs', None)
+        system.optimization_cache.pop('bucket_masks', None)
+
+    ignore = ('last_updated', 'history')
+    strip = lambda result: {k: v for k, v in result.items() if k not in ignore}
+    identical = (strip(table_result) == strip(warm_result) == strip(scan_result)
+                 and all(table_result[k] == v for k, v in baseline_result.items()))
+    return {
+        'records': len(system.data),
+        'build_s': build_time,
+        'baseline_s': baseline_time,
+        'scan_s': scan_time,
+        'tables_s': table_time,
+        'warm_s': warm_time,
+        'bucket_speedup': _speedup(baseline_time, scan_time),
+        'table_speedup': _speedup(scan_time, table_time),
+        'speedup': _speedup(baseline_time, table_time),
+        'identical': identical
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the 2D backtest (per-draw scan vs loss buckets and score tables)")
+    parser.add_argument('--market', default=DEFAULT_MARKET, choices=sorted(MARKET_URLS))
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    system = OptimizedBBFSSystem(MARKET_URLS[args.market])
+    if not system.fetch_complete_data():
+        print("Error: Gagal memuat data", file=sys.stderr)
+        return 1
+
+    report = run_benchmark(system, args.repeat)
+    print(f"Records                     : {report['records']:,}")
+    print(f"Build patterns              : {report['build_s'] * 1000:.1f} ms (incl. score tables)")
+    print(f"Backtest (per draw, scan)   : {report['baseline_s'] * 1000:.1f} ms (baseline)")
+    print(f"Backtest (per bucket, scan) : {report['scan_s'] * 1000:.1f} ms ({report['bucket_speedup']:.1f}x loss buckets)")
+    print(f"Backtest (per bucket, table): {report['tables_s'] * 1000:.1f} ms ({report['table_speedup']:.1f}x score tables, "
+          f"{report['speedup']:.1f}x total)")
+    print(f"Backtest (warm)             : {report['warm_s'] * 1000:.1f} ms (BBFS per loss bucket cached)")
+    print(f"Identical results           : {report['identical']}")
+    return 0 if report['identical'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""
+Bulk Predict - CLI untuk membuat banyak prediksi BBFS 6 digit sekaligus.
+
+Setiap baris input: "input_4d [hari [pola]]" dipisah spasi atau koma, misalnya
+    1234
+    5678,senin
+    0912 kamis V3
+Baris kosong dan baris yang diawali '#' dilewati. Output berupa CSV:
+input_4d,hari,pola,bbfs
+
+Contoh:
+    python bulk_predict.py inputs.txt --market HK
+    cat inputs.txt | python bulk_predict.py --pattern V1
+"""
+
+import argparse
+import re
+import sys
+
+from bbfs_4d_6digit_system import BBFS4D6DigitSystem
+from market_registry import DEFAULT_MARKET, MARKET_URLS
+
+
+def check_pattern(pattern, patterns):
+    """Pattern name if it is 'auto' or one of patterns, else ValueError"""
+    if pattern != 'auto' and pattern not in patterns:
+        raise ValueError(f"Pola tidak dikenal: {pattern} (pilih auto, {', '.join(patterns)})")
+    return pattern
+
+
+def parse_items(lines, default_day, default_pattern, patterns):
+    """Parse input lines into (input_4d, day, pattern) tuples; ValueError on an unknown pattern"""
+    items = []
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        fields = [field for field in re.split(r'[\s,;]+', line) if field]
+        input_4d = fields[0]
+        day = fields[1] if len(fields) > 1 else default_day
+        pattern = fields[2] if len(fields) > 2 else default_pattern
+        try:
+            check_pattern(pattern, patterns)
+        except ValueError as e:
+            raise ValueError(f"Baris {number}: {e}") from None
+        items.append((input_4d, day, pattern))
+    return items
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk BBFS 6-digit predictions")
+    parser.add_argument('input', nargs='?', default='-', help="file with one input per line ('-' for stdin)")
+    parser.add_argument('--market', default=DEFAULT_MARKET, choices=sorted(MARKET_URLS))
+    parser.add_argument('--pattern', default='auto', help="V1, V2, V3 or auto (best pattern)")
+    parser.add_argument('--day', default=None, help="day for inputs without one (default: day of the latest draw)")
+    args = parser.parse_args()
+
+    system = BBFS4D6DigitSystem(MARKET_URLS[args.market])
+    try:
+        check_pattern(args.pattern, system.pattern_versions)
+    except ValueError as e:
+        parser.error(str(e))
+    if not system.load():
+        print("Error: Gagal memuat data", file=sys.stderr)
+        return 1
+
+    default_day = system.standardize_day(args.day) if args.day else system.data[-1]['day']
+    try:
+        if args.input == '-':
+            items = parse_items(sys.stdin, default_day, args.pattern, system.pattern_versions)
+        else:
+            with open(args.input, encoding='utf-8') as f:
+                items = parse_items(f, default_day, args.pattern, system.pattern_versions)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    items = [(input_4d, system.standardize_day(day), pattern) for input_4d, day, pattern in items]
+
+    predictions = system.generate_predictions_bulk(items)
+    for (input_4d, day, pattern), bbfs in zip(items, predictions):
+        print(f"{input_4d},{day},{pattern},{''.join(bbfs)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
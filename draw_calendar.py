@@ -0,0 +1,135 @@
+"""
+Draw Calendar - jadwal draw per pasaran.
+
+Hari draw dipelajari dari riwayat (hari yang muncul cukup sering dalam setahun
+terakhir) atau diset manual, bersama zona waktu pasaran dan jam keluarnya hasil.
+Offset ke draw berikutnya untuk tiap hari disiapkan sekali saat kalender dibangun,
+jadi mencari draw berikutnya hanya lookup tabel 7 entri.
+
+Contoh:
+    calendar = DrawCalendar.from_history(system.data, timezone='Asia/Jakarta', draw_time='13:50')
+    calendar.next_draw()         # datetime (aware) hasil berikutnya
+    calendar.next_draw_date(d)   # tanggal draw pertama pada/atau setelah d
+"""
+
+from collections import Counter
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+# Indonesian day name per date.weekday()
+DAY_NAMES = ('senin', 'selasa', 'rabu', 'kamis', 'jumat', 'sabtu', 'minggu')
+
+DEFAULT_TIMEZONE = 'Asia/Jakarta'
+
+# Fixed UTC offsets used when the tz database is not available (no DST in these zones)
+_FALLBACK_OFFSETS = {'Asia/Jakarta': 7, 'Asia/Singapore': 8, 'Asia/Hong_Kong': 8}
+
+
+def _load_timezone(name):
+    try:
+        return ZoneInfo(name)
+    except ZoneInfoNotFoundError:
+        pass
+    hours = _FALLBACK_OFFSETS.get(name)
+    if hours is None:
+        print(f"Calendar: Unknown timezone {name}, using UTC")
+        hours = 0
+    return dt_timezone(timedelta(hours=hours), name)
+
+
+def _parse_time(value):
+    if value is None or isinstance(value, time):
+        return value
+    hour, minute = str(value).split(':')[:2]
+    return time(int(hour), int(minute))
+
+
+class DrawCalendar:
+    def __init__(self, draw_weekdays=None, timezone=DEFAULT_TIMEZONE, draw_time=None, gap_counts=None):
+        # No known draw days means every day is treated as a draw day
+        self.draw_weekdays = frozenset(draw_weekdays) if draw_weekdays else frozenset(range(7))
+        self.timezone_name = timezone
+        self.tz = _load_timezone(timezone)
+        self.draw_time = _parse_time(draw_time)
+        # Days between consecutive draws seen in the history (learned gaps)
+        self.gap_counts = Counter(gap_counts or {})
+
+        # Days from each weekday to the next draw day, counting that day / strictly after it
+        self._next_offset = tuple(self._offset(weekday, 0) for weekday in range(7))
+        self._after_offset = tuple(self._offset(weekday, 1) for weekday in range(7))
+
+    def _offset(self, weekday, start):
+        for offset in range(start, start + 7):
+            if (weekday + offset) % 7 in self.draw_weekdays:
+                return offset
+        return start
+
+    @classmethod
+    def from_history(cls, data, timezone=DEFAULT_TIMEZONE, draw_time=None, draw_weekdays=None,
+                     window_days=365, min_share=0.25):
+        """Learn draw weekdays and gaps from the draws of the last window_days.
+
+        A weekday counts as a draw day when it has at least min_share of the draws
+        of the busiest weekday. Explicit draw_weekdays (0 = Monday) skip learning.
+        """
+        dates = [entry['date'].date() for entry in data] if data else []
+        if dates:
+            cutoff = dates[-1] - timedelta(days=window_days)
+            dates = [d for d in dates if d > cutoff]
+
+        gap_counts = Counter((later - earlier).days for earlier, later in zip(dates, dates[1:]) if later > earlier)
+        if draw_weekdays is None and dates:
+            weekday_counts = Counter(d.weekday() for d in dates)
+            busiest = max(weekday_counts.values())
+            draw_weekdays = [weekday for weekday, count in weekday_counts.items() if count >= busiest * min_share]
+        return cls(draw_weekdays, timezone, draw_time, gap_counts)
+
+    def now(self):
+        """Current time in the market timezone"""
+        return datetime.now(self.tz)
+
+    def _local(self, now):
+        if now is None:
+            return self.now()
+        if now.tzinfo is None:
+            return now.replace(tzinfo=self.tz)
+        return now.astimezone(self.tz)
+
+    def is_draw_day(self, day):
+        return day.weekday() in self.draw_weekdays
+
+    def day_name(self, day):
+        return DAY_NAMES[day.weekday()]
+
+    def next_draw_date(self, day, include_today=True):
+        """First draw date on (or, with include_today=False, after) day"""
+        offsets = self._next_offset if include_today else self._after_offset
+        return day + timedelta(days=offsets[day.weekday()])
+
+    def next_draw(self, now=None):
+        """Aware datetime of the next draw; today's draw counts until its draw_time has passed.
+
+        Without a draw_time the result is midnight of the next draw date, with a
+        draw day counting as today's draw for the whole day.
+        """
+        now = self._local(now)
+        if self.draw_time is None:
+            return datetime.combine(self.next_draw_date(now.date()), time(0, 0), tzinfo=self.tz)
+        draw_date = self.next_draw_date(now.date(), include_today=now.time() < self.draw_time)
+        return datetime.combine(draw_date, self.draw_time, tzinfo=self.tz)
+
+    def seconds_until_next_draw(self, now=None):
+        """Seconds until the next result, or None when the draw time is unknown"""
+        if self.draw_time is None:
+            return None
+        now = self._local(now)
+        return max(0.0, (self.next_draw(now) - now).total_seconds())
+
+    def summary(self):
+        return {
+            'draw_days': [DAY_NAMES[weekday] for weekday in sorted(self.draw_weekdays)],
+            'timezone': self.timezone_name,
+            'draw_time': self.draw_time.strftime('%H:%M') if self.draw_time else None,
+            'usual_gap_days': self.gap_counts.most_common(1)[0][0] if self.gap_counts else None
+        }
@@ -0,0 +1,222 @@
+"""
+Loss Context Sweep - mengevaluasi grid parameter generate_optimized_bbfs (2D).
+
+Parameter yang di-sweep adalah atribut kelas OptimizedBBFSSystem:
+LOSS_CONTEXT_THRESHOLD, INPUT_WEIGHT, PATTERN_WEIGHT dan LOSS_BONUS_WEIGHT.
+Bagian yang tidak bergantung parameter (kandidat strategi 1-4, frekuensi global,
+jumlah hit pola hari, digit anti-loss) disiapkan sekali sebagai array per key
+(hari, input_2d); tiap konfigurasi lalu menjalankan backtest berurutan (dengan
+loss context) di atas array itu. Konfigurasi dibagi ke process pool.
+
+Contoh:
+    python loss_context_sweep.py --market HK --thresholds 2,3,4,5 --bonus-weights 0,25,50,100
+"""
+
+import argparse
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from market_registry import DEFAULT_MARKET, MARKET_URLS
+from optimized_bbfs_system import OptimizedBBFSSystem
+
+PARAM_NAMES = ('loss_threshold', 'input_weight', 'pattern_weight', 'bonus_weight')
+
+
+def default_params():
+    return {
+        'loss_threshold': OptimizedBBFSSystem.LOSS_CONTEXT_THRESHOLD,
+        'input_weight': OptimizedBBFSSystem.INPUT_WEIGHT,
+        'pattern_weight': OptimizedBBFSSystem.PATTERN_WEIGHT,
+        'bonus_weight': OptimizedBBFSSystem.LOSS_BONUS_WEIGHT
+    }
+
+
+def _mask(digits):
+    mask = 0
+    for digit in digits:
+        mask |= 1 << int(digit)
+    return mask
+
+
+def build_sweep_arrays(system):
+    """Parameter-independent inputs of the 2D backtest, as plain lists (cheap to send to workers)"""
+    if not system.optimization_cache:
+        system.build_optimization_patterns()
+    steps = system._backtest_steps()
+    day_patterns = system.optimization_cache['day_patterns']
+
+    key_index = {}
+    input_digits, hits, base_masks, extra_masks = [], [], [], []
+    step_keys = []
+    for day, input_2d in steps['keys']:
+        if (day, input_2d) not in key_index:
+            entry = system._score_entry(day, input_2d)
+            if entry is None:
+                raise ValueError(f"Key ({day}, {input_2d}) has no score table entry")
+            digits = sorted({int(digit) for digit in input_2d})
+            key_hits = [0] * 10
+            for next_2d in day_patterns.get(day, {}).get(input_2d, []):
+                for digit in set(next_2d):
+                    key_hits[int(digit)] += 1
+            key_index[(day, input_2d)] = len(input_digits)
+            input_digits.append(digits)
+            hits.append(key_hits)
+            base_masks.append(_mask(entry[1]))
+            # Strategy 5 digits, added once the loss streak passes the threshold
+            extra_masks.append(_mask((int(digit) + offset) % 10 for digit in input_2d for offset in (5, 1, 2)))
+        step_keys.append(key_index[(day, input_2d)])
+
+    return {
+        'global_scores': list(system.optimization_cache['score_tables']['global_scores']),
+        'input_digits': input_digits,
+        'hits': hits,
+        'base_masks': base_masks,
+        'extra_masks': extra_masks,
+        'step_keys': step_keys,
+        'need_masks': list(steps['need_masks'])
+    }
+
+
+def _bbfs_mask(scores, candidates, bonus, bonus_weight):
+    """Digit mask of the BBFS generate_optimized_bbfs picks from a candidate mask"""
+    digits = [d for d in range(10) if candidates >> d & 1]
+    if len(digits) > 5:
+        ranked = sorted(digits, key=lambda d: (scores[d] + (bonus_weight if d in bonus else 0)) * 10 + d, reverse=True)
+        return _mask(ranked[:5])
+    # Fewer candidates: padded with the smallest missing digits
+    for d in range(10):
+        if len(digits) >= 5:
+            break
+        if not candidates >> d & 1:
+            digits.append(d)
+            candidates |= 1 << d
+    return candidates
+
+
+def evaluate_config(arrays, params):
+    """Sequential 2D backtest (with loss context) for one parameter set; returns a result row"""
+    threshold = params['loss_threshold']
+    input_weight = params['input_weight']
+    pattern_weight = params['pattern_weight']
+    bonus_weight = params['bonus_weight']
+    global_scores = arrays['global_scores']
+
+    scores_cache = {}
+    bbfs_cache = {}
+    consecutive_losses = 0
+    max_consecutive = 0
+    wins = 0
+    for key, need_mask in zip(arrays['step_keys'], arrays['need_masks']):
+        bucket = consecutive_losses if consecutive_losses <= threshold else threshold + 1 + consecutive_losses % 10
+        bbfs = bbfs_cache.get((key, bucket))
+        if bbfs is None:
+            scores = scores_cache.get(key)
+            if scores is None:
+                scores = [global_scores[d] + pattern_weight * arrays['hits'][key][d] for d in range(10)]
+                for d in arrays['input_digits'][key]:
+                    scores[d] += input_weight
+                scores_cache[key] = scores
+            candidates = arrays['base_masks'][key]
+            if consecutive_losses > threshold:
+                candidates |= arrays['extra_masks'][key]
+            bonus = {(d + consecutive_losses) % 10 for d in arrays['input_digits'][key]} if consecutive_losses > 0 else ()
+            bbfs = _bbfs_mask(scores, candidates, bonus, bonus_weight)
+            bbfs_cache[(key, bucket)] = bbfs
+
+        if need_mask & ~bbfs:
+            consecutive_losses += 1
+            if consecutive_losses > max_consecutive:
+                max_consecutive = consecutive_losses
+        else:
+            wins += 1
+            consecutive_losses = 0
+
+    total = len(arrays['step_keys'])
+    row = dict(params)
+    row.update({
+        'total_tests': total,
+        'wins': wins,
+        'win_rate': (wins / total * 100) if total else 0,
+        'max_consecutive_loss': max_consecutive
+    })
+    return row
+
+
+# Arrays of the sweep, set once per worker process
+_worker_arrays = None
+
+
+def _init_worker(arrays):
+    global _worker_arrays
+    _worker_arrays = arrays
+
+
+def _evaluate_in_worker(params):
+    return evaluate_config(_worker_arrays, params)
+
+
+def run_sweep(system, grid, workers=None):
+    """Evaluate every combination of the grid ({param: [values]}, missing params keep
+    their current value); rows sorted by max loss streak, then win rate"""
+    arrays = build_sweep_arrays(system)
+    values = [grid.get(name) or [default_params()[name]] for name in PARAM_NAMES]
+    configs = [dict(zip(PARAM_NAMES, combo)) for combo in itertools.product(*values)]
+
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(configs) <= 1:
+        rows = [evaluate_config(arrays, params) for params in configs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(arrays,)) as pool:
+            rows = list(pool.map(_evaluate_in_worker, configs,
+                                 chunksize=max(1, len(configs) // (workers * 4))))
+
+    rows.sort(key=lambda row: (row['max_consecutive_loss'], -row['win_rate']))
+    return rows
+
+
+def _int_list(value):
+    return [int(v) for v in value.split(',') if v.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep the loss-context parameters of the 2D BBFS")
+    parser.add_argument('--market', default=DEFAULT_MARKET, choices=sorted(MARKET_URLS))
+    parser.add_argument('--thresholds', type=_int_list, default=[1, 2, 3, 4, 5, 6])
+    parser.add_argument('--input-weights', type=_int_list, default=[OptimizedBBFSSystem.INPUT_WEIGHT])
+    parser.add_argument('--pattern-weights', type=_int_list, default=[10, 20, 40])
+    parser.add_argument('--bonus-weights', type=_int_list, default=[0, 25, 50, 100, 200])
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--top', type=int, default=20)
+    args = parser.parse_args()
+
+    system = OptimizedBBFSSystem(MARKET_URLS[args.market])
+    if not system.fetch_complete_data():
+        print("Error: Gagal memuat data", file=sys.stderr)
+        return 1
+    system.build_optimization_patterns()
+
+    grid = {
+        'loss_threshold': args.thresholds,
+        'input_weight': args.input_weights,
+        'pattern_weight': args.pattern_weights,
+        'bonus_weight': args.bonus_weights
+    }
+    started = time.perf_counter()
+    rows = run_sweep(system, grid, args.workers)
+    elapsed = time.perf_counter() - started
+
+    defaults = default_params()
+    print(f"{len(rows)} configurations in {elapsed:.2f} s (* = current settings)")
+    print(f"  {'threshold':>9} {'input':>6} {'pattern':>7} {'bonus':>5} | {'win rate':>8} {'max loss':>8}")
+    for row in rows[:args.top]:
+        marker = '*' if all(row[name] == defaults[name] for name in PARAM_NAMES) else ' '
+        print(f"{marker} {row['loss_threshold']:>9} {row['input_weight']:>6} {row['pattern_weight']:>7} "
+              f"{row['bonus_weight']:>5} | {row['win_rate']:>7.1f}% {row['max_consecutive_loss']:>8}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
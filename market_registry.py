@@ -0,0 +1,332 @@
+"""
+Market Registry - satu sistem BBFS bersama per pasaran untuk seluruh proses server.
+
+Semua session membaca snapshot yang sama untuk satu pasaran, sehingga scrape dan
+backtest hanya dilakukan sekali per pasaran. Refresh membangun snapshot baru
+(copy-on-write) lalu menukar pointer secara atomik; session yang sedang render
+tetap memakai snapshot lama sampai rerun berikutnya.
+
+Refresh berjalan di thread latar belakang (MarketRefresher) yang mem-poll setiap
+pasaran secara berkala, jadi tombol refresh di UI hanya memicu worker. Worker yang
+sama memanaskan semua pasaran saat start, sehingga pindah pasaran cukup menukar
+pointer ke snapshot yang sudah ada.
+"""
+
+import threading
+import time
+from collections import deque
+
+from bbfs_4d_6digit_system import BBFS4D6DigitSystem
+from single_flight import SingleFlight
+
+# Predefined URLs for different markets
+MARKET_URLS = {
+    'HK': 'https://resulthktercepat.org/',
+    'SGP': 'http://188.166.247.189/',
+    'SDY': 'http://128.199.123.196/'
+}
+DEFAULT_MARKET = 'SDY'
+
+# Result time (WIB) per market; draw weekdays are learned from each market's history
+MARKET_DRAW_SCHEDULES = {
+    'HK': {'timezone': 'Asia/Jakarta', 'draw_time': '23:00'},
+    'SGP': {'timezone': 'Asia/Jakarta', 'draw_time': '17:45'},
+    'SDY': {'timezone': 'Asia/Jakarta', 'draw_time': '13:50'}
+}
+
+# Seconds between scheduled background refreshes of every loaded market
+REFRESH_INTERVAL = 15 * 60
+
+# Seconds after a market's draw time before its result is fetched
+RESULT_FETCH_DELAY = 5 * 60
+
+
+class MarketRegistry:
+    def __init__(self, market_urls=None, draw_schedules=None):
+        self.market_urls = dict(market_urls) if market_urls else dict(MARKET_URLS)
+        self.draw_schedules = dict(draw_schedules) if draw_schedules else dict(MARKET_DRAW_SCHEDULES)
+        self._snapshots = {}
+        self._lock = threading.Lock()
+        self._market_locks = {}
+        # Concurrent build/warm/refresh calls for the same (market, data version) share one run
+        self._flight = SingleFlight()
+        self._refresher = None
+        # Recent market switch latencies (seconds), reported by the UI
+        self._switch_latencies = deque(maxlen=200)
+        self._switch_count = 0
+
+    def _market_lock(self, market):
+        """Per-market lock so builds of one market never block another"""
+        with self._lock:
+            if market not in self._market_locks:
+                self._market_locks[market] = threading.Lock()
+            return self._market_locks[market]
+
+    def _resolve_market(self, market):
+        return market if market in self.market_urls else DEFAULT_MARKET
+
+    def get_snapshot(self, market):
+        """Get the published (read-only) system for a market, building it on first use"""
+        market = self._resolve_market(market)
+        snapshot = self._snapshots.get(market)
+        if snapshot is not None:
+            return snapshot
+
+        # Concurrent first requests wait for a single build instead of each scraping
+        return self._flight.do(('build', market), lambda: self._build_and_publish(market))
+
+    def _current_version(self, market):
+        current = self._snapshots.get(market)
+        return current.data_version if current is not None else None
+
+    def _build_and_publish(self, market):
+        with self._market_lock(market):
+            snapshot = self._snapshots.get(market)
+            if snapshot is None:
+                snapshot = self._build(market)
+                self._snapshots[market] = snapshot
+        return snapshot
+
+    def _build(self, market):
+        """Scrape and backtest a market from scratch (one fetch)"""
+        print(f"Registry: Building system for market {market}")
+        system = self._new_system(market)
+        if system.warm():
+            system.precompute_view_models()
+        return system
+
+    def _new_system(self, market):
+        return BBFS4D6DigitSystem(self.market_urls[market], self.draw_schedules.get(market))
+
+    def ensure_warm(self, market):
+        """Get a warm snapshot, retrying a failed build at most once per call.
+
+        A snapshot that is already warm costs nothing; otherwise a copy is warmed
+        (one fetch at most) and published.
+        """
+        market = self._resolve_market(market)
+        snapshot = self.get_snapshot(market)
+        if snapshot.is_warm:
+            return snapshot
+        return self._flight.do(('warm', market, snapshot.data_version), lambda: self._ensure_warm(market))
+
+    def _ensure_warm(self, market):
+        with self._market_lock(market):
+            current = self._snapshots.get(market)
+            if current is not None and current.is_warm:
+                return current
+            snapshot = current.copy() if current is not None else self._new_system(market)
+            if not snapshot.warm():
+                print(f"Registry: Market {market} is still not warm ({snapshot.load_state})")
+                return current if current is not None else snapshot
+            snapshot.precompute_view_models()
+            self._snapshots[market] = snapshot
+            return snapshot
+
+    def refresh(self, market):
+        """Reload a market into a new snapshot and publish it.
+
+        Returns (snapshot, outcome): 'updated' when a new snapshot was published,
+        'unchanged' when the fetch brought no new draw and 'failed' when it failed.
+        In the last two cases the current snapshot (and its data_version) stays published.
+        """
+        market = self._resolve_market(market)
+        # Refresh requests racing on the same published version share one fetch
+        return self._flight.do(('refresh', market, self._current_version(market)),
+                               lambda: self._refresh(market))
+
+    def _refresh(self, market):
+        with self._market_lock(market):
+            current = self._snapshots.get(market)
+            if current is None:
+                snapshot = self._build(market)
+                self._snapshots[market] = snapshot
+                return snapshot, 'updated' if snapshot.data else 'failed'
+
+            # Work on a copy so sessions rendering the current snapshot are not disturbed
+            snapshot = current.copy()
+            if not snapshot.refresh():
+                print(f"Registry: Refresh failed for market {market}, keeping current snapshot")
+                return current, 'failed'
+            if current.is_warm and snapshot.draws_fingerprint() == current.draws_fingerprint():
+                # Publishing would only bump data_version and drop every cached view
+                print(f"Registry: No new draws for market {market}, keeping current snapshot")
+                return current, 'unchanged'
+            # Render models are built before publishing so readers never compute them
+            snapshot.precompute_view_models()
+
+            # Publishing is a single reference swap
+            self._snapshots[market] = snapshot
+            print(f"Registry: Published market {market} data version {snapshot.data_version}")
+            return snapshot, 'updated'
+
+    def loaded_markets(self):
+        return list(self._snapshots.keys())
+
+    def next_draw(self, market):
+        """Aware datetime of a market's next result, or None before its data is loaded"""
+        snapshot = self._snapshots.get(self._resolve_market(market))
+        if snapshot is None or not snapshot.data:
+            return None
+        return snapshot.next_draw()
+
+    def seconds_until_next_result(self):
+        """Seconds until the earliest loaded market's result should be online (None if unknown)"""
+        waits = []
+        for market in self.loaded_markets():
+            snapshot = self._snapshots.get(market)
+            if snapshot is None or not snapshot.data:
+                continue
+            seconds = snapshot.draw_calendar().seconds_until_next_draw()
+            if seconds is not None:
+                waits.append(seconds + RESULT_FETCH_DELAY)
+        return min(waits) if waits else None
+
+    def warm_all(self):
+        """Build every market that has no snapshot yet, default market first"""
+        for market in sorted(self.market_urls, key=lambda m: m != DEFAULT_MARKET):
+            try:
+                self.get_snapshot(market)
+            except Exception as e:
+                print(f"Registry: Error warming market {market}: {e}")
+
+    def record_switch(self, market, seconds):
+        """Record how long a session took to get from the switch click to the new market's snapshot"""
+        with self._lock:
+            self._switch_latencies.append(seconds)
+            self._switch_count += 1
+        print(f"Registry: Switched to market {market} in {seconds * 1000:.1f} ms")
+
+    def switch_stats(self):
+        """Market switch latency over the recent switches, in milliseconds"""
+        with self._lock:
+            latencies = sorted(self._switch_latencies)
+            count = self._switch_count
+        if not latencies:
+            return {'count': 0, 'avg_ms': 0, 'p95_ms': 0, 'max_ms': 0}
+        return {
+            'count': count,
+            'avg_ms': sum(latencies) / len(latencies) * 1000,
+            'p95_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000,
+            'max_ms': latencies[-1] * 1000
+        }
+
+    def start_refresher(self, interval=REFRESH_INTERVAL):
+        """Start the background refresher once per process; returns it"""
+        with self._lock:
+            if self._refresher is None or not self._refresher.is_alive():
+                self._refresher = MarketRefresher(self, interval)
+                self._refresher.start()
+            return self._refresher
+
+    def request_refresh(self, market):
+        """Ask the background refresher to reload a market as soon as possible"""
+        market = self._resolve_market(market)
+        self.start_refresher().request(market)
+        return market
+
+    def refresh_status(self, market):
+        """Background refresh status for a market (see MarketRefresher.status)"""
+        market = self._resolve_market(market)
+        if self._refresher is None:
+            return {'refreshing': False, 'requested_at': None, 'finished_at': None, 'ok': None,
+                    'outcome': None, 'error': None}
+        return self._refresher.status(market)
+
+
+class MarketRefresher(threading.Thread):
+    """Daemon thread that refreshes markets off the request path.
+
+    Every interval, or earlier when a market's next result is due (draw time plus
+    RESULT_FETCH_DELAY), it refreshes all loaded markets; request() wakes it up
+    early for one market. Results are published through MarketRegistry.refresh, so
+    readers only ever see complete snapshots.
+    """
+
+    def __init__(self, registry, interval=REFRESH_INTERVAL):
+        super().__init__(name="market-refresher", daemon=True)
+        self.registry = registry
+        self.interval = interval
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+        self._pending = []
+        self._status = {}
+
+    def _market_status(self, market):
+        if market not in self._status:
+            self._status[market] = {'refreshing': False, 'requested_at': None,
+                                    'finished_at': None, 'ok': None, 'outcome': None, 'error': None}
+        return self._status[market]
+
+    def request(self, market):
+        with self._lock:
+            if market not in self._pending:
+                self._pending.append(market)
+            self._market_status(market)['requested_at'] = time.time()
+        self._wakeup.set()
+
+    def status(self, market):
+        with self._lock:
+            status = dict(self._market_status(market))
+            status['refreshing'] = status['refreshing'] or market in self._pending
+            return status
+
+    def stop(self):
+        self._stopped.set()
+        self._wakeup.set()
+
+    def _next_markets(self, scheduled):
+        loaded = self.registry.loaded_markets() if scheduled else []
+        with self._lock:
+            markets = self._pending + [m for m in loaded if m not in self._pending]
+            self._pending = []
+            # Marked here so status never shows a gap between pending and refreshing
+            for market in markets:
+                self._market_status(market)['refreshing'] = True
+        return markets
+
+    def run(self):
+        # Keep every market warm so switching never scrapes on the request path
+        self.registry.warm_all()
+        while not self._stopped.is_set():
+            scheduled = not self._wakeup.wait(self._next_wait())
+            self._wakeup.clear()
+            if self._stopped.is_set():
+                break
+            for market in self._next_markets(scheduled):
+                self._refresh_market(market)
+
+    def _next_wait(self):
+        until_result = self.registry.seconds_until_next_result()
+        if until_result is None:
+            return self.interval
+        # At least a minute, so a late result does not make the loop spin
+        return max(60, min(self.interval, until_result))
+
+    def _refresh_market(self, market):
+        ok, outcome, error = False, None, None
+        try:
+            _, outcome = self.registry.refresh(market)
+            ok = outcome != 'failed'
+        except Exception as e:
+            error = str(e)
+            print(f"Refresher: Error refreshing market {market}: {error}")
+        with self._lock:
+            status = self._market_status(market)
+            status.update({'refreshing': False, 'finished_at': time.time(), 'ok': ok,
+                           'outcome': outcome, 'error': error})
+
+
+# Process-wide registry instance
+_market_registry = None
+_market_registry_lock = threading.Lock()
+
+def get_market_registry():
+    """Get the process-wide market registry"""
+    global _market_registry
+    if _market_registry is None:
+        with _market_registry_lock:
+            if _market_registry is None:
+                _market_registry = MarketRegistry()
+    return _market_registry
@@ -1,295 +1,50 @@
-import requests
 import re
-from datetime import datetime, timedelta
-from collections import Counter, defaultdict
+from datetime import datetime
+from collections import Counter
 import random
-import time
 
-class OptimizedBBFSSystem:
-    def __init__(self, data_url=None):
-        # Make the main URL customizable, with a configurable default
-        self.url = data_url if data_url else "http://128.199.123.196/"
-        self.data = []
-        self.performance_cache = {}
-        self.loss_analysis = {}
-        self.optimization_cache = {}
-        self.last_updated = None
-        
-    def fetch_complete_data(self):
-        """Fetch complete data from 2020-2025"""
-        try:
-            print("Mengambil data lengkap dari 2020-2025...")
-            # Add retry logic for production deployment
-            max_retries = 3
-            content = ""
-            for attempt in range(max_retries):
-                try:
-                    response = requests.get(
-                        self.url, 
-                        timeout=30,
-                        headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-                    )
-                    response.raise_for_status()
-                    content = response.text
-                    break
-                except requests.RequestException as e:
-                    if attempt == max_retries - 1:
-                        raise e
-                    print(f"Attempt {attempt + 1} failed, retrying...")
-                    time.sleep(2)
-            
-            # Enhanced patterns untuk HK market - parsing lebih komprehensif  
-            patterns = [
-                # Pattern untuk resulthktercepat.org - format baru dengan tabel sederhana
-                r'<td class="text-center">([^<]+)</td>\s*<td class="text-center">(\d{2}-\d{2}-\d{4})</td>\s*<td class="text-center">(\d{4})</td>',
-                # Pattern standar HK: title="Friday=2025-06-20=1234"
-                r'<td title="([^"]*=\d{4}-\d{2}-\d{2}=[^"]*)">(\d{4})</td>',
-                # Pattern alternatif untuk format berbeda
-                r'<td title="([^"]*=\d{4}-\d{2}-\d{2})=[^"]*">(\d{4})</td>',
-                # Pattern untuk data yang mungkin tidak memiliki kode di akhir
-                r'<td title="([^"]*\d{4}-\d{2}-\d{2}[^"]*)">(\d{4})</td>',
-                # Pattern umum untuk fallback
-                r'<td title="([^"]+)">(\d{4})</td>',
-                # Pattern untuk menangkap data dengan format HTML berbeda
-                r'<td[^>]*title="([^"]*\d{4}-\d{2}-\d{2}[^"]*)">.*?(\d{4}).*?</td>',
-                # Pattern khusus untuk menangkap data yang mungkin terlewat
-                r'title="([^"]*(?:Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday)[^"]*\d{4}-\d{2}-\d{2}[^"]*)"[^>]*>(\d{4})',
-                # Pattern untuk data dengan struktur berbeda
-                r'(\w+=[0-9]{4}-[0-9]{2}-[0-9]{2}(?:=[0-9]+)?)[^>]*>(\d{4})</td>',
-                # Pattern untuk market dengan struktur HTML berbeda
-                r'<td[^>]*>([^<]*\d{4}-\d{2}-\d{2}[^<]*)</td>[^<]*<td[^>]*>(\d{4})</td>'
-            ]
-            
-            data = []
-            for pattern in patterns:
-                matches = re.findall(pattern, content)
-                
-                for match in matches:
-                    # Handle new format vs old format
-                    if len(match) == 3:  # New format: day, date, result
-                        day_name = match[0]
-                        date_str = match[1]
-                        result = match[2]
-                        
-                        try:
-                            # Convert DD-MM-YYYY to YYYY-MM-DD
-                            date_parts = date_str.split('-')
-                            if len(date_parts) == 3:
-                                formatted_date = f"{date_parts[2]}-{date_parts[1]}-{date_parts[0]}"
-                                # Fix malformed dates before parsing
-                                corrected_date = self.fix_malformed_date(formatted_date)
-                                date_obj = datetime.strptime(corrected_date, '%Y-%m-%d')
-                                if 2020 <= date_obj.year <= 2025:
-                                    data.append({
-                                        'date': date_obj,
-                                        'day': self.standardize_day(day_name),
-                                        'result': result,
-                                        'last_2d': result[-2:],
-                                        'all_digits': list(result)
-                                    })
-                        except ValueError:
-                            continue
-                    else:  # Old format with title info
-                        title_info = match[0]
-                        result = match[1]
-                        
-                        # Handle different title formats
-                        if '=' in title_info:
-                            parts = title_info.split('=')
-                            if len(parts) >= 3:
-                                # Format: Friday=2021-01-01=2030
-                                day_name = parts[0]
-                                date_str = parts[1]
-                            elif len(parts) >= 2:
-                                # Format: Friday=2025-06-20
-                                day_name = parts[0]
-                                date_str = parts[1]
-                        else:
-                            continue
-                        
-                        try:
-                            # Fix malformed dates - common issues in data source
-                            corrected_date_str = self.fix_malformed_date(date_str)
-                            date_obj = datetime.strptime(corrected_date_str, '%Y-%m-%d')
-                            if 2020 <= date_obj.year <= 2025:
-                                data.append({
-                                    'date': date_obj,
-                                    'day': self.standardize_day(day_name),
-                                    'result': result,
-                                    'last_2d': result[-2:],
-                                    'all_digits': list(result)
-                                })
-                        except ValueError:
-                            continue
-                
-                # If we found data with this pattern, break
-                if data:
-                    break
-            
-            # Validate and filter data
-            if not data:
-                print("Error: Tidak ada data ditemukan dengan pattern yang tersedia")
-                print(f"URL: {self.url}")
-                print(f"Content length: {len(content)} chars")
-                # Debug: show first few td elements found
-                debug_matches = re.findall(r'<td[^>]*title="[^"]*"[^>]*>(\d{4})</td>', content)
-                print(f"Debug: Found {len(debug_matches)} potential matches")
-                if debug_matches:
-                    print(f"Sample matches: {debug_matches[:5]}")
-                return False
-            
-            # Sort by date ascending
-            data.sort(key=lambda x: x['date'])
-            self.data = data
-            self.last_updated = datetime.now()
-            
-            print(f"✓ Data berhasil dimuat: {len(self.data)} records dari {data[0]['date'].year}-{data[-1]['date'].year}")
-            # Accept data if we have reasonable amount (flexible threshold for different sources)
-            return len(self.data) >= 100
-            
-        except Exception as e:
-            print(f"Error loading data: {e}")
-            return False
-    
-    def fix_malformed_date(self, date_str):
-        """Fix common date formatting issues in data source - Enhanced adaptive correction"""
-        try:
-            parts = date_str.split('-')
-            if len(parts) != 3:
-                return date_str
-                
-            year, month, day = parts
-            year_int = int(year)
-            month_int = int(month)
-            day_int = int(day)
-            
-            # Case 1: Month > 12 and Day <= 12 (month/day swapped)
-            if month_int > 12 and day_int <= 12:
-                return f"{year}-{day.zfill(2)}-{month.zfill(2)}"
-            
-            # Case 2: Month > 12 and Day > 12 (both invalid - likely date error like 2025-28-14)
-            elif month_int > 12 and day_int > 12:
-                # Check if it's a common pattern like 28-14 which should be 6-28
-                if month_int >= 20:  # Likely a day value in month position
-                    # Extract the actual day from the "month" field
-                    actual_day = str(month_int)[-2:]  # Last 2 digits
-                    # Use current month as a reasonable default
-                    current_month = datetime.now().month
-                    return f"{year}-{str(current_month).zfill(2)}-{actual_day}"
-                else:
-                    # Other cases - swap positions
-                    return f"{year}-{day.zfill(2)}-{month.zfill(2)}"
-            
-            # Case 3: Day > 31 (invalid day)
-            elif day_int > 31:
-                # Likely day/month swapped or needs truncation
-                if month_int <= 12:
-                    # Keep valid month, truncate day to valid range
-                    valid_day = min(day_int, 31)
-                    if valid_day <= 28:  # Safe for all months
-                        return f"{year}-{month.zfill(2)}-{str(valid_day).zfill(2)}"
-                    else:
-                        # Use last 2 digits if still too large
-                        return f"{year}-{month.zfill(2)}-{str(day_int)[-2:].zfill(2)}"
-                
-            # Case 4: Month = 0 (invalid month)
-            elif month_int == 0:
-                return f"{year}-01-{day.zfill(2)}"
-                
-            # Case 5: Normal validation - check if date is actually valid
-            else:
-                try:
-                    datetime.strptime(date_str, '%Y-%m-%d')
-                    return date_str  # Date is valid
-                except ValueError:
-                    # Date is invalid despite looking correct - use current month
-                    current_month = datetime.now().month
-                    return f"{year}-{str(current_month).zfill(2)}-{day.zfill(2)}"
-                
-        except (ValueError, IndexError):
-            # If all else fails, use current date components
-            current_date = datetime.now()
-            return f"{current_date.year}-{str(current_date.month).zfill(2)}-{str(current_date.day).zfill(2)}"
+import numpy as np
 
-    def standardize_day(self, day_name):
-        """Standardize day names"""
-        day_mapping = {
-            'senin': 'senin', 'selasa': 'selasa', 'rabu': 'rabu',
-            'kamis': 'kamis', 'jumat': 'jumat', 'sabtu': 'sabtu', 'minggu': 'minggu',
-            'monday': 'senin', 'tuesday': 'selasa', 'wednesday': 'rabu',
-            'thursday': 'kamis', 'friday': 'jumat', 'saturday': 'sabtu', 'sunday': 'minggu'
-        }
-        return day_mapping.get(day_name.lower(), 'senin')
+from bbfs_engine_core import BBFSEngineCore, StreakCounter
+from bbfs_win_table import (BBFS_SETS, WIN_TABLE, best_fixed_sets, best_set_per_group, fixed_set_table,
+                            mask_indices, set_index, summarize_wins)
+
+class OptimizedBBFSSystem(BBFSEngineCore):
+    DIGIT_WIDTH = 2
+    BBFS_SIZE = 5
     
-    def get_current_working_date(self):
-        """Get current working date that skips non-working days based on actual data"""
-        if not self.data:
-            return None, None
-            
-        # Get the latest data entry
-        latest_entry = self.data[-1]
-        latest_date = latest_entry['date']
-        latest_day = latest_entry['day']
-        
-        # Define working days (days that typically have results)
-        working_days = ['senin', 'selasa', 'rabu', 'kamis', 'jumat', 'minggu']
-        
-        # Get current actual date
-        current_date = datetime.now()
-        
-        # If today is after the latest data date, determine next working day
-        if current_date.date() > latest_date.date():
-            # Calculate days since latest data
-            days_diff = (current_date.date() - latest_date.date()).days
-            
-            # Find next working day by checking what day it would be
-            next_date = latest_date + timedelta(days=1)
-            
-            # Map current date to Indonesian day
-            current_weekday = current_date.strftime('%A').lower()
-            day_map = {
-                'monday': 'senin', 'tuesday': 'selasa', 'wednesday': 'rabu',
-                'thursday': 'kamis', 'friday': 'jumat', 'saturday': 'sabtu', 'sunday': 'minggu'
-            }
-            current_indo_day = day_map.get(current_weekday, 'senin')
-            
-            # Skip Saturday (sabtu) as it typically has no results
-            if current_indo_day == 'sabtu':
-                # Move to Sunday
-                current_indo_day = 'minggu'
-                current_date = current_date + timedelta(days=1)
-            
-            return current_date, current_indo_day
-        else:
-            # Use latest available data
-            return latest_date, latest_day
+    RESULT_PATTERNS = BBFSEngineCore.RESULT_PATTERNS + [
+        # Pattern untuk market dengan struktur HTML berbeda
+        r'<td[^>]*>([^<]*\d{4}-\d{2}-\d{2}[^<]*)</td>[^<]*<td[^>]*>(\d{4})</td>'
+    ]
+    # The 2D backtest has always run on every parsed draw, duplicates included
+    DEDUPLICATE_DRAWS = False
+    STREAK_STATUS_LIMITS = ((3, "Normal"), (6, "Perhatian"), (10, "Tinggi"), (15, "Kritis"))
+    
+    # Scoring of generate_optimized_bbfs; set before build_optimization_patterns
+    # (loss_context_sweep.py evaluates alternatives)
+    INPUT_WEIGHT = 1000
+    PATTERN_WEIGHT = 20
+    LOSS_BONUS_WEIGHT = 50
+    # Loss streak length after which the anti-loss candidates are added
+    LOSS_CONTEXT_THRESHOLD = 3
+    
+    def _report_no_data(self, content):
+        print("Error: Tidak ada data ditemukan dengan pattern yang tersedia")
+        print(f"URL: {self.url}")
+        print(f"Content length: {len(content)} chars")
+        # Debug: show first few td elements found
+        debug_matches = re.findall(r'<td[^>]*title="[^"]*"[^>]*>(\d{4})</td>', content)
+        print(f"Debug: Found {len(debug_matches)} potential matches")
+        if debug_matches:
+            print(f"Sample matches: {debug_matches[:5]}")
     
     def build_optimization_patterns(self):
         """Build patterns untuk optimasi BBFS"""
         print("Membangun pola optimasi BBFS...")
         
         # Analisis pattern berdasarkan day dan input
-        day_patterns = defaultdict(lambda: defaultdict(list))
-        input_patterns = defaultdict(list)
-        global_freq = Counter()
-        
-        for i in range(len(self.data) - 1):
-            current = self.data[i]
-            next_item = self.data[i + 1]
-            
-            day = current['day']
-            input_2d = current['last_2d']
-            next_2d = next_item['last_2d']
-            
-            # Day-input patterns
-            day_patterns[day][input_2d].append(next_2d)
-            
-            # Input patterns
-            input_patterns[input_2d].append(next_2d)
-            
-            # Global frequency
-            for digit in next_2d:
-                global_freq[digit] += 1
+        day_patterns, input_patterns, global_freq = self._build_transition_indexes()
         
         self.optimization_cache = {
             'day_patterns': dict(day_patterns),
@@ -297,10 +52,96 @@ class OptimizedBBFSSystem:
             'global_freq': global_freq
         }
         
+        # Dense per-(day, input_2d) score tables so predictions skip the pattern scans
+        self.optimization_cache['score_tables'] = self._build_score_tables()
+        
         print(f"✓ Pola optimasi berhasil dibangun")
     
+    def _build_score_tables(self):
+        """Precompute the digit scores and base candidates of every (day, input_2d) key"""
+        global_freq = self.optimization_cache['global_freq']
+        tables = {
+            'global_scores': [global_freq.get(str(d), 0) for d in range(10)],
+            'global_top': [d for d, _ in global_freq.most_common(8)[:5]],
+            'entries': {}
+        }
+        self.optimization_cache['score_tables'] = tables
+        for day in self.optimization_cache['day_patterns']:
+            for n in range(100):
+                self._score_entry(day, f"{n:02d}")
+        return tables
+    
+    def _score_entry(self, day, input_2d):
+        """(scores, candidates) for a key: the loss-context-free part of generate_optimized_bbfs.
+        
+        scores[d] is the integer score of digit d (INPUT_WEIGHT for input digits +
+        global frequency + PATTERN_WEIGHT per day-pattern hit); candidates are the
+        digits from strategies 1-4.
+        None when the key cannot be expressed as digits (callers fall back to the scan).
+        """
+        tables = self.optimization_cache.get('score_tables')
+        if tables is None:
+            return None
+        entry = tables['entries'].get((day, input_2d))
+        if entry is not None or (day, input_2d) in tables['entries']:
+            return entry
+        
+        entry = None
+        if len(input_2d) == 2 and input_2d.isdigit():
+            scores = list(tables['global_scores'])
+            candidates = set()
+            for digit in set(input_2d):
+                scores[int(digit)] += self.INPUT_WEIGHT
+                candidates.add(int(digit))
+            
+            top_digits = list(tables['global_top'])
+            day_possibilities = self.optimization_cache['day_patterns'].get(day, {}).get(input_2d, [])
+            if day_possibilities:
+                top_digits += [d for d, _ in Counter(''.join(day_possibilities)).most_common(6)]
+                for next_2d in day_possibilities:
+                    for digit in set(next_2d):
+                        if digit.isdigit():
+                            scores[int(digit)] += self.PATTERN_WEIGHT
+            input_possibilities = self.optimization_cache['input_patterns'].get(input_2d, [])
+            if input_possibilities:
+                top_digits += [d for d, _ in Counter(''.join(input_possibilities)).most_common(4)]
+            
+            if all(d.isdigit() for d in top_digits):
+                candidates.update(int(d) for d in top_digits)
+                entry = (scores, frozenset(candidates))
+        
+        tables['entries'][(day, input_2d)] = entry
+        return entry
+    
     def generate_optimized_bbfs(self, input_2d, day, loss_context=0):
         """Generate BBFS yang dioptimalkan untuk target maksimal 8 loss beruntun"""
+        entry = self._score_entry(day, input_2d)
+        if entry is None:
+            return self._generate_optimized_bbfs_scan(input_2d, day, loss_context)
+        scores, candidates = entry
+        input_digits = [int(digit) for digit in input_2d]
+        
+        # Strategy 5: Anti-loss enhancement (untuk loss context > LOSS_CONTEXT_THRESHOLD)
+        if loss_context > self.LOSS_CONTEXT_THRESHOLD:
+            candidates = candidates | {(d + offset) % 10 for d in input_digits for offset in (5, 1, 2)}
+        
+        if len(candidates) > 5:
+            bonus = {(d + loss_context) % 10 for d in input_digits} if loss_context > 0 else ()
+            # score * 10 + digit ranks exactly like the float score + digit * 0.1 tie-breaker
+            bonus_weight = self.LOSS_BONUS_WEIGHT
+            ranked = sorted(candidates, key=lambda d: (scores[d] + (bonus_weight if d in bonus else 0)) * 10 + d, reverse=True)
+            return [str(d) for d in ranked[:5]]
+        
+        bbfs = [str(d) for d in sorted(candidates)]
+        for digit in "0123456789":
+            if len(bbfs) >= 5:
+                break
+            if digit not in bbfs:
+                bbfs.append(digit)
+        return bbfs[:5]
+    
+    def _generate_optimized_bbfs_scan(self, input_2d, day, loss_context=0):
+        """Reference implementation scanning the patterns on every call (used when no score table applies)"""
         candidates = set()
         
         # Strategy 1: Always include input digits (highest priority)
@@ -339,8 +180,8 @@ class OptimizedBBFSSystem:
         top_global = [d for d, _ in global_freq.most_common(8)]
         candidates.update(top_global[:5])
         
-        # Strategy 5: Anti-loss enhancement (untuk loss context > 3)
-        if loss_context > 3:
+        # Strategy 5: Anti-loss enhancement (untuk loss context > LOSS_CONTEXT_THRESHOLD)
+        if loss_context > self.LOSS_CONTEXT_THRESHOLD:
             # Add complementary digits untuk break streak
             complement_digits = []
             for digit in input_2d:
@@ -364,7 +205,7 @@ class OptimizedBBFSSystem:
                 
                 # Input digits get highest score
                 if digit in input_2d:
-                    score += 1000
+                    score += self.INPUT_WEIGHT
                 
                 # Global frequency score
                 if digit in global_freq:
@@ -375,12 +216,12 @@ class OptimizedBBFSSystem:
                     if input_2d in self.optimization_cache['day_patterns'][day]:
                         for next_2d in self.optimization_cache['day_patterns'][day][input_2d]:
                             if digit in next_2d:
-                                score += 20
+                                score += self.PATTERN_WEIGHT
                 
                 # Loss context score
                 if loss_context > 0:
                     if digit in str((int(input_2d[0]) + loss_context) % 10) + str((int(input_2d[1]) + loss_context) % 10):
-                        score += 50
+                        score += self.LOSS_BONUS_WEIGHT
                 
                 # Tie-breaker berdasarkan nilai digit (deterministik)
                 score += int(digit) * 0.1
@@ -402,6 +243,228 @@ class OptimizedBBFSSystem:
         
         return bbfs[:5]
     
+    @staticmethod
+    def _digit_mask(digits):
+        """Bit d set for every digit d in the string"""
+        mask = 0
+        for digit in digits:
+            mask |= 1 << int(digit)
+        return mask
+    
+    def _backtest_steps(self):
+        """Integer arrays of the valid (draw, next draw) pairs: data index, (day, input_2d) key, next-2D mask"""
+        indices, keys, need_masks = [], [], []
+        for i, current, next_item in self._draw_pairs():
+            input_2d = current['last_2d']
+            next_2d = next_item['last_2d']
+            if not (input_2d.isdigit() and next_2d.isdigit()):
+                continue
+            indices.append(i)
+            keys.append((current['day'], input_2d))
+            need_masks.append(self._digit_mask(next_2d))
+        return {'indices': indices, 'keys': keys, 'need_masks': need_masks}
+    
+    def _loss_bucket(self, loss_context):
+        """Loss-context bucket: generate_optimized_bbfs only sees loss_context through
+        lc > 0, lc > LOSS_CONTEXT_THRESHOLD and lc % 10, so buckets are lc = 0..T and
+        T + 1 + lc % 10 above the threshold T.
+        """
+        threshold = self.LOSS_CONTEXT_THRESHOLD
+        return loss_context if loss_context <= threshold else threshold + 1 + loss_context % 10
+    
+    def _bucket_loss_context(self, bucket):
+        """Smallest loss context of a bucket (inverse of _loss_bucket)"""
+        threshold = self.LOSS_CONTEXT_THRESHOLD
+        if bucket <= threshold:
+            return bucket
+        remainder = bucket - threshold - 1
+        return remainder + 10 * ((threshold - remainder) // 10 + 1) if remainder <= threshold else remainder
+    
+    def _bucket_bbfs(self, key, bucket):
+        """(bbfs, mask) of a (day, input_2d) key for a loss-context bucket, computed once"""
+        table = self.optimization_cache.setdefault('bucket_bbfs', {})
+        cached = table.get((key, bucket))
+        if cached is None:
+            loss_context = self._bucket_loss_context(bucket)
+            bbfs = self.generate_optimized_bbfs(key[1], key[0], loss_context)
+            cached = (bbfs, self._digit_mask(bbfs))
+            table[(key, bucket)] = cached
+            self.optimization_cache.setdefault('bucket_masks', {})[(key, bucket)] = cached[1]
+        return cached
+    
+    def _build_result_history(self, steps, masks, buckets, wins, losses):
+        """Columnar backtest history: one entry per tested draw, oldest first.
+        
+        Draws are stored as int codes (result 0-9999, day index), BBFS as a digit
+        bitmask plus its loss bucket, so rows can be rebuilt for any date range
+        without keeping a dict per draw.
+        """
+        days = []
+        day_index = {}
+        day_codes = []
+        for day, _ in steps['keys']:
+            if day not in day_index:
+                day_index[day] = len(days)
+                days.append(day)
+            day_codes.append(day_index[day])
+        indices = steps['indices']
+        return {
+            'days': days,
+            'date_ordinals': np.array([self.data[i]['date'].toordinal() for i in indices], dtype=np.int32),
+            'day_codes': np.array(day_codes, dtype=np.int8),
+            'result_codes': np.array([int(self.data[i]['result']) for i in indices], dtype=np.int16),
+            'next_codes': np.array([int(self.data[i + 1]['result']) for i in indices], dtype=np.int16),
+            'bbfs_masks': np.array(masks, dtype=np.int16),
+            'loss_buckets': np.array(buckets, dtype=np.int8),
+            'wins': np.array(wins, dtype=bool),
+            'consecutive_losses': np.array(losses, dtype=np.int32)
+        }
+    
+    def _history_fields(self, history, s):
+        result = f"{history['result_codes'][s]:04d}"
+        next_result = f"{history['next_codes'][s]:04d}"
+        mask = int(history['bbfs_masks'][s])
+        return {
+            'date': datetime.fromordinal(int(history['date_ordinals'][s])),
+            'day': history['days'][history['day_codes'][s]],
+            'result': result,
+            'next': next_result,
+            'bbfs_sorted': ''.join(str(d) for d in range(10) if mask >> d & 1),
+            'input_2d': result[-2:],
+            'actual_2d': next_result[-2:]
+        }
+    
+    def _history_bbfs(self, history, s, fields):
+        """BBFS (generation order) the backtest used at step s"""
+        key = (fields['day'], fields['input_2d'])
+        return list(self._bucket_bbfs(key, int(history['loss_buckets'][s]))[0])
+    
+    def _history_result(self, history, s):
+        """Row in the format of performance_data['results']"""
+        fields = self._history_fields(history, s)
+        return {
+            'date': fields['date'],
+            'input_2d': fields['input_2d'],
+            'next_2d': fields['actual_2d'],
+            'bbfs': self._history_bbfs(history, s, fields),
+            'is_win': bool(history['wins'][s]),
+            'consecutive_losses': int(history['consecutive_losses'][s])
+        }
+    
+    def _history_detail(self, history, s):
+        """Row in the format of performance_data['win_details'] / ['loss_details']"""
+        fields = self._history_fields(history, s)
+        detail = {
+            'date': fields['date'],
+            'result': fields['result'],
+            'next': fields['next'],
+            'bbfs': fields['bbfs_sorted'],  # Sort untuk konsistensi
+            'day': fields['day']
+        }
+        if not history['wins'][s]:
+            detail['loss_number'] = int(history['consecutive_losses'][s])
+        detail['input_2d'] = fields['input_2d']
+        detail['actual_2d'] = fields['actual_2d']
+        return detail
+    
+    @staticmethod
+    def _to_ordinal(value):
+        if isinstance(value, str):
+            value = datetime.strptime(value, '%Y-%m-%d')
+        return value.toordinal()
+    
+    def _data_key(self):
+        """Identifies the data a backtest ran on"""
+        if not self.data:
+            return None
+        return (self.data_version, len(self.data), self.data[-1]['date'], self.data[-1]['result'])
+    
+    def _current_history(self):
+        """Columnar backtest history for the current data, rerunning the backtest if it is stale"""
+        performance = getattr(self, 'performance_data', None)
+        if not performance or performance.get('data_key') != self._data_key():
+            if not self.test_comprehensive_performance():
+                return None
+        return self.performance_data['history']
+    
+    def _history_range(self, start_date=None, end_date=None):
+        """(history, first, stop) for tests whose input draw falls in [start_date, end_date]"""
+        history = self._current_history()
+        if history is None:
+            return None, 0, 0
+        ordinals = history['date_ordinals']
+        first = 0 if start_date is None else int(np.searchsorted(ordinals, self._to_ordinal(start_date), 'left'))
+        stop = len(ordinals) if end_date is None else int(np.searchsorted(ordinals, self._to_ordinal(end_date), 'right'))
+        return history, first, max(first, stop)
+    
+    def get_results_by_date_range(self, start_date=None, end_date=None, kind='all'):
+        """Backtest rows between two dates (inclusive, oldest first) from the full history.
+        
+        kind='all' gives rows like performance_data['results']; 'win' and 'loss' give
+        rows like win_details / loss_details. Dates may be date/datetime or 'YYYY-MM-DD'.
+        """
+        history, first, stop = self._history_range(start_date, end_date)
+        if history is None:
+            return []
+        if kind == 'all':
+            return [self._history_result(history, s) for s in range(first, stop)]
+        wins = history['wins'][first:stop]
+        selected = np.flatnonzero(wins if kind == 'win' else ~wins) + first
+        return [self._history_detail(history, s) for s in selected]
+    
+    def get_history_summary(self, start_date=None, end_date=None):
+        """Win/loss totals for a date range, counted on the columns directly"""
+        history, first, stop = self._history_range(start_date, end_date)
+        if history is None or stop == first:
+            return {'total_tests': 0, 'wins': 0, 'losses': 0, 'win_rate': 0, 'max_consecutive_loss': 0}
+        wins = int(history['wins'][first:stop].sum())
+        total = stop - first
+        # Streaks that started before the range are only counted from its first draw
+        streaks = np.minimum(history['consecutive_losses'][first:stop], np.arange(1, total + 1))
+        max_streak = int(streaks.max())
+        return {
+            'total_tests': total,
+            'wins': wins,
+            'losses': total - wins,
+            'win_rate': round(wins / total * 100, 1),
+            'max_consecutive_loss': max_streak
+        }
+    
+    def evaluate_fixed_bbfs(self, bbfs, start_date=None, end_date=None):
+        """What-if: totals had one fixed BBFS been played on every tested draw of the range"""
+        history, first, stop = self._history_range(start_date, end_date)
+        if history is None:
+            return summarize_wins([])
+        results_2d = history['next_codes'][first:stop] % 100
+        return summarize_wins(WIN_TABLE[set_index(bbfs), results_2d])
+    
+    def get_bbfs_comparison(self, start_date=None, end_date=None, top=5):
+        """generate_optimized_bbfs against all 252 fixed BBFS sets and the best set per day.
+        
+        The oracles are picked knowing the results (in-sample), so they are an upper
+        bound for a fixed / per-day BBFS rather than a strategy.
+        """
+        history, first, stop = self._history_range(start_date, end_date)
+        if history is None or stop == first:
+            return None
+        results_2d = history['next_codes'][first:stop] % 100
+        engine = summarize_wins(WIN_TABLE[mask_indices(history['bbfs_masks'][first:stop]), results_2d])
+        table = fixed_set_table(results_2d)
+        win_counts, max_streaks = table
+        
+        day_codes = history['day_codes'][first:stop]
+        day_sets = best_set_per_group(day_codes, results_2d, len(history['days']))
+        per_day = summarize_wins(WIN_TABLE[day_sets[day_codes], results_2d])
+        
+        return {
+            'engine': engine,
+            'best_fixed': best_fixed_sets(results_2d, top, table),
+            'fixed_sets_more_wins': int((win_counts > engine['wins']).sum()),
+            'fixed_sets_shorter_max_loss': int((max_streaks < engine['max_consecutive_loss']).sum()),
+            'best_per_day': {history['days'][g]: BBFS_SETS[day_sets[g]] for g in np.unique(day_codes)},
+            'per_day_oracle': per_day
+        }
+    
     def test_comprehensive_performance(self):
         """Test performance dengan akurasi data yang ketat"""
         print("Testing comprehensive performance...")
@@ -414,90 +477,43 @@ class OptimizedBBFSSystem:
             print("Error: Data tidak cukup untuk analisis")
             return None
         
-        results = []
-        consecutive_losses = 0
-        max_consecutive = 0
-        total_wins = 0
-        total_tests = 0
-        loss_streaks = []
-        win_details = []
-        loss_details = []
-        
-        # Hitung dengan algoritma yang konsisten dan akurat
-        for i in range(len(self.data) - 1):
-            current = self.data[i]
-            next_item = self.data[i + 1]
-            
-            # Validasi data sebelum pemrosesan
-            if not current.get('last_2d') or not next_item.get('last_2d'):
-                continue
-            
-            if len(current['last_2d']) != 2 or len(next_item['last_2d']) != 2:
-                continue
-            
-            # Generate BBFS dengan metode deterministik
-            bbfs = self.generate_optimized_bbfs(
-                current['last_2d'], 
-                current['day'], 
-                consecutive_losses
-            )
-            
-            # Validasi BBFS hasil
-            if len(bbfs) != 5:
-                continue
-            
-            # Check win condition dengan validasi ketat
-            next_2d_digits = set(next_item['last_2d'])
-            bbfs_digits = set(bbfs)
-            
-            # Pastikan validasi benar: semua digit 2D harus ada di BBFS
-            is_win = next_2d_digits.issubset(bbfs_digits)
-            
-            total_tests += 1
-            
-            if is_win:
-                total_wins += 1
-                # Record loss streak before resetting
-                if consecutive_losses > 0:
-                    loss_streaks.append(consecutive_losses)
-                    consecutive_losses = 0
-                
-                win_details.append({
-                    'date': current['date'],
-                    'result': current['result'],
-                    'next': next_item['result'],
-                    'bbfs': ''.join(sorted(bbfs)),  # Sort untuk konsistensi
-                    'day': current['day'],
-                    'input_2d': current['last_2d'],
-                    'actual_2d': next_item['last_2d']
-                })
-            else:
-                consecutive_losses += 1
-                max_consecutive = max(max_consecutive, consecutive_losses)
-                
-                loss_details.append({
-                    'date': current['date'],
-                    'result': current['result'],
-                    'next': next_item['result'],
-                    'bbfs': ''.join(sorted(bbfs)),
-                    'day': current['day'],
-                    'loss_number': consecutive_losses,
-                    'input_2d': current['last_2d'],
-                    'actual_2d': next_item['last_2d']
-                })
-            
-            results.append({
-                'date': current['date'],
-                'input_2d': current['last_2d'],
-                'next_2d': next_item['last_2d'],
-                'bbfs': bbfs,
-                'is_win': is_win,
-                'consecutive_losses': consecutive_losses
-            })
+        # Sequential state machine over integer arrays: the loss context only matters
+        # through its bucket, so each (day, input_2d, bucket) BBFS is computed once
+        steps = self._backtest_steps()
+        bucket_masks = self.optimization_cache.setdefault('bucket_masks', {})
+        streaks = StreakCounter()
+        threshold = self.LOSS_CONTEXT_THRESHOLD
+        step_masks = []
+        step_buckets = []
+        step_wins = []
+        step_losses = []
+        
+        for key, need_mask in zip(steps['keys'], steps['need_masks']):
+            consecutive_losses = streaks.consecutive_losses
+            bucket = consecutive_losses if consecutive_losses <= threshold else threshold + 1 + consecutive_losses % 10
+            bbfs_mask = bucket_masks.get((key, bucket))
+            if bbfs_mask is None:
+                bbfs_mask = self._bucket_bbfs(key, bucket)[1]
+            is_win = not (need_mask & ~bbfs_mask)
+            streaks.add(is_win)
+            
+            step_masks.append(bbfs_mask)
+            step_buckets.append(bucket)
+            step_wins.append(is_win)
+            step_losses.append(streaks.consecutive_losses)
+        
+        total_tests = streaks.total_tests
+        total_wins = streaks.total_wins
+        max_consecutive = streaks.max_consecutive
+        
+        # Full history kept columnar; only the stored tails are materialised as dicts
+        history = self._build_result_history(steps, step_masks, step_buckets, step_wins, step_losses)
+        win_details = [self._history_detail(history, s) for s in np.flatnonzero(history['wins'])[-100:]]
+        loss_details = [self._history_detail(history, s) for s in np.flatnonzero(~history['wins'])[-100:]]
+        results = [self._history_result(history, s) for s in range(max(0, total_tests - 100), total_tests)]
         
         # Final streak calculation
-        if consecutive_losses > 0:
-            loss_streaks.append(consecutive_losses)
+        loss_streaks = streaks.all_loss_streaks()
         
         # Validasi perhitungan akhir
         if total_tests == 0:
@@ -523,6 +539,8 @@ class OptimizedBBFSSystem:
             'win_details': win_details[-100:],  # Batasi untuk performa
             'loss_details': loss_details[-100:],
             'results': results[-100:],
+            'history': history,  # Semua hasil, kolom per field - lihat get_results_by_date_range
+            'data_key': self._data_key(),
             'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
             'data_range': f"{self.data[0]['date'].strftime('%Y-%m-%d')} - {self.data[-1]['date'].strftime('%Y-%m-%d')}",
             'total_data_records': len(self.data)
@@ -562,49 +580,34 @@ class OptimizedBBFSSystem:
         return True
     
     def get_current_loss_streak_analysis(self, limit=10):
-        """Analisis current loss streak REAL-TIME yang akurat"""
+        """Analisis current loss streak REAL-TIME yang akurat
+        
+        The streak is the open loss run at the end of the backtest history (not
+        capped), with details for its latest `limit` losses in chronological order.
+        BBFS and loss numbers are the ones the backtest used, loss context included.
+        """
         if not self.data or len(self.data) < 2:
             return 0, []
         
-        # Pastikan menggunakan optimization cache yang sudah dibangun
-        if not self.optimization_cache:
-            self.build_optimization_patterns()
+        history = self._current_history()
+        if history is None or not len(history['wins']):
+            return 0, []
         
-        current_streak = 0
+        total = len(history['wins'])
+        current_streak = int(history['consecutive_losses'][-1])
         streak_details = []
-        
-        # Analisis dari data terbaru mundur dengan chronological order yang benar
-        # Data sudah di-sort ascending, jadi ambil yang terakhir
-        recent_data = self.data[-limit:] if len(self.data) >= limit else self.data
-        
-        # Test dari data terbaru ke belakang untuk mencari current active streak
-        for i in range(len(recent_data) - 1, 0, -1):  # Mundur dari yang terbaru
-            prev_item = recent_data[i - 1]  # Data sebelumnya (input untuk prediksi)
-            current = recent_data[i]        # Data hasil (untuk validasi)
-            
-            # Generate BBFS berdasarkan data sebelumnya
-            bbfs = self.generate_optimized_bbfs(prev_item['last_2d'], prev_item['day'], 0)
-            current_2d_digits = set(current['last_2d'])
-            bbfs_digits = set(bbfs)
-            
-            # Check apakah BBFS berhasil cover result
-            is_win = current_2d_digits.issubset(bbfs_digits)
-            
-            if not is_win:
-                current_streak += 1
-                streak_details.insert(0, {  # Insert di awal untuk urutan chronological
-                    'date': prev_item['date'],
-                    'input_result': prev_item['result'],
-                    'actual_result': current['result'],
-                    'input_2d': prev_item['last_2d'],
-                    'actual_2d': current['last_2d'],
-                    'bbfs_used': ''.join(bbfs),
-                    'day': prev_item['day'],
-                    'loss_number': current_streak
-                })
-            else:
-                # Ketemu win, stop counting
-                break
+        for s in range(total - min(current_streak, limit), total):
+            fields = self._history_fields(history, s)
+            streak_details.append({
+                'date': fields['date'],
+                'input_result': fields['result'],
+                'actual_result': fields['next'],
+                'input_2d': fields['input_2d'],
+                'actual_2d': fields['actual_2d'],
+                'bbfs_used': ''.join(self._history_bbfs(history, s, fields)),
+                'day': fields['day'],
+                'loss_number': int(history['consecutive_losses'][s])
+            })
         
         return current_streak, streak_details
     
@@ -623,51 +626,9 @@ class OptimizedBBFSSystem:
     
     def get_consecutive_loss_breakdown(self):
         """Get breakdown of consecutive losses - shows ALL streaks including 20x+"""
-        if not hasattr(self, 'performance_data') or not self.performance_data or not self.performance_data.get('loss_streaks'):
-            return {}
-        
-        loss_streaks = self.performance_data['loss_streaks']
-        if not loss_streaks:
+        if not hasattr(self, 'performance_data') or not self.performance_data:
             return {}
-        
-        streak_counts = Counter(loss_streaks)
-        total_streaks = len(loss_streaks)
-        
-        breakdown = {}
-        # Sort by streak length to show in order (1x, 2x, 3x, ... up to max)
-        max_streak = max(loss_streaks) if loss_streaks else 0
-        
-        for streak_len in sorted(streak_counts.keys()):
-            count = streak_counts[streak_len]
-            percentage = (count / total_streaks * 100) if total_streaks > 0 else 0
-            
-            # Determine status based on streak length
-            if streak_len <= 3:
-                status = "Normal"
-            elif streak_len <= 6:
-                status = "Perhatian"
-            elif streak_len <= 10:
-                status = "Tinggi"
-            elif streak_len <= 15:
-                status = "Kritis"
-            else:
-                status = "Berbahaya"
-            
-            breakdown[f"{streak_len}x"] = {
-                'count': count,
-                'percentage': percentage,
-                'status': status,
-                'streak_length': streak_len
-            }
-        
-        # Add summary info
-        breakdown['_summary'] = {
-            'total_streaks': total_streaks,
-            'max_streak': max_streak,
-            'avg_streak': sum(loss_streaks) / len(loss_streaks) if loss_streaks else 0
-        }
-        
-        return breakdown
+        return self._loss_streak_breakdown(self.performance_data.get('loss_streaks'))
     
 
     
@@ -0,0 +1,66 @@
+"""
+Single Flight - menggabungkan panggilan bersamaan dengan key yang sama.
+
+Caller pertama untuk sebuah key menjalankan komputasinya; caller lain yang datang
+selama komputasi itu masih berjalan menunggu dan memakai hasil (atau error) yang
+sama. Dipakai untuk fetch, backtest dan view yang di-memo, dengan key seperti
+(pasaran, data_version, komputasi), supaya banyak session yang dibuka bersamaan
+tidak mengulang scrape dan backtest yang sama.
+"""
+
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.owner = threading.get_ident()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key, fn):
+        """Run fn() once for all concurrent callers of key and return its result"""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+            elif call.owner == threading.get_ident():
+                # Re-entrant call from inside fn(): waiting would deadlock
+                leader = None
+            else:
+                self.coalesced += 1
+                leader = False
+
+        if leader is None:
+            return fn()
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                self.executions += 1
+            call.done.set()
+        return call.result
+
+    def stats(self):
+        with self._lock:
+            return {'executions': self.executions, 'coalesced': self.coalesced, 'in_flight': len(self._calls)}
@@ -5,10 +5,14 @@ import random
 import json
 from collections import defaultdict, Counter
 import itertools
+import os
 import time
 import math
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 
 class UltraSmartBBFS:
+    STRATEGY_TYPES = ("ultra", "defensive", "aggressive", "balanced")
+    
     def __init__(self, data_url=None):
         # Support for different markets
         self.url = data_url if data_url else "http://128.199.123.196/"
@@ -19,6 +23,9 @@ class UltraSmartBBFS:
         self.winning_sequences = []
         self.loss_patterns = {}
         self.best_strategy = None
+        # Strategy evaluations by (strategy_type, seed or None, max_allowed_losses), see evaluate_strategy
+        self.evaluation_cache = {}
+        self.search_runs = []
         
     def load_and_process_data(self):
         """Load data dengan preprocessing yang lebih canggih"""
@@ -196,6 +203,8 @@ class UltraSmartBBFS:
     def deep_pattern_analysis(self):
         """Analisis pola yang sangat mendalam"""
         print("Melakukan analisis pola ultra-mendalam...")
+        # Pattern tables change, so earlier strategy evaluations no longer apply
+        self.evaluation_cache = {}
         
         # Matrix transisi 2D -> 2D
         transitions = defaultdict(list)
@@ -267,17 +276,21 @@ class UltraSmartBBFS:
         
         print(f"Loss pattern analysis complete: {len(self.loss_patterns)} patterns found")
     
-    def generate_basic_bbfs(self, input_2d, day):
+    def generate_basic_bbfs(self, input_2d, day, rng=random):
         """Basic BBFS generation untuk analisis"""
         digits = list(input_2d)
         while len(digits) < 5:
-            new_digit = str(random.randint(0, 9))
+            new_digit = str(rng.randint(0, 9))
             if new_digit not in digits:
                 digits.append(new_digit)
         return digits[:5]
     
-    def generate_smart_bbfs(self, input_2d, day, strategy_type="ultra"):
-        """Generate BBFS dengan strategi ultra-cerdas"""
+    def generate_smart_bbfs(self, input_2d, day, strategy_type="ultra", rng=random):
+        """Generate BBFS dengan strategi ultra-cerdas
+        
+        rng: random.Random used for the random fills/shuffles; a seeded one makes the
+        result reproducible (the module-level random is used by default).
+        """
         
         # Analisis konteks
         context_score = self.calculate_context_score(input_2d, day)
@@ -287,13 +300,13 @@ class UltraSmartBBFS:
         
         # Apply different strategies based on type
         if strategy_type == "ultra":
-            return self.ultra_strategy(input_2d, candidates, context_score)
+            return self.ultra_strategy(input_2d, candidates, context_score, rng)
         elif strategy_type == "defensive":
-            return self.defensive_strategy(input_2d, candidates)
+            return self.defensive_strategy(input_2d, candidates, rng)
         elif strategy_type == "aggressive":
-            return self.aggressive_strategy(input_2d, candidates)
+            return self.aggressive_strategy(input_2d, candidates, rng)
         else:
-            return self.balanced_strategy(input_2d, candidates)
+            return self.balanced_strategy(input_2d, candidates, rng)
     
     def calculate_context_score(self, input_2d, day):
         """Hitung skor konteks untuk strategi adaptif"""
@@ -356,9 +369,10 @@ class UltraSmartBBFS:
                 complement = str((10 - int(digit)) % 10)
                 candidates.add(complement)
         
-        return list(candidates)
+        # Sorted: set order depends on the string hash seed, which would break replay
+        return sorted(candidates)
     
-    def ultra_strategy(self, input_2d, candidates, context_score):
+    def ultra_strategy(self, input_2d, candidates, context_score, rng=random):
         """Strategi ultra dengan optimization maksimal"""
         
         # Weighted selection based on frequency and context
@@ -393,13 +407,13 @@ class UltraSmartBBFS:
         # Fill with random if needed
         all_digits = [str(i) for i in range(10)]
         while len(bbfs) < 5:
-            rand_digit = random.choice(all_digits)
+            rand_digit = rng.choice(all_digits)
             if rand_digit not in bbfs:
                 bbfs.append(rand_digit)
         
         return bbfs[:5]
     
-    def defensive_strategy(self, input_2d, candidates):
+    def defensive_strategy(self, input_2d, candidates, rng=random):
         """Strategi defensif untuk minimize losses"""
         # Prioritize high-frequency digits
         freq_candidates = []
@@ -410,11 +424,11 @@ class UltraSmartBBFS:
             freq_candidates = [d[0] for d in freq_items[:3]]
         
         # Always include input digits
-        bbfs = list(set(input_2d + freq_candidates))
+        bbfs = list(dict.fromkeys(list(input_2d) + freq_candidates))
         
         # Fill remaining
         remaining_candidates = [c for c in candidates if c not in bbfs]
-        random.shuffle(remaining_candidates)
+        rng.shuffle(remaining_candidates)
         
         for candidate in remaining_candidates:
             if len(bbfs) >= 5:
@@ -431,7 +445,7 @@ class UltraSmartBBFS:
         
         return bbfs[:5]
     
-    def aggressive_strategy(self, input_2d, candidates):
+    def aggressive_strategy(self, input_2d, candidates, rng=random):
         """Strategi agresif untuk maximize wins"""
         # Use more diverse digit selection
         bbfs = []
@@ -468,7 +482,7 @@ class UltraSmartBBFS:
         
         # Fill remaining randomly
         all_digits = [str(i) for i in range(10)]
-        random.shuffle(all_digits)
+        rng.shuffle(all_digits)
         for digit in all_digits:
             if len(bbfs) >= 5:
                 break
@@ -477,7 +491,7 @@ class UltraSmartBBFS:
         
         return bbfs[:5]
     
-    def balanced_strategy(self, input_2d, candidates):
+    def balanced_strategy(self, input_2d, candidates, rng=random):
         """Strategi balanced"""
         # Mix of defensive and aggressive
         bbfs = []
@@ -493,7 +507,7 @@ class UltraSmartBBFS:
         
         # Add diverse candidates (aggressive)
         remaining = [c for c in candidates if c not in bbfs]
-        random.shuffle(remaining)
+        rng.shuffle(remaining)
         
         for candidate in remaining[:2]:
             if len(bbfs) >= 5:
@@ -510,9 +524,10 @@ class UltraSmartBBFS:
         
         return bbfs[:5]
     
-    def test_strategy_rigorously(self, strategy_func, strategy_name, max_allowed_losses=5):
+    def test_strategy_rigorously(self, strategy_func, strategy_name, max_allowed_losses=5, verbose=True):
         """Test strategi dengan kriteria ketat"""
-        print(f"Testing {strategy_name} dengan kriteria maksimal {max_allowed_losses} kalah beruntun...")
+        if verbose:
+            print(f"Testing {strategy_name} dengan kriteria maksimal {max_allowed_losses} kalah beruntun...")
         
         results = []
         consecutive_losses = 0
@@ -552,7 +567,8 @@ class UltraSmartBBFS:
             
             # Early termination if criteria not met
             if max_consecutive > max_allowed_losses and i > 200:
-                print(f"  Early termination: Max consecutive losses {max_consecutive} > {max_allowed_losses}")
+                if verbose:
+                    print(f"  Early termination: Max consecutive losses {max_consecutive} > {max_allowed_losses}")
                 break
         
         win_rate = (total_wins / len(results) * 100) if results else 0
@@ -568,70 +584,268 @@ class UltraSmartBBFS:
             'results': results
         }
         
-        print(f"  Total tests: {len(results)}")
-        print(f"  Wins: {total_wins}")
-        print(f"  Win rate: {win_rate:.2f}%")
-        print(f"  Max consecutive losses: {max_consecutive}")
-        print(f"  Meets criteria: {'✓ YA' if meets_criteria else '✗ TIDAK'}")
+        if verbose:
+            print(f"  Total tests: {len(results)}")
+            print(f"  Wins: {total_wins}")
+            print(f"  Win rate: {win_rate:.2f}%")
+            print(f"  Max consecutive losses: {max_consecutive}")
+            print(f"  Meets criteria: {'✓ YA' if meets_criteria else '✗ TIDAK'}")
         
         return performance
     
-    def intensive_search(self, max_iterations=100):
-        """Pencarian intensif strategi optimal"""
-        print(f"Memulai pencarian intensif dengan {max_iterations} iterasi...")
+    @staticmethod
+    def _is_better(performance, best_performance):
+        """Fewer max consecutive losses wins, ties broken by a higher win rate"""
+        return (best_performance is None or
+                performance['max_consecutive_losses'] < best_performance['max_consecutive_losses'] or
+                (performance['max_consecutive_losses'] == best_performance['max_consecutive_losses'] and
+                 performance['win_rate'] > best_performance['win_rate']))
+    
+    def _strategy_func(self, strategy_type, rng=random):
+        def strategy(input_2d, day):
+            return self.generate_smart_bbfs(input_2d, day, strategy_type, rng)
+        return strategy
+    
+    @staticmethod
+    def strategy_seed(search_seed, iteration, strategy_type):
+        """Seed of one search run, derived from the search seed (same in every process)"""
+        return random.Random(f"{search_seed}:{strategy_type}:{iteration}").getrandbits(32)
+    
+    @staticmethod
+    def _run_name(strategy_type, iteration):
+        return f"{strategy_type.capitalize()}_Strategy_Iter{iteration}"
+    
+    def evaluate_strategy(self, strategy_type, seed, strategy_name=None, max_allowed_losses=5, verbose=True):
+        """test_strategy_rigorously dengan random.Random(seed) milik strategi sendiri.
+        
+        The result records strategy_type, seed and seed_used (whether the run drew
+        from its RNG at all); the same (strategy_type, seed) always gives the same result.
+        """
+        rng = random.Random(seed)
+        start_state = rng.getstate()
+        performance = self.test_strategy_rigorously(
+            self._strategy_func(strategy_type, rng),
+            strategy_name or f"{strategy_type.capitalize()}_Strategy_Seed{seed}",
+            max_allowed_losses,
+            verbose
+        )
+        performance.update({
+            'strategy_type': strategy_type,
+            'seed': seed,
+            'seed_used': rng.getstate() != start_state
+        })
+        self._remember_evaluation(performance, max_allowed_losses)
+        return performance
+    
+    def _remember_evaluation(self, performance, max_allowed_losses):
+        # A run that never drew from its RNG gives the same result for every seed
+        seed = performance['seed'] if performance['seed_used'] else None
+        key = (performance['strategy_type'], seed, max_allowed_losses)
+        self.evaluation_cache[key] = {k: v for k, v in performance.items() if k != 'results'}
+    
+    def _cached_evaluation(self, strategy_type, seed, strategy_name, max_allowed_losses=5):
+        """Summary (without results) of an already evaluated identical configuration, or None"""
+        cached = (self.evaluation_cache.get((strategy_type, None, max_allowed_losses)) or
+                  self.evaluation_cache.get((strategy_type, seed, max_allowed_losses)))
+        if cached is None:
+            return None
+        return dict(cached, strategy_name=strategy_name, seed=seed)
+    
+    def replay_strategy(self, performance, max_allowed_losses=5):
+        """Re-run a search result exactly from its recorded (strategy_type, seed)"""
+        return self.evaluate_strategy(performance['strategy_type'], performance['seed'],
+                                      performance['strategy_name'], max_allowed_losses, verbose=False)
+    
+    def _record_run(self, performance, evaluated):
+        self.search_runs.append({
+            'strategy_name': performance['strategy_name'],
+            'strategy_type': performance['strategy_type'],
+            'seed': performance['seed'],
+            'max_consecutive_losses': performance['max_consecutive_losses'],
+            'win_rate': performance['win_rate'],
+            'evaluated': evaluated
+        })
+    
+    def _finish_search(self, best_performance):
+        """Full results for the winner (replayed if it came from the cache) and its strategy"""
+        if best_performance is None:
+            return None
+        if 'results' not in best_performance:
+            best_performance = self.replay_strategy(best_performance)
+        # Fresh RNG: predicting the tested draws in order reproduces the run exactly
+        self.best_strategy = self._strategy_func(best_performance['strategy_type'],
+                                                 random.Random(best_performance['seed']))
+        return best_performance
+    
+    def _report_optimal_found(self, performance, strategies_tested):
+        print(f"\n🎉 STRATEGI OPTIMAL DITEMUKAN!")
+        print(f"Strategi: {performance['strategy_name']} (seed {performance['seed']})")
+        print(f"Max consecutive losses: {performance['max_consecutive_losses']}")
+        print(f"Win rate: {performance['win_rate']}%")
+        print(f"Total strategies tested: {strategies_tested}")
+    
+    def _report_search_end(self, best_performance, strategies_tested):
+        evaluated = sum(1 for run in self.search_runs if run['evaluated'])
+        print(f"\nSelesai pencarian intensif:")
+        print(f"Total strategies tested: {strategies_tested} ({evaluated} dievaluasi, "
+              f"{len(self.search_runs) - evaluated} konfigurasi identik dilewati)")
+        if best_performance:
+            if best_performance['meets_criteria']:
+                print("✓ Strategi optimal ditemukan!")
+            else:
+                print(f"⚠️ Belum optimal. Best max losses: {best_performance['max_consecutive_losses']}")
+    
+    def intensive_search(self, max_iterations=100, seed=None):
+        """Pencarian intensif strategi optimal
+        
+        Each (iteration, strategy) run uses its own RNG seeded from `seed` (random when
+        None) and is recorded in self.search_runs. A configuration already evaluated
+        (same strategy and seed, or a strategy whose run never used its RNG) is not
+        evaluated again. The winner carries strategy_type and seed for replay_strategy.
+        """
+        search_seed = seed if seed is not None else random.SystemRandom().getrandbits(32)
+        print(f"Memulai pencarian intensif dengan {max_iterations} iterasi (seed {search_seed})...")
         print("Target: Maksimal 5 kalah beruntun dengan 1200+ test")
         
         best_performance = None
         strategies_tested = 0
-        
-        strategy_types = ["ultra", "defensive", "aggressive", "balanced"]
+        self.search_runs = []
         
         for iteration in range(1, max_iterations + 1):
             print(f"\n--- Iterasi {iteration} ---")
             
-            for strategy_type in strategy_types:
+            for strategy_type in self.STRATEGY_TYPES:
                 strategies_tested += 1
+                run_seed = self.strategy_seed(search_seed, iteration, strategy_type)
+                run_name = self._run_name(strategy_type, iteration)
                 
-                def current_strategy(input_2d, day):
-                    return self.generate_smart_bbfs(input_2d, day, strategy_type)
-                
-                performance = self.test_strategy_rigorously(
-                    current_strategy, 
-                    f"{strategy_type.capitalize()}_Strategy_Iter{iteration}"
-                )
+                performance = self._cached_evaluation(strategy_type, run_seed, run_name)
+                evaluated = performance is None
+                if evaluated:
+                    performance = self.evaluate_strategy(strategy_type, run_seed, run_name)
+                self._record_run(performance, evaluated)
                 
                 # Update best if better
-                if (best_performance is None or 
-                    performance['max_consecutive_losses'] < best_performance['max_consecutive_losses'] or
-                    (performance['max_consecutive_losses'] == best_performance['max_consecutive_losses'] and
-                     performance['win_rate'] > best_performance['win_rate'])):
-                    
+                if self._is_better(performance, best_performance):
                     best_performance = performance
-                    self.best_strategy = current_strategy
                 
                 # Success condition
                 if performance['meets_criteria']:
-                    print(f"\n🎉 STRATEGI OPTIMAL DITEMUKAN!")
-                    print(f"Strategi: {performance['strategy_name']}")
-                    print(f"Max consecutive losses: {performance['max_consecutive_losses']}")
-                    print(f"Win rate: {performance['win_rate']}%")
-                    print(f"Total strategies tested: {strategies_tested}")
-                    return best_performance
+                    self._report_optimal_found(performance, strategies_tested)
+                    return self._finish_search(best_performance)
             
             # Progress report
             if iteration % 10 == 0:
                 current_best = best_performance['max_consecutive_losses'] if best_performance else "N/A"
                 print(f"Progress: {strategies_tested} strategies tested, best max losses: {current_best}")
         
-        print(f"\nSelesai pencarian intensif:")
-        print(f"Total strategies tested: {strategies_tested}")
-        if best_performance:
-            if best_performance['meets_criteria']:
-                print("✓ Strategi optimal ditemukan!")
-            else:
-                print(f"⚠️ Belum optimal. Best max losses: {best_performance['max_consecutive_losses']}")
+        self._report_search_end(best_performance, strategies_tested)
+        return self._finish_search(best_performance)
+    
+    def _search_state(self):
+        """Loaded history and pattern tables a search worker needs (read-only)"""
+        return {
+            'url': self.url,
+            'data': self.data,
+            'transition_matrix': self.transition_matrix,
+            'day_patterns': self.day_patterns,
+            'digit_frequency': self.digit_frequency,
+            'loss_patterns': self.loss_patterns
+        }
+    
+    @classmethod
+    def from_search_state(cls, state):
+        system = cls(state['url'])
+        for key, value in state.items():
+            if key != 'url':
+                setattr(system, key, value)
+        return system
+    
+    def parallel_intensive_search(self, max_iterations=100, workers=None, seed=None):
+        """intensive_search dengan process pool.
+        
+        The same seeded (iteration, strategy) runs as intensive_search are submitted
+        to the pool, which gets the history once per worker; configurations already
+        evaluated are resolved from the cache instead. Results stream back as they
+        finish but are consumed in the sequential order, so the best result and the
+        early stop match intensive_search for the same seed.
+        """
+        workers = workers or os.cpu_count() or 1
+        if workers <= 1:
+            return self.intensive_search(max_iterations, seed)
+        
+        search_seed = seed if seed is not None else random.SystemRandom().getrandbits(32)
+        print(f"Memulai pencarian intensif dengan {max_iterations} iterasi "
+              f"({workers} proses, seed {search_seed})...")
+        print("Target: Maksimal 5 kalah beruntun dengan 1200+ test")
         
-        return best_performance
+        tasks = [(iteration, strategy_type, self.strategy_seed(search_seed, iteration, strategy_type))
+                 for iteration in range(1, max_iterations + 1)
+                 for strategy_type in self.STRATEGY_TYPES]
+        best_performance = None
+        strategies_tested = 0
+        finished = {}
+        self.search_runs = []
+        
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_search_worker,
+                                 initargs=(self._search_state(),)) as pool:
+            futures = {}
+            for index, (iteration, strategy_type, run_seed) in enumerate(tasks):
+                if self._cached_evaluation(strategy_type, run_seed, None) is None:
+                    futures[pool.submit(_run_search_task, tasks[index])] = index
+            pending = set(futures)
+            completed = 0
+            try:
+                while True:
+                    # Consume in the order intensive_search would have evaluated them
+                    while strategies_tested < len(tasks):
+                        iteration, strategy_type, run_seed = tasks[strategies_tested]
+                        performance = finished.pop(strategies_tested, None)
+                        evaluated = performance is not None
+                        if not evaluated:
+                            performance = self._cached_evaluation(strategy_type, run_seed,
+                                                                  self._run_name(strategy_type, iteration))
+                            if performance is None:
+                                break
+                        strategies_tested += 1
+                        self._record_run(performance, evaluated)
+                        
+                        if self._is_better(performance, best_performance):
+                            best_performance = performance
+                        
+                        if performance['meets_criteria']:
+                            self._report_optimal_found(performance, strategies_tested)
+                            return self._finish_search(best_performance)
+                        
+                        if strategies_tested % len(self.STRATEGY_TYPES) == 0 and iteration % 10 == 0:
+                            print(f"Progress: {strategies_tested} strategies tested, "
+                                  f"best max losses: {best_performance['max_consecutive_losses']}")
+                    
+                    if not pending:
+                        break
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        if future.cancelled():
+                            continue
+                        performance = future.result()
+                        self._remember_evaluation(performance, 5)
+                        finished[futures[future]] = performance
+                        completed += 1
+                        print(f"  [{completed}/{len(futures)}] {performance['strategy_name']}: "
+                              f"max loss {performance['max_consecutive_losses']}, "
+                              f"win rate {performance['win_rate']}%")
+                        if not performance['seed_used']:
+                            # Same result for every seed: drop the queued runs of this strategy
+                            for other in pending:
+                                if tasks[futures[other]][1] == performance['strategy_type']:
+                                    other.cancel()
+                    pending = {future for future in pending if not future.cancelled()}
+            finally:
+                for future in futures:
+                    future.cancel()
+        
+        self._report_search_end(best_performance, strategies_tested)
+        return self._finish_search(best_performance)
     
     def show_final_results(self, performance, sample_count=25):
         """Tampilkan hasil final dengan detail"""
@@ -658,6 +872,19 @@ class UltraSmartBBFS:
             bbfs_str = "".join(result['bbfs'])
             print(f"{result['test_no']:3d} | {result['date']} | {result['day']:7s} | {result['input_2d']:5s} | {bbfs_str:9s} | {result['next_2d']:4s} | {status:3s} | {result['consecutive_losses']:2d}")
 
+# Search system of a worker process, built once by _init_search_worker
+_search_system = None
+
+def _init_search_worker(state):
+    global _search_system
+    _search_system = UltraSmartBBFS.from_search_state(state)
+
+def _run_search_task(task):
+    iteration, strategy_type, seed = task
+    return _search_system.evaluate_strategy(
+        strategy_type, seed, UltraSmartBBFS._run_name(strategy_type, iteration), verbose=False
+    )
+
 def main():
     print("=== ULTRA SMART BBFS SYSTEM ===")
     print("Sistem pencarian strategi BBFS dengan analisis ultra-mendalam")
@@ -674,7 +901,7 @@ def main():
     system.deep_pattern_analysis()
     
     # Intensive search
-    best_result = system.intensive_search(max_iterations=50)
+    best_result = system.parallel_intensive_search(max_iterations=50)
     
     if best_result:
         # Show results